@@ -0,0 +1,4 @@
+"""Micro benchmarks for parse_this.
+
+Each module can be run on its own, e.g. 'python -m benchmarks.decoration'.
+"""
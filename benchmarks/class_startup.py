@@ -0,0 +1,44 @@
+"""Compare the cost of decorating classes with 'parse_class' eagerly and lazily
+for an increasing number of sub-commands.
+
+Usage: python -m benchmarks.class_startup [--params N]
+"""
+
+import argparse
+import timeit
+
+from benchmarks.synthetic import make_class, make_methods
+
+
+def time_class(nb_methods: int, nb_params: int, lazy: bool) -> float:
+    """Return the time, in seconds, taken to create and decorate a class and
+    call one of its sub-commands.
+
+    Args:
+        nb_methods: number of sub-commands of the class
+        nb_params: number of parameters of each method
+        lazy: whether the parsers are created lazily
+    """
+
+    methods = make_methods(nb_methods, nb_params)
+
+    def create_and_call():
+        cls = make_class(methods, lazy)
+        cls.parser.call(["command-0"] + ["1"] * (nb_params // 2))
+
+    return timeit.timeit(create_and_call, number=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--params", type=int, default=5)
+    namespace = parser.parse_args()
+    print("%10s %12s %12s" % ("commands", "eager (ms)", "lazy (ms)"))
+    for nb_methods in (1, 10, 100, 500):
+        eager = time_class(nb_methods, namespace.params, lazy=False)
+        lazy = time_class(nb_methods, namespace.params, lazy=True)
+        print("%10d %12.2f %12.2f" % (nb_methods, eager * 1000, lazy * 1000))
+
+
+if __name__ == "__main__":
+    main()
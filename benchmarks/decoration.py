@@ -0,0 +1,43 @@
+"""Compare the cost of decorating functions with 'create_parser' eagerly and
+lazily.
+
+Usage: python -m benchmarks.decoration [--functions N] [--params N]
+"""
+
+import argparse
+import timeit
+
+from benchmarks.synthetic import make_function
+from parse_this import create_parser
+
+
+def time_decoration(nb_functions: int, nb_params: int, lazy: bool) -> float:
+    """Return the time, in seconds, taken to decorate nb_functions functions.
+
+    Args:
+        nb_functions: number of functions to decorate
+        nb_params: number of parameters of each function
+        lazy: whether the parsers are created lazily
+    """
+    functions = [make_function("f%d" % i, nb_params) for i in range(nb_functions)]
+    decorator = create_parser(lazy=lazy)
+    return timeit.timeit(lambda: [decorator(f) for f in functions], number=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=int, default=500)
+    parser.add_argument("--params", type=int, default=5)
+    namespace = parser.parse_args()
+    eager = time_decoration(namespace.functions, namespace.params, lazy=False)
+    lazy = time_decoration(namespace.functions, namespace.params, lazy=True)
+    print(
+        "Decorating %d functions of %d parameters"
+        % (namespace.functions, namespace.params)
+    )
+    print("  eager: %8.2f ms" % (eager * 1000))
+    print("  lazy:  %8.2f ms (x%.1f faster)" % (lazy * 1000, eager / lazy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare parsing a command line with an enum argument of many members when
+its choices are a plain list, as they used to be, and with the set-backed
+choices of parse_this.
+
+Usage: python -m benchmarks.enum_choices [--members N] [--number N]
+"""
+
+import argparse
+import enum
+import timeit
+from typing import Any
+
+from parse_this import create_parser
+
+
+def make_enum(nb_members: int) -> Any:
+    """Return an enum class of nb_members members named R0, R1, ..."""
+    return enum.Enum("Region", ["R%d" % index for index in range(nb_members)])
+
+
+def make_list_parser(enum_class: Any) -> argparse.ArgumentParser:
+    """Return a parser for an enum argument whose choices are a list of the
+    members and whose metavar lists all of them."""
+
+    def _convert(name: str) -> enum.Enum:
+        return enum_class[name]
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "region",
+        type=_convert,
+        choices=list(enum_class),
+        metavar="{%s}" % ",".join(enum_class.__members__),
+    )
+    return parser
+
+
+def time_parser(parser: Any, args: list, number: int) -> float:
+    """Return the time, in seconds, taken to parse args and format the usage
+    of parser number times."""
+
+    def run():
+        parser.parse_args(args)
+        parser.format_usage()
+
+    return timeit.timeit(run, number=number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=1000)
+    namespace = parser.parse_args()
+    enum_class = make_enum(namespace.members)
+    # The last member is the worst case of a list scan
+    args = ["R%d" % (namespace.members - 1)]
+
+    def region(region: enum_class):  # type: ignore[valid-type]
+        return region
+
+    slow = time_parser(make_list_parser(enum_class), args, namespace.number)
+    fast = time_parser(create_parser()(region).parser, args, namespace.number)
+    print(
+        "Parsing %d times an enum argument of %d members and formatting its usage"
+        % (namespace.number, namespace.members)
+    )
+    print("  list choices: %8.2f ms" % (slow * 1000))
+    print("  parse_this:   %8.2f ms (x%.1f faster)" % (fast * 1000, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare parsing a command line with argparse and with the fast path of
+'create_parser(fast=True)'.
+
+Usage: python -m benchmarks.fast_path [--params N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from benchmarks.synthetic import make_args, make_function
+from parse_this import create_parser
+
+
+def time_parsing(nb_params: int, number: int, fast: bool) -> float:
+    """Return the time, in seconds, taken to parse a command line number times.
+
+    Args:
+        nb_params: number of parameters of the parsed function
+        number: number of times the command line is parsed
+        fast: whether the fast path is used
+    """
+    func = create_parser(fast=fast)(make_function("f", nb_params))
+    parser = func.parser
+    args = make_args(nb_params)
+    return timeit.timeit(lambda: parser.parse_args(args), number=number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--params", type=int, default=6)
+    parser.add_argument("--number", type=int, default=10000)
+    namespace = parser.parse_args()
+    slow = time_parsing(namespace.params, namespace.number, fast=False)
+    fast = time_parsing(namespace.params, namespace.number, fast=True)
+    print(
+        "Parsing %d times the command line of a function of %d parameters"
+        % (namespace.number, namespace.params)
+    )
+    print("  argparse:  %8.2f ms" % (slow * 1000))
+    print("  fast path: %8.2f ms (x%.1f faster)" % (fast * 1000, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
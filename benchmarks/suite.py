@@ -0,0 +1,193 @@
+"""Time decorating, parsing, calling and printing the full help of synthetic
+functions and classes of increasing size, and compare the timings with a
+baseline.
+
+Usage: python -m benchmarks.suite [--quick] [--filter TEXT] [--save PATH]
+                                  [--compare PATH] [--threshold PERCENT]
+
+The functions take ints, enums and lists of ints. Each benchmark is run until
+it takes at least 0.2 seconds, the best time of --repeat runs is reported.
+With --compare the exit code is 1 if a benchmark is more than --threshold
+percent slower than in the baseline.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import timeit
+import types
+from contextlib import redirect_stdout
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_args, make_function, make_methods
+from parse_this import create_parser, parse_class
+
+FUNCTION_PARAMS = (1, 10, 50, 200)
+CLASS_METHODS = (1, 10, 100, 1000)
+QUICK_FUNCTION_PARAMS = (1, 10)
+QUICK_CLASS_METHODS = (1, 10)
+# Number of parameters of each method of the classes
+CLASS_PARAMS = 5
+
+
+def decorate_copy(func: Callable) -> Callable:
+    """Return a copy of func decorated with 'create_parser', a function that
+    already has a parser is not decorated again."""
+    copy = types.FunctionType(
+        func.__code__, func.__globals__, func.__name__, func.__defaults__
+    )
+    copy.__annotations__ = func.__annotations__
+    return create_parser()(copy)
+
+
+def make_decorated_class(attributes: Dict[str, Callable]) -> type:
+    """Return a new class decorated with 'parse_class'.
+
+    Args:
+        attributes: the methods of the class, already decorated so that only
+        'parse_class' is timed
+    """
+    cls = type("Synthetic%d" % len(attributes), (object,), attributes)
+    return parse_class()(cls)
+
+
+def print_full_help(parser: argparse.ArgumentParser) -> None:
+    """Print the help of parser and all its sub-commands to a discarded
+    buffer."""
+    with redirect_stdout(io.StringIO()):
+        try:
+            parser.parse_args(["--help"])
+        except SystemExit:
+            pass
+
+
+def get_benchmarks(quick: bool) -> Dict[str, Callable[[], Any]]:
+    """Return the callable timed by each benchmark, by name.
+
+    Args:
+        quick: whether only the smallest functions and classes are used
+    """
+    benchmarks: Dict[str, Callable[[], Any]] = {}
+    for nb_params in QUICK_FUNCTION_PARAMS if quick else FUNCTION_PARAMS:
+        func = make_function("f%d" % nb_params, nb_params, mixed=True)
+        parser = create_parser()(func).parser
+        args = make_args(nb_params, mixed=True)
+        suffix = "params=%d" % nb_params
+        benchmarks["create_parser %s" % suffix] = partial(decorate_copy, func)
+        benchmarks["parse_args %s" % suffix] = partial(parser.parse_args, args)
+        benchmarks["call %s" % suffix] = partial(parser.call, args=args)
+    for nb_methods in QUICK_CLASS_METHODS if quick else CLASS_METHODS:
+        attributes = {
+            name: create_parser()(method)
+            for name, method in make_methods(nb_methods, CLASS_PARAMS, True).items()
+        }
+        cls: Any = make_decorated_class(attributes)
+        args = ["command-0"] + make_args(CLASS_PARAMS, mixed=True)
+        suffix = "methods=%d" % nb_methods
+        benchmarks["parse_class %s" % suffix] = partial(
+            make_decorated_class, attributes
+        )
+        benchmarks["class call %s" % suffix] = partial(cls.parser.call, args)
+        benchmarks["full help %s" % suffix] = partial(print_full_help, cls.parser)
+    return benchmarks
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best time, in seconds, of a call of func.
+
+    Args:
+        func: the callable to time
+        repeat: number of times the calls are timed
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_seconds(seconds: float) -> str:
+    """Return seconds in the most readable unit."""
+    if seconds < 1e-3:
+        return "%8.2f us" % (seconds * 1e6)
+    if seconds < 1:
+        return "%8.2f ms" % (seconds * 1e3)
+    return "%8.2f s " % seconds
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[str]:
+    """Return the names of the benchmarks more than threshold percent slower
+    than in baseline.
+
+    Args:
+        results: the time of each benchmark run
+        baseline: the time of each benchmark in the baseline
+        threshold: the slowdown, in percent, reported as a regression
+    """
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and (seconds / baseline[name] - 1) * 100 > threshold
+    ]
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--quick", action="store_true", help="only time the smallest sizes"
+    )
+    parser.add_argument("--filter", help="only run the benchmarks containing FILTER")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of runs of each benchmark"
+    )
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="JSON baseline to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="slowdown, in percent, reported as a regression",
+    )
+    namespace = parser.parse_args(args)
+    baseline: Dict[str, float] = {}
+    if namespace.compare:
+        with open(namespace.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    results: Dict[str, float] = {}
+    for name, func in get_benchmarks(namespace.quick).items():
+        if namespace.filter and namespace.filter not in name:
+            continue
+        results[name] = seconds = measure(func, namespace.repeat)
+        line = "%-32s %s" % (name, format_seconds(seconds))
+        if name in baseline:
+            change = (seconds / baseline[name] - 1) * 100
+            line += "  baseline %s  %+7.1f%%" % (
+                format_seconds(baseline[name]),
+                change,
+            )
+            if change > namespace.threshold:
+                line += "  REGRESSION"
+        print(line, flush=True)
+    if namespace.save:
+        with open(namespace.save, "w", encoding="utf-8") as saved:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                saved,
+                indent=2,
+                sort_keys=True,
+            )
+    regressions = compare(results, baseline, namespace.threshold)
+    if regressions:
+        print(
+            "%d benchmark(s) more than %.1f%% slower than the baseline"
+            % (len(regressions), namespace.threshold)
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
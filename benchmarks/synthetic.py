@@ -0,0 +1,113 @@
+import enum
+from typing import Callable, Dict, List
+
+from parse_this import create_parser, parse_class
+
+Shade = enum.Enum("Shade", ["LIGHT", "DARK"])
+
+
+def _get_type(index: int, nb_params: int, mixed: bool) -> str:
+    """Return the annotation and default value of the parameter at index.
+
+    Args:
+        index: position of the parameter
+        nb_params: number of parameters of the function
+        mixed: whether the parameters are ints, Shade and lists of ints, in
+        turn, rather than ints only
+    """
+    optional = index >= nb_params // 2
+    kind = index % 3 if mixed else 0
+    # A single list can be positional, they are only used for options
+    if kind == 2 and not optional:
+        kind = 0
+    if kind == 1:
+        return "Shade = Shade.DARK" if optional else "Shade"
+    if kind == 2:
+        return "list[int] = None"
+    return "int = %d" % index if optional else "int"
+
+
+def make_function(
+    name: str, nb_params: int, method: bool = False, mixed: bool = False
+) -> Callable:
+    """Return a function taking nb_params parameters, half of them with a
+    default value, documented with a docstring parse_this understands.
+
+    Args:
+        name: name of the generated function
+        nb_params: number of parameters of the generated function
+        method: whether the function takes 'self' as its first parameter
+        mixed: whether the parameters are ints, enums and lists of ints rather
+        than ints only
+    """
+    params = ["self"] if method else []
+    docs = []
+    for index in range(nb_params):
+        params.append("p%d: %s" % (index, _get_type(index, nb_params, mixed)))
+        docs.append("        p%d: help message for parameter %d" % (index, index))
+    source = '''def {name}({params}):
+    """Synthetic function {name}.
+
+    Args:
+{docs}
+    """
+    return None
+'''.format(name=name, params=", ".join(params), docs="\n".join(docs))
+    namespace: Dict[str, Callable] = {"Shade": Shade}
+    exec(source, namespace)
+    return namespace[name]
+
+
+def make_args(nb_params: int, mixed: bool = False) -> List[str]:
+    """Return a command line setting every parameter of a synthetic function,
+    half of them as positional values and half of them as options.
+
+    Args:
+        nb_params: number of parameters of the function
+        mixed: whether the function was made with mixed parameters
+    """
+    args = []
+    for index in range(nb_params):
+        if index >= nb_params // 2:
+            args.append("--p%d" % index)
+        annotation = _get_type(index, nb_params, mixed)
+        if annotation.startswith("Shade"):
+            args.append("LIGHT")
+        elif annotation.startswith("list"):
+            args.extend([str(index), str(index + 1)])
+        else:
+            args.append(str(index))
+    return args
+
+
+def make_methods(
+    nb_methods: int, nb_params: int, mixed: bool = False
+) -> Dict[str, Callable]:
+    """Return the undecorated __init__ and nb_methods methods of a class.
+
+    Args:
+        nb_methods: number of methods, i.e. sub-commands, to create
+        nb_params: number of parameters of each method
+        mixed: whether the parameters are ints, enums and lists of ints rather
+        than ints only
+    """
+    methods = {"__init__": make_function("__init__", 0, True)}
+    for index in range(nb_methods):
+        name = "command_%d" % index
+        methods[name] = make_function(name, nb_params, True, mixed)
+    return methods
+
+
+def make_class(methods: Dict[str, Callable], lazy: bool = False) -> type:
+    """Return a class decorated with 'parse_class' whose methods are decorated
+    with 'create_parser'.
+
+    Args:
+        methods: the undecorated methods of the class, see make_methods
+        lazy: whether the parsers of the class and its methods are lazily built
+    """
+    attributes = {
+        name: create_parser(lazy=lazy)(method) for name, method in methods.items()
+    }
+    cls = type("Synthetic%d" % len(methods), (object,), attributes)
+    return parse_class(lazy=lazy)(cls)
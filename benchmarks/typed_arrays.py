@@ -0,0 +1,64 @@
+"""Compare the memory and time taken to parse a large numeric vector into a
+list, with the element type and nargs="+" of argparse, and into an array.array
+with 'create_parser(typed_arrays=True)'.
+
+Usage: python -m benchmarks.typed_arrays [--values N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from parse_this import create_parser
+
+
+def vector(values: list[float]):
+    return values
+
+
+def make_argparse_parser() -> argparse.ArgumentParser:
+    """Return the parser of 'vector' as it used to be built."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("values", type=float, nargs="+")
+    return parser
+
+
+def measure(parse: Callable[[List[str]], Any], args: List[str]) -> Tuple[int, float]:
+    """Return the memory, in bytes, retained by the result of parse(args) and
+    the time, in seconds, it took.
+
+    Args:
+        parse: callable parsing args
+        args: the command line
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse(args)
+    duration = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=int, default=1000000)
+    namespace = parser.parse_args()
+    args = ["%d.5" % index for index in range(namespace.values)]
+    typed_parser = create_parser(typed_arrays=True)(vector).parser
+    list_memory, list_time = measure(make_argparse_parser().parse_args, args)
+    array_memory, array_time = measure(typed_parser.parse_args, args)
+    print("Parsing a vector of %d floats" % namespace.values)
+    print(
+        "  list (nargs='+'): %8.1f MB %8.2f ms" % (list_memory / 1e6, list_time * 1000)
+    )
+    print(
+        "  typed_arrays:     %8.1f MB %8.2f ms (x%.1f less memory)"
+        % (array_memory / 1e6, array_time * 1000, list_memory / array_memory)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+from parse_this.call import CallError
 from parse_this.exception import ParseThisException
 from parse_this.parsers import ClassParser, FunctionParser, MethodParser
 
 __all__ = [
+    "CallError",
     "ParseThisException",
     "parse_this",
     "create_parser",
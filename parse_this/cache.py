@@ -0,0 +1,104 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+_LOG = logging.getLogger(__name__)
+
+# Attributes of a callable its parser is built from
+_VERSION_ATTRIBUTES = (
+    "__code__",
+    "__defaults__",
+    "__kwdefaults__",
+    "__annotations__",
+    "__doc__",
+)
+
+
+def _get_version(func: Callable) -> Tuple[Any, ...]:
+    """Return the attributes of func its parser is built from."""
+    return tuple(getattr(func, name, None) for name in _VERSION_ATTRIBUTES)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics about a ParserCache, similar to functools.lru_cache's."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ParserCache(object):
+    """Bounded LRU cache of the parsers built for a callable.
+
+    Entries are keyed on the callable and the options used to build its parser.
+    An entry is considered stale, and dropped, when the callable's '__code__',
+    '__defaults__', '__kwdefaults__', '__annotations__' or '__doc__' have been
+    replaced since the entry was stored.
+    """
+
+    _maxsize: int
+    _hits: int
+    _misses: int
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize: maximum number of entries kept in the cache, 0 disables
+            caching altogether
+        """
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[Any, ...], Any]]" = (
+            OrderedDict()
+        )
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, func: Callable, *options: Any) -> Optional[Any]:
+        """Return the value stored for func and options, None if there is none.
+
+        Args:
+            func: the callable the value was built for
+            options: any hashable options that were used to build the value
+        """
+        key = (func, *options)
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, value = entry
+            # Compared by identity, the attributes are replaced not updated
+            if all(
+                stored is current
+                for stored, current in zip(version, _get_version(func))
+            ):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            _LOG.debug("Cached parser for '%s' is stale", func.__name__)
+            del self._entries[key]
+        self._misses += 1
+        return None
+
+    def put(self, func: Callable, *options: Any, value: Any) -> None:
+        """Store value for func and options, evicting the least recently used
+        entry if the cache is full.
+
+        Args:
+            func: the callable the value was built for
+            options: any hashable options that were used to build the value
+            value: the value to store
+        """
+        if self._maxsize <= 0:
+            return
+        self._entries[(func, *options)] = (_get_version(func), value)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics."""
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove every entry from the cache and reset its statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
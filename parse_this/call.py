@@ -1,15 +1,313 @@
+import inspect
+import io
 import logging
-from argparse import Namespace
+from argparse import ArgumentParser, Namespace
+from collections import deque
+from contextlib import redirect_stderr
 from functools import wraps
-from typing import Any, Callable, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    TYPE_CHECKING,
+    Optional,
+    Tuple,
+)
 
 from parse_this.args import _get_args_to_parse
 from parse_this.exception import ParseThisException
 from parse_this.helpers import _get_args_name_from_parser
+from parse_this.hooks import _dispatch
+from parse_this.instrument import _arun_instrumented, _run_instrumented
+from parse_this.phases import CALL, PARSE, _arun_phase, _run_phase
+from parse_this.types import _MAPPING_CONVERTERS, _release_mappings
+
+if TYPE_CHECKING:
+    import asyncio
 
 _LOG = logging.getLogger(__name__)
 
 
+class _CallPlan(NamedTuple):
+    """Everything needed to call a target from a parsed namespace, compiled once
+    per parser so that dispatching does not inspect the parser again."""
+
+    target: Callable
+    arg_names: Tuple[str, ...]
+    log_level: bool
+    # Arguments mapping a file, released once target returns
+    mapped_args: Tuple[str, ...] = ()
+    # Name of the method looked up on the instance, when there is one
+    name: str = ""
+
+
+def _compile_call_plan(
+    parser: ArgumentParser,
+    target: Callable,
+    log_level: bool = False,
+    name: Optional[str] = None,
+) -> _CallPlan:
+    """Return the call plan of target whose arguments are defined by parser.
+
+    Args:
+        parser: the parser defining the arguments of target
+        target: the callable the parsed arguments are passed to
+        log_level: whether the namespace holds a log level even though parser
+        does not define it, e.g. when it was added to a top level parser
+        name: name of the method looked up on the instance it is called on,
+        defaults to the name of target
+    """
+    log_level = log_level or any(
+        action.dest == "log_level" for action in parser._actions
+    )
+    arg_names = tuple(_get_args_name_from_parser(parser))
+    mapped_args = tuple(
+        action.dest
+        for action in parser._actions
+        if action.dest in arg_names
+        # The type may be wrapped, e.g. to time the conversions
+        and getattr(action.type, "__wrapped__", action.type) in _MAPPING_CONVERTERS
+    )
+    name = name or getattr(target, "__name__", "")
+    return _CallPlan(target, arg_names, log_level, mapped_args, name)
+
+
+def _get_call_plan(parser: Any, target: Callable) -> _CallPlan:
+    """Return the call plan stored on parser, compiling and storing it on
+    first use.
+
+    Args:
+        parser: the parser defining the arguments of target
+        target: the callable the parsed arguments are passed to
+    """
+    plan = getattr(parser, "call_plan", None)
+    if plan is None:
+        plan = parser.call_plan = _compile_call_plan(parser, target)
+    return plan
+
+
+def _call_from_plan(
+    plan: _CallPlan,
+    namespace: Namespace,
+    instance: Any = None,
+    run_coroutine: bool = True,
+) -> Any:
+    """Call the target of plan with the values of the parsed namespace.
+
+    Args:
+        plan: the call plan of the target
+        namespace: the namespace object parsed from the command line
+        instance: the instance the method of plan is called on, None to call
+        the target of plan
+        run_coroutine: if the target returns a coroutine run it to completion,
+        see '_run_coroutine', otherwise return it as is
+    """
+    values = vars(namespace)
+    if plan.log_level:
+        logging.basicConfig(level=values["log_level"])
+    arguments = {name: values[name] for name in plan.arg_names}
+    # Looked up on the instance so that the override of a subclass is called
+    target = plan.target if instance is None else getattr(instance, plan.name)
+    if plan.mapped_args:
+        result = _call_and_release(
+            target, arguments, [arguments[name] for name in plan.mapped_args]
+        )
+    else:
+        result = target(**arguments)
+    return _run_coroutine(result) if run_coroutine else result
+
+
+def _call_and_release(
+    target: Callable, arguments: Dict[str, Any], mappings: List[Any]
+) -> Any:
+    """Call target and release the file mappings passed to it once it returns,
+    or once the coroutine it returns is done.
+
+    Args:
+        target: the callable to call
+        arguments: keyword arguments of the call
+        mappings: the mmap.mmap and memoryview arguments of the call
+    """
+    try:
+        result = target(**arguments)
+    except BaseException:
+        _release_mappings(mappings)
+        raise
+    if inspect.iscoroutine(result):
+        return _release_after(result, mappings)
+    _release_mappings(mappings)
+    return result
+
+
+async def _release_after(coroutine: Any, mappings: List[Any]) -> Any:
+    """Return the result of coroutine, releasing mappings once it is done."""
+    try:
+        return await coroutine
+    finally:
+        _release_mappings(mappings)
+
+
+def _run_coroutine(result: Any) -> Any:
+    """Return the result of the coroutine result, run in a new event loop, or
+    result itself if it is not a coroutine.
+
+    Args:
+        result: the value returned by a decorated callable
+
+    Note:
+        When an event loop is already running in the current thread the
+        coroutine can not be run synchronously and is returned as is, to be
+        awaited by the caller.
+    """
+    if not inspect.iscoroutine(result):
+        return result
+    # asyncio is only imported once a coroutine has to be run
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(result)
+    return result
+
+
+async def _maybe_await(result: Any) -> Any:
+    """Return the value of result, awaiting it first if it is awaitable."""
+    return await result if inspect.isawaitable(result) else result
+
+
+async def _await_result(
+    args: List[str], result: Any, semaphore: "asyncio.Semaphore"
+) -> Any:
+    """Return the value of result once awaited, or a CallError if it raised.
+
+    Args:
+        args: the list of arguments result was computed from
+        result: the value, or awaitable, returned by dispatching args
+        semaphore: limits the number of awaitables running concurrently
+    """
+    if not inspect.isawaitable(result):
+        return result
+    try:
+        async with semaphore:
+            return await result
+    except Exception as error:
+        _LOG.debug("Call with %s failed: %r", args, error)
+        return CallError(args, error, "")
+    finally:
+        # Cancelled while waiting for the semaphore, the coroutine never ran
+        if inspect.iscoroutine(result):
+            result.close()
+
+
+class CallError(NamedTuple):
+    """Stands for the result of an item of a batch that could not be parsed or
+    whose call raised."""
+
+    args: List[str]
+    error: BaseException
+    # What the parser printed on stderr, i.e. the usage and the error message
+    message: str
+
+
+def _call_one(
+    parse: Callable[[List[str]], Namespace],
+    args: List[str],
+    dispatch: Callable[[Namespace], Any],
+) -> Any:
+    """Return the result of dispatching the namespace parsed from args, or a
+    CallError if parsing or dispatching failed.
+
+    Args:
+        parse: callable returning the namespace parsed from a list of arguments
+        args: the list of arguments to parse
+        dispatch: callable returning the result of the call for a namespace
+    """
+    stderr = io.StringIO()
+    try:
+        # argparse prints the usage before exiting on error, keep it in the
+        # error instead of flooding stderr
+        with redirect_stderr(stderr):
+            namespace = parse(args)
+        return dispatch(namespace)
+    except (Exception, SystemExit) as error:
+        _LOG.debug("Call with %s failed: %r", args, error)
+        return CallError(args, error, stderr.getvalue())
+
+
+def _call_many(
+    parser: Any, args_list: Iterable[List[str]], dispatch: Callable[[Namespace], Any]
+) -> Iterator[Any]:
+    """Lazily parse each list of arguments and yield the result of dispatching
+    the parsed namespace, or a CallError if parsing or dispatching failed.
+
+    Args:
+        parser: the parser used for every list of arguments
+        args_list: iterable of lists of arguments to parse
+        dispatch: callable returning the result of the call for a namespace
+    """
+    for args in args_list:
+        yield _call_one(parser.parse_args, list(args), dispatch)
+
+
+async def _acall_many(
+    parser: Any,
+    args_list: Iterable[List[str]],
+    dispatch: Callable[[Namespace], Any],
+    concurrency: int,
+) -> AsyncIterator[Any]:
+    """Asynchronously yield, in order, the result of dispatching the namespace
+    parsed from each list of arguments, or a CallError if parsing, dispatching
+    or awaiting the result failed.
+
+    Args:
+        parser: the parser used for every list of arguments
+        args_list: iterable of lists of arguments to parse
+        dispatch: callable returning the result, possibly a coroutine, of the
+        call for a namespace
+        concurrency: maximum number of coroutines running at the same time,
+        twice as many results are pending at most
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        for args in args_list:
+            args = list(args)
+            result = _call_one(parser.parse_args, args, dispatch)
+            pending.append(
+                asyncio.ensure_future(_await_result(args, result, semaphore))
+            )
+            if len(pending) >= 2 * concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _check_not_init(func_name: str) -> None:
+    """Raise a ParseThisException if func_name is '__init__'."""
+    # Deferred to the call so that __init__ can be decorated in class decorated
+    # with parse_class
+    if func_name == "__init__":
+        raise ParseThisException(
+            (
+                "To use 'create_parser' on the"
+                "'__init__' you need to decorate the "
+                "class with '@parse_class'"
+            )
+        )
+
+
 def _get_parser_call_method(func: Callable) -> Callable:
     """Returns the method that is linked to the 'call' method of the parser
 
@@ -32,59 +330,127 @@ def _get_parser_call_method(func: Callable) -> Callable:
             args: arguments to be parsed
         """
         _LOG.debug("Calling %s.parser.call", func_name)
-        # Defer this check in the method call so that __init__ can be
-        # decorated in class decorated with parse_class
-        if func_name == "__init__":
-            raise ParseThisException(
-                (
-                    "To use 'create_parser' on the"
-                    "'__init__' you need to decorate the "
-                    "class with '@parse_class'"
-                )
-            )
-        namespace = parser.parse_args(_get_args_to_parse(args))
-        if instance is None:
+        _check_not_init(func_name)
+        args_to_parse = _get_args_to_parse(args)
+
+        def parse() -> Namespace:
+            return _run_phase(PARSE, parser.parse_args, args_to_parse)
+
+        def call(namespace: Namespace) -> Any:
+            plan = _get_call_plan(parser, func)
             # If instance is None we are probably decorating a function not a
             # method and don't need the instance
-            args_name = _get_args_name_from_parser(parser)
-            return _call(func, args_name, namespace)
-        return _call_method_from_namespace(instance, func_name, namespace)
+            return _run_phase(CALL, _call_from_plan, plan, namespace, instance)
+
+        return _run_instrumented(
+            parser,
+            args_to_parse,
+            lambda: _dispatch(func.__qualname__, args_to_parse, parse, call),
+        )
 
     return inner_call
 
 
-def _call(callable_obj: Callable, arg_names: List[str], namespace: Namespace) -> Any:
-    """Actually calls the callable with the namespace parsed from the command
-    line.
+def _get_parser_call_many_method(func: Callable) -> Callable:
+    """Returns the method that is linked to the 'call_many' method of the parser
 
     Args:
-        callable_obj: a callable object
-        arg_names: name of the function arguments
-        namespace: the namespace object parsed from the command line
+        func: the decorated function
     """
-    try:
-        logging.basicConfig(level=namespace.log_level)
-    except AttributeError:
-        pass
-    arguments = {arg_name: getattr(namespace, arg_name) for arg_name in arg_names}
-    return callable_obj(**arguments)
+    func_name = func.__name__
+    parser = func.parser  # type: ignore[attr-defined]
 
+    def call_many(
+        args_list: Iterable[List[str]], instance: Any = None
+    ) -> Iterator[Any]:
+        """Lazily call func for each list of arguments, the parser is reused and
+        a failing item yields a CallError instead of aborting the batch.
 
-def _call_method_from_namespace(
-    obj: Any, method_name: str, namespace: Namespace
-) -> Any:
-    """Call the method, retrieved from obj, with the correct arguments via
-    the namespace
+        Args:
+            args_list: iterable of lists of arguments to be parsed
+            instance: the instance the method is called on, None for a function
+        """
+        _LOG.debug("Calling %s.parser.call_many", func_name)
+        _check_not_init(func_name)
+        plan = _get_call_plan(parser, func)
+        return _call_many(
+            parser,
+            args_list,
+            lambda namespace: _call_from_plan(plan, namespace, instance),
+        )
+
+    return call_many
+
+
+def _get_parser_acall_method(func: Callable) -> Callable:
+    """Returns the coroutine function that is linked to the 'acall' method of
+    the parser
+
+    Args:
+        func: the decorated function
+    """
+    func_name = func.__name__
+    parser = func.parser  # type: ignore[attr-defined]
+
+    async def acall(instance: Any = None, args: Optional[List[str]] = None) -> Any:
+        """Same as <parser>.call but awaits the result of func if it is a
+        coroutine, to be used from a running event loop.
+
+        Args:
+            instance: the instance the method is called on, None for a function
+            args: arguments to be parsed
+        """
+        _LOG.debug("Calling %s.parser.acall", func_name)
+        _check_not_init(func_name)
+        args_to_parse = _get_args_to_parse(args)
+
+        async def call(namespace: Namespace) -> Any:
+            plan = _get_call_plan(parser, func)
+            return await _maybe_await(
+                _call_from_plan(plan, namespace, instance, run_coroutine=False)
+            )
+
+        async def run() -> Any:
+            namespace = _run_phase(PARSE, parser.parse_args, args_to_parse)
+            return await _arun_phase(CALL, call, namespace)
+
+        return await _arun_instrumented(parser, args_to_parse, run)
+
+    return acall
+
+
+def _get_parser_acall_many_method(func: Callable) -> Callable:
+    """Returns the method that is linked to the 'acall_many' method of the
+    parser
 
     Args:
-        obj: any kind of object
-        method_name: method to be called
-        namespace: an argparse.Namespace object containing parsed command
-        line arguments
+        func: the decorated function
     """
-    method = getattr(obj, method_name)
-    method_parser = method.parser
-    arg_names = _get_args_name_from_parser(method_parser)
-    if method_name == "__init__":
-        return _call(obj, arg_names, namespace)
-    return _call(method, arg_names, namespace)
+    func_name = func.__name__
+    parser = func.parser  # type: ignore[attr-defined]
+
+    def acall_many(
+        args_list: Iterable[List[str]], concurrency: int = 10, instance: Any = None
+    ) -> AsyncIterator[Any]:
+        """Asynchronously call func for each list of arguments on the running
+        event loop, yielding the results in order. A failing item yields a
+        CallError instead of aborting the batch.
+
+        Args:
+            args_list: iterable of lists of arguments to be parsed
+            concurrency: maximum number of calls awaited at the same time
+            instance: the instance the method is called on, None for a function
+        """
+        _LOG.debug("Calling %s.parser.acall_many", func_name)
+        _check_not_init(func_name)
+        plan = _get_call_plan(parser, func)
+        return _acall_many(
+            parser,
+            args_list,
+            lambda namespace: _call_from_plan(
+                plan, namespace, instance, run_coroutine=False
+            ),
+            concurrency,
+        )
+
+    return acall_many
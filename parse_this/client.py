@@ -0,0 +1,50 @@
+"""Send a command line to a server started with '<parser>.serve(socket_path)'.
+
+Usage: python -m parse_this.client SOCKET_PATH [ARGUMENTS...]
+
+The working directory and environment of the client are used to run the
+command, its output is written to stdout and stderr and the exit code is the
+one of the command. Only the standard library is imported so the module can
+also be copied and run as a standalone script.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import List, Optional
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of 'python -m parse_this.client', return the exit code."""
+    args = sys.argv[1:] if args is None else args
+    # Bind the streams now, the output is written while they may be replaced
+    stdout, stderr = sys.stdout, sys.stderr
+    if not args:
+        print(
+            "usage: python -m parse_this.client SOCKET_PATH [ARGUMENTS...]", file=stderr
+        )
+        return 2
+    socket_path, argv = args[0], args[1:]
+    request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError as error:
+            print(f"Can not connect to '{socket_path}': {error}", file=stderr)
+            return 1
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as replies:
+            for line in replies:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"]
+                stream = stdout if message["stream"] == "stdout" else stderr
+                stream.write(message["data"])
+                stream.flush()
+    print("Connection closed by the server", file=stderr)
+    return 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
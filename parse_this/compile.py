@@ -0,0 +1,480 @@
+"""Generate a plain argparse module equivalent to the parser of a class
+decorated with 'parse_class'.
+
+The generated module neither imports parse_this nor the decorated class to
+parse the command line, the class is only imported to dispatch the call.
+
+Usage: python -m parse_this.compile mymodule:MyClass -o _cli_generated.py [--check]
+"""
+
+import argparse
+import ast
+import builtins
+import enum
+import importlib
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from parse_this.exception import ParseThisException
+from parse_this.help.action import FullHelpAction
+from parse_this.helpers import _get_args_name_from_parser, _is_enum_type
+from parse_this.instrument import InstrumentationAction
+from parse_this.parsing import _identity
+from parse_this.sequences import SequenceAction
+from parse_this.types import _is_file_converter
+
+_LOG = logging.getLogger(__name__)
+
+_HEADER = """# Generated by 'python -m parse_this.compile {target}', do not edit.
+# Run 'python -m parse_this.compile {target} -o <this file> --check' to make
+# sure it is up to date.
+# ruff: noqa: E501
+import argparse
+import importlib
+import sys
+
+_TARGET = {target!r}
+"""
+
+_RUNTIME = '''
+
+def _resolve(reference):
+    module_name, _, qualname = reference.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _lazy_type(reference):
+    """Converter importing the type it delegates to on first use."""
+    converter = None
+
+    def _convert(value):
+        nonlocal converter
+        if converter is None:
+            converter = _resolve(reference)
+        return converter(value)
+
+    _convert.__name__ = reference.rpartition(".")[2].rpartition(":")[2]
+    return _convert
+
+
+def _enum_name(names):
+    """Converter validating an enum member name, the member is looked up when
+    the call is dispatched."""
+
+    def _convert(value):
+        if value not in names:
+            raise argparse.ArgumentTypeError(
+                "invalid choice: %r (choose from %s)" % (value, ", ".join(names))
+            )
+        return value
+
+    return _convert
+
+
+class _FullHelpAction(argparse._HelpAction):
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.print_help()
+        for action in parser._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                for choice, subparser in action.choices.items():
+                    print(f"** Command '{choice}' **")
+                    print(f"{subparser.format_help()}\\n")
+        parser.exit()
+
+
+class _SequenceAction(argparse.Action):
+    """One or more values, read from a file with '@path' or stdin with '-' if
+    value_files is set."""
+
+    def __init__(
+        self, option_strings, dest, element_type=str, value_files=False, **kwargs
+    ):
+        super().__init__(option_strings, dest, nargs="+", **kwargs)
+        self.element_type = element_type
+        self.value_files = value_files
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if self.value_files:
+            values = self._read_values(values)
+        setattr(namespace, self.dest, [self._convert(value) for value in values])
+
+    def _read_values(self, values):
+        if values == ["-"]:
+            return [line.strip() for line in sys.stdin if line.strip()]
+        if len(values) == 1 and values[0].startswith("@") and len(values[0]) > 1:
+            try:
+                with open(values[0][1:], encoding="utf-8") as lines:
+                    return [line.strip() for line in lines if line.strip()]
+            except OSError as error:
+                raise argparse.ArgumentError(
+                    self, "can't open '%s': %s" % (values[0][1:], error)
+                )
+        return values
+
+    def _convert(self, value):
+        try:
+            return self.element_type(value)
+        except argparse.ArgumentTypeError as error:
+            raise argparse.ArgumentError(self, str(error))
+        except (TypeError, ValueError):
+            name = getattr(self.element_type, "__name__", repr(self.element_type))
+            raise argparse.ArgumentError(self, "invalid %s value: %r" % (name, value))
+
+
+class _SubcommandAwareArgumentParser(argparse.ArgumentParser):
+    _subparsers_action = None
+
+    def parse_args(self, args=None, namespace=None):
+        namespace, remainder = self.parse_known_args(args, namespace)
+        if remainder:
+            method = getattr(namespace, "method", None)
+            if (
+                self._subparsers_action is not None
+                and method is not None
+                and method in self._subparsers_action.choices
+            ):
+                subparser = self._subparsers_action.choices[method]
+                subparser.error("unrecognized arguments: %s" % " ".join(remainder))
+            self.error("unrecognized arguments: %s" % " ".join(remainder))
+        return namespace
+'''
+
+_DISPATCH = '''
+
+def _get_arguments(values, arg_names, enums):
+    arguments = {}
+    for name in arg_names:
+        value = values[name]
+        if name in enums and isinstance(value, str):
+            value = _resolve(enums[name])[value]
+        arguments[name] = value
+    return arguments
+
+
+def call(args=None, instance=None):
+    """Parse args, sys.argv if None, and call the selected method on instance,
+    created from the command line if None."""
+    namespace = build_parser().parse_args(sys.argv[1:] if args is None else args)
+    values = vars(namespace)
+    if "log_level" in values:
+        import logging
+
+        logging.basicConfig(level=values["log_level"])
+    if instance is None:
+        if _INIT is None:
+            from parse_this.exception import ParseThisException
+
+            raise ParseThisException(
+                "'__init__' method is not decorated. Please provide an instance"
+            )
+        instance = _resolve(_TARGET)(**_get_arguments(values, *_INIT))
+    method_name, arg_names, enums = _COMMANDS[namespace.method]
+    return getattr(instance, method_name)(**_get_arguments(values, arg_names, enums))
+
+
+if __name__ == "__main__":
+    print(call())
+'''
+
+
+def _resolve(reference: str) -> Any:
+    """Return the object referenced by 'module:qualname'.
+
+    Args:
+        reference: the module and qualified name of the object
+    """
+    module_name, _, qualname = reference.partition(":")
+    obj: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _get_reference(obj: Any) -> str:
+    """Return the 'module:qualname' reference of obj.
+
+    Raises:
+        ParseThisException if obj can not be imported from its module
+    """
+    reference = "%s:%s" % (obj.__module__, obj.__qualname__)
+    if "<" in reference:
+        raise ParseThisException(f"'{reference}' can not be imported")
+    return reference
+
+
+def _get_literal(value: Any) -> str:
+    """Return the source code of the literal value.
+
+    Raises:
+        ParseThisException if value is not a literal
+    """
+    source = repr(value)
+    try:
+        ast.literal_eval(source)
+    except (ValueError, SyntaxError):
+        raise ParseThisException(f"Default value {source} is not a literal")
+    return source
+
+
+class _ModuleWriter(object):
+    """Accumulates the source code of the generated module."""
+
+    _lines: List[str]
+    _enums: Dict[str, Dict[str, str]]
+
+    def __init__(self):
+        self._lines = []
+        # Enum class reference of the arguments of each parser, by dest
+        self._enums = {}
+
+    def emit(self, line: str = "") -> None:
+        self._lines.append(line)
+
+    def get_source(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+    def add_actions(self, var: str, parser: argparse.ArgumentParser) -> None:
+        """Emit the add_argument calls for all the actions of parser.
+
+        Args:
+            var: name of the variable holding the parser in the generated code
+            parser: the parser whose actions are generated
+        """
+        enums = self._enums.setdefault(var, {})
+        for action in parser._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                continue
+            args = [repr(option) for option in action.option_strings] or [
+                repr(action.dest)
+            ]
+            kwargs = self._get_action_kwargs(action, enums)
+            kwargs["help"] = repr(action.help)
+            parameters = ", ".join(args + ["%s=%s" % item for item in kwargs.items()])
+            self.emit("    %s.add_argument(%s)" % (var, parameters))
+
+    def _get_action_kwargs(
+        self, action: argparse.Action, enums: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Return the keyword arguments, as source code, re-creating action.
+
+        Args:
+            action: the action to generate
+            enums: enum class reference of the arguments, updated if action
+            expects an enum member
+        """
+        if isinstance(action, FullHelpAction):
+            return {"action": "_FullHelpAction"}
+        if isinstance(action, argparse._HelpAction):
+            return {"action": repr("help")}
+        if isinstance(action, argparse._StoreTrueAction):
+            return {"action": repr("store_true"), "default": repr(action.default)}
+        if isinstance(action, argparse._StoreFalseAction):
+            return {"action": repr("store_false"), "default": repr(action.default)}
+        if isinstance(action, SequenceAction):
+            return self._get_sequence_kwargs(action)
+        if _is_file_converter(action.type):
+            raise ParseThisException(
+                f"Argument '{action.dest}' is loaded from a file which is not "
+                f"supported by the generated module"
+            )
+        if type(action) is not argparse._StoreAction:
+            raise ParseThisException(
+                f"Argument '{action.dest}' uses an unsupported action "
+                f"'{type(action).__name__}'"
+            )
+        kwargs = {}
+        choices = list(action.choices) if action.choices is not None else None
+        if choices and _is_enum_type(type(choices[0])):
+            enum_class = type(choices[0])
+            enums[action.dest] = _get_reference(enum_class)
+            names = tuple(member.name for member in choices)
+            kwargs["type"] = "_enum_name(%r)" % (names,)
+            kwargs["choices"] = repr(names)
+        else:
+            if action.type not in (None, _identity):
+                kwargs["type"] = self._get_type(action.type)
+            if choices is not None:
+                kwargs["choices"] = _get_literal(choices)
+        if action.option_strings:
+            default = action.default
+            if isinstance(default, enum.Enum):
+                default = default.name
+            kwargs["default"] = _get_literal(default)
+        if action.nargs is not None:
+            kwargs["nargs"] = repr(action.nargs)
+        if action.metavar is not None:
+            kwargs["metavar"] = repr(action.metavar)
+        return kwargs
+
+    def _get_sequence_kwargs(self, action: SequenceAction) -> Dict[str, str]:
+        """Return the keyword arguments, as source code, re-creating the
+        sequence argument action.
+
+        Raises:
+            ParseThisException if action lazily converts its values or stores
+            them in an array
+        """
+        if action.lazy or action.typecode is not None:
+            raise ParseThisException(
+                f"Argument '{action.dest}' is an Iterable or an array which is not "
+                f"supported by the generated module"
+            )
+        kwargs = {"action": "_SequenceAction"}
+        if action.element_type is not str:
+            kwargs["element_type"] = self._get_type(action.element_type)
+        if action.value_files:
+            kwargs["value_files"] = "True"
+        if action.option_strings:
+            kwargs["default"] = _get_literal(action.default)
+        return kwargs
+
+    def _get_type(self, arg_type: Any) -> str:
+        """Return the source code of the argparse type arg_type."""
+        if getattr(builtins, getattr(arg_type, "__name__", ""), None) is arg_type:
+            return arg_type.__name__
+        return "_lazy_type(%r)" % _get_reference(arg_type)
+
+    def get_enums(self, var: str) -> Dict[str, str]:
+        return self._enums.get(var, {})
+
+
+def generate(target: str) -> str:
+    """Return the source code of the module equivalent to the parser of target.
+
+    Args:
+        target: reference, 'module:qualname', of a class decorated with
+        'parse_class'
+
+    Raises:
+        ParseThisException if target is not a decorated class or its parser
+        can not be generated
+    """
+    return _generate_source(_resolve(target), target)
+
+
+def _generate_source(cls: type, target: str) -> str:
+    """Return the source code of the module equivalent to the parser of cls.
+
+    Args:
+        cls: a class decorated with 'parse_class'
+        target: reference, 'module:qualname', of cls
+    """
+    parser: Any = getattr(cls, "parser", None)
+    if not isinstance(getattr(parser, "parser_to_method", None), dict):
+        raise ParseThisException(f"'{target}' is not decorated with 'parse_class'")
+    if "--batch" in parser._option_string_actions:
+        raise ParseThisException(
+            f"'{target}' uses the batch mode which is not supported by the "
+            f"generated module"
+        )
+    for action in parser._actions:
+        if isinstance(action, InstrumentationAction):
+            raise ParseThisException(
+                f"'{target}' uses the '{action.option_strings[0]}' argument which "
+                f"is not supported by the generated module"
+            )
+    writer = _ModuleWriter()
+    writer.emit(_HEADER.format(target=target) + _RUNTIME)
+    writer.emit()
+    writer.emit("def build_parser():")
+    writer.emit(
+        "    parser = _SubcommandAwareArgumentParser(description=%r, "
+        "add_help=False, conflict_handler='resolve')" % parser.description
+    )
+    writer.add_actions("parser", parser)
+    sub_parsers = parser._subparsers_action
+    # The description of the sub-commands is held by their argument group
+    (description,) = [
+        group.description
+        for group in parser._action_groups
+        if sub_parsers in group._group_actions
+    ]
+    writer.emit(
+        "    sub_parsers = parser.add_subparsers(description=%r, dest=%r)"
+        % (description, sub_parsers.dest)
+    )
+    writer.emit("    parser._subparsers_action = sub_parsers")
+    commands: List[Tuple[str, str, List[str], str]] = []
+    for index, (name, sub_parser) in enumerate(sub_parsers.choices.items()):
+        var = "sub_parser_%d" % index
+        writer.emit(
+            "    %s = sub_parsers.add_parser(%r, description=%r, add_help=False)"
+            % (var, name, sub_parser.description)
+        )
+        writer.add_actions(var, sub_parser)
+        commands.append(
+            (
+                name,
+                parser.parser_to_method[name],
+                _get_args_name_from_parser(sub_parser),
+                var,
+            )
+        )
+    writer.emit("    return parser")
+    writer.emit()
+    writer.emit()
+    init: Optional[str] = None
+    if "__init__" in parser.parser_to_method:
+        init = "(%r, %r)" % (
+            tuple(_get_args_name_from_parser(getattr(cls, "__init__").parser)),
+            writer.get_enums("parser"),
+        )
+    writer.emit("_INIT = %s" % init)
+    writer.emit("_COMMANDS = {")
+    for name, method_name, arg_names, var in commands:
+        writer.emit(
+            "    %r: (%r, %r, %r),"
+            % (name, method_name, tuple(arg_names), writer.get_enums(var))
+        )
+    writer.emit("}")
+    writer.emit(_DISPATCH.rstrip("\n"))
+    return writer.get_source()
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of 'python -m parse_this.compile', return the exit code."""
+    parser = argparse.ArgumentParser(
+        prog="python -m parse_this.compile",
+        description="Generate a plain argparse module from a class decorated "
+        "with 'parse_class'.",
+    )
+    parser.add_argument("target", help="the decorated class as module:ClassName")
+    parser.add_argument(
+        "-o", "--output", required=True, help="path of the generated module"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="do not write the module, fail if it is not up to date",
+    )
+    namespace = parser.parse_args(args)
+    try:
+        source = generate(namespace.target)
+    except (ParseThisException, ImportError, AttributeError) as error:
+        parser.error(str(error))
+    if namespace.check:
+        try:
+            with open(namespace.output, encoding="utf-8") as generated:
+                up_to_date = generated.read() == source
+        except OSError:
+            up_to_date = False
+        if not up_to_date:
+            print(
+                f"{namespace.output} is out of date, regenerate it with: "
+                f"python -m parse_this.compile {namespace.target} "
+                f"-o {namespace.output}",
+                file=sys.stderr,
+            )
+            return 1
+        return 0
+    with open(namespace.output, "w", encoding="utf-8") as generated:
+        generated.write(source)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
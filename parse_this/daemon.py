@@ -0,0 +1,198 @@
+"""Serve the command line interface of a class decorated with 'parse_class'
+over a Unix domain socket.
+
+The decorated class, its parsers and optionally an instance stay in memory so
+each invocation only costs a round trip instead of starting Python, importing
+modules and creating parsers. Use 'parse_this.client' to send the command line,
+working directory and environment of the calling process and receive its
+output and exit code.
+
+Every message is a line of JSON. The client sends a single request
+{"argv": [...], "cwd": "...", "env": {...}} and the server replies with any
+number of {"stream": "stdout" | "stderr", "data": "..."} followed by
+{"exit": <code>}.
+"""
+
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, List, Optional
+
+from parse_this.exception import ParseThisException
+
+_LOG = logging.getLogger(__name__)
+
+
+class _StreamWriter(io.TextIOBase):
+    """File-like object sending everything written to it to the client."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], name: str):
+        """
+        Args:
+            send: callable sending a message to the client
+            name: name of the stream, 'stdout' or 'stderr'
+        """
+        super().__init__()
+        self._send = send
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            self._send({"stream": self._name, "data": data})
+        return len(data)
+
+
+def _get_exit_code(error: SystemExit) -> int:
+    """Return the exit code of error the way the interpreter would, printing
+    its message on stderr if it is not an int."""
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    print(error.code, file=sys.stderr)
+    return 1
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_CommandServer"
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        code = self.server.run(
+            request["argv"], request.get("cwd"), request.get("env"), self._send
+        )
+        self._send({"exit": code})
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+
+
+class _CommandServer(socketserver.UnixStreamServer):
+    """Run the requests it receives, one at a time, with the 'call' method of
+    a class parser."""
+
+    _parser: Any
+    _instance: Any
+
+    def __init__(self, socket_path: str, parser: Any, instance: Any = None):
+        """
+        Args:
+            socket_path: path of the Unix domain socket to listen on
+            parser: the parser of a class decorated with 'parse_class'
+            instance: instance used for every request, if None an instance is
+            created from the command line of each request
+        """
+        self._parser = parser
+        self._instance = instance
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self) -> None:
+        # Only the user running the server can connect to it, the socket is
+        # created with these permissions so that there is no window where
+        # another user could connect
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+    def run(
+        self,
+        argv: List[str],
+        cwd: Optional[str],
+        env: Optional[Dict[str, str]],
+        send: Callable[[Dict[str, Any]], None],
+    ) -> int:
+        """Call the parser with argv, from cwd and with the environment env,
+        send its output to the client and return the exit code.
+
+        Args:
+            argv: the arguments to parse, without the program name
+            cwd: the working directory of the client
+            env: the environment variables of the client
+            send: callable sending a message to the client
+        """
+        _LOG.debug("Running %s", argv)
+        previous_cwd, previous_env = os.getcwd(), dict(os.environ)
+        root = logging.getLogger()
+        previous_handlers, previous_level = root.handlers[:], root.level
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            if env is not None:
+                os.environ.clear()
+                os.environ.update(env)
+            # Logging starts unconfigured as in a new process, so that
+            # '--log-level' configures it to write to the client
+            root.handlers[:] = []
+            root.setLevel(logging.WARNING)
+            with (
+                redirect_stdout(_StreamWriter(send, "stdout")),
+                redirect_stderr(_StreamWriter(send, "stderr")),
+            ):
+                try:
+                    result = self._parser.call(argv, self._instance)
+                except SystemExit as error:
+                    return _get_exit_code(error)
+                except Exception:
+                    traceback.print_exc()
+                    return 1
+                if result is not None:
+                    print(result)
+                return 0
+        finally:
+            root.handlers[:] = previous_handlers
+            root.setLevel(previous_level)
+            os.environ.clear()
+            os.environ.update(previous_env)
+            os.chdir(previous_cwd)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove the socket file left behind by a server that is not running.
+
+    Raises:
+        ParseThisException if a server is listening on socket_path
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+    raise ParseThisException(f"A server is already listening on '{socket_path}'")
+
+
+def serve(parser: Any, socket_path: str, instance: Any = None) -> None:
+    """Serve the command line interface of parser on socket_path until
+    interrupted.
+
+    Requests are run one at a time in this process, the output of the call and
+    its result, if not None, are sent back to the client.
+
+    Args:
+        parser: the parser of a class decorated with 'parse_class'
+        socket_path: path of the Unix domain socket to listen on
+        instance: instance used for every request, if None an instance is
+        created from the command line of each request
+    """
+    with _CommandServer(socket_path, parser, instance) as server:
+        _LOG.info("Serving on %s", socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
@@ -0,0 +1,201 @@
+import argparse
+import logging
+import re
+from argparse import Action, ArgumentError, ArgumentParser, ArgumentTypeError, Namespace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+_LOG = logging.getLogger(__name__)
+
+# Same as argparse's, such tokens are values even though they start with '-'
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+
+class _FastArgument(NamedTuple):
+    """An argument of a parser, compiled for the fast path."""
+
+    action: Action
+    dest: str
+    # Converts a token to the value of the argument, None for a flag
+    convert: Optional[Callable[[str], Any]]
+    choices: Any
+    # Value of a flag
+    const: Any
+
+
+class _FastSpec(NamedTuple):
+    """The arguments of a parser, compiled for the fast path."""
+
+    # Option string to its argument, None for the help actions
+    options: Dict[str, Optional[_FastArgument]]
+    positionals: List[_FastArgument]
+    sub_parsers: Optional[argparse._SubParsersAction]
+    # Actions setting a value in the namespace
+    defaults: List[Action]
+    required: List[Action]
+
+
+def _compile_argument(parser: ArgumentParser, action: Action) -> _FastArgument:
+    """Return the fast path argument of action.
+
+    Args:
+        parser: the parser action belongs to
+        action: the action storing the value of the argument
+    """
+    if action.nargs == 0:
+        return _FastArgument(action, action.dest, None, None, action.const)
+    # Same lookup as argparse, e.g. type=None means str
+    convert = parser._registry_get("type", action.type, action.type)
+    return _FastArgument(action, action.dest, convert, action.choices, None)
+
+
+def _compile_fast_spec(parser: ArgumentParser) -> Optional[_FastSpec]:
+    """Return the fast path spec of parser, None if one of its arguments is
+    not supported by the fast path.
+
+    Args:
+        parser: the parser to compile
+    """
+    if parser.fromfile_prefix_chars or parser._mutually_exclusive_groups:
+        return None
+    spec = _FastSpec({}, [], None, [], [])
+    for action in parser._actions:
+        if isinstance(action, argparse._HelpAction):
+            spec.options.update(dict.fromkeys(action.option_strings))
+            continue
+        if isinstance(action, argparse._SubParsersAction):
+            # Only supported as the last positional, as added by parse_class
+            if action is not parser._actions[-1]:
+                return None
+            spec = spec._replace(sub_parsers=action)
+        elif isinstance(
+            action, (argparse._StoreTrueAction, argparse._StoreFalseAction)
+        ) or (type(action) is argparse._StoreAction and action.nargs is None):
+            argument = _compile_argument(parser, action)
+            if action.option_strings:
+                spec.options.update(dict.fromkeys(action.option_strings, argument))
+            else:
+                spec.positionals.append(argument)
+        else:
+            _LOG.debug("Fast path does not support argument '%s'", action.dest)
+            return None
+        if action.dest is not argparse.SUPPRESS:
+            spec.defaults.append(action)
+        if action.required and (action.option_strings or action is spec.sub_parsers):
+            spec.required.append(action)
+    return spec
+
+
+def _is_value(token: str) -> bool:
+    """Return True if argparse always considers token as a value, never as an
+    option string."""
+    return token[:1] != "-" or token == "-" or _NEGATIVE_NUMBER.match(token) is not None
+
+
+class FastArgumentParser(ArgumentParser):
+    """ArgumentParser with a fast path for the command lines made of
+    positional values, '--option value' and flags, the only arguments created
+    for scalar, bool and enum parameters.
+
+    The arguments are compiled, the first time they are parsed, into a lookup
+    table of the option strings, then each token is directly converted to the
+    type of its argument. Anything else, e.g. '--help', an error, an
+    abbreviated option or an argument taking several values, makes the whole
+    command line be parsed by argparse so the result is always the same.
+    """
+
+    _fast_spec: Optional[_FastSpec] = None
+    _fast_spec_size: int = -1
+
+    def parse_args(self, args=None, namespace=None):
+        if args is not None and namespace is None:
+            fast_namespace = self.fast_parse(args)
+            if fast_namespace is not None:
+                return fast_namespace
+        return super().parse_args(args, namespace)
+
+    def fast_parse(self, args: Sequence[str]) -> Optional[Namespace]:
+        """Return the namespace parsed from args by the fast path, None if args
+        must be parsed by argparse.
+
+        Args:
+            args: the list of arguments to parse
+        """
+        # Arguments added after the first parse invalidate the spec
+        if self._fast_spec_size != len(self._actions):
+            self._fast_spec = _compile_fast_spec(self)
+            self._fast_spec_size = len(self._actions)
+        spec = self._fast_spec
+        if spec is None:
+            return None
+        try:
+            values = self._fast_parse_values(spec, args)
+        except (ArgumentError, ArgumentTypeError, TypeError, ValueError):
+            # Invalid value, argparse reports the error
+            return None
+        return None if values is None else Namespace(**values)
+
+    def _fast_parse_values(
+        self, spec: _FastSpec, args: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the values parsed from args, None if args must be parsed by
+        argparse.
+
+        Raises:
+            ArgumentTypeError, TypeError or ValueError if a value is invalid
+        """
+        values: Dict[str, Any] = {}
+        seen = set()
+        options = spec.options
+        positionals = spec.positionals
+        position = 0
+        index = 0
+        nb_args = len(args)
+        while index < nb_args:
+            token = args[index]
+            index += 1
+            if token[:1] == "-" and not _is_value(token):
+                argument = options.get(token)
+                if argument is None:
+                    # Help, unknown or abbreviated option, '--' or '--opt=value'
+                    return None
+                seen.add(argument.action)
+                if argument.convert is None:
+                    values[argument.dest] = argument.const
+                    continue
+                if index == nb_args or not _is_value(args[index]):
+                    return None
+                token = args[index]
+                index += 1
+            elif position < len(positionals):
+                argument = positionals[position]
+                position += 1
+            elif spec.sub_parsers is not None:
+                sub_parser = spec.sub_parsers.choices.get(token)
+                if not isinstance(sub_parser, FastArgumentParser):
+                    return None
+                sub_namespace = sub_parser.fast_parse(args[index:])
+                if sub_namespace is None:
+                    return None
+                seen.add(spec.sub_parsers)
+                values[spec.sub_parsers.dest] = token
+                # Like argparse, the sub-command values override the others
+                values.update(vars(sub_namespace))
+                break
+            else:
+                return None
+            value = argument.convert(token)  # type: ignore[misc]
+            if argument.choices is not None and value not in argument.choices:
+                return None
+            values[argument.dest] = value
+        if position < len(positionals):
+            return None
+        if spec.required and any(action not in seen for action in spec.required):
+            return None
+        for action in spec.defaults:
+            if action.dest not in values:
+                default = action.default
+                # argparse converts the string defaults of missing arguments
+                if isinstance(default, str):
+                    default = self._get_value(action, default)
+                values[action.dest] = default
+        return values
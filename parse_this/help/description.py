@@ -1,9 +1,175 @@
 import logging
 import re
+from functools import lru_cache
 from typing import Callable, Dict, List, Optional, Tuple
 
 _LOG = logging.getLogger(__name__)
 
+# Number of (docstring, delimiter_chars) whose parsing result is kept
+_DOC_CACHE_SIZE = 1024
+
+# Sphinx field holding the help of a parameter, e.g. ':param int one: help'
+_SPHINX_PARAM = re.compile(
+    r":(?:param|parameter|arg|argument|key|keyword)\s+"
+    r"(?:[^:]*\s)?\**(?P<arg_name>\w+)\s*:\s*(?P<help_msg>.*)"
+)
+# Any other Sphinx field, e.g. ':type one:' or ':returns:'
+_SPHINX_FIELD = re.compile(r":\w[^:]*:")
+# NumPy section header underline
+_NUMPY_UNDERLINE = re.compile(r"-{3,}")
+# NumPy parameter line, e.g. 'one : int' or 'one, two'
+_NUMPY_PARAM = re.compile(r"(?P<arg_names>\**\w+(?:\s*,\s*\**\w+)*)\s*(?::.*)?")
+_NUMPY_PARAM_SECTIONS = frozenset(
+    ["parameters", "other parameters", "keyword arguments", "arguments"]
+)
+# Google sections that end the arguments help
+_GOOGLE_SECTIONS = frozenset(
+    [
+        "attributes",
+        "example",
+        "examples",
+        "note",
+        "notes",
+        "raises",
+        "references",
+        "return",
+        "returns",
+        "see also",
+        "todo",
+        "warning",
+        "warnings",
+        "yield",
+        "yields",
+    ]
+)
+
+
+@lru_cache(maxsize=32)
+def _get_arg_doc_regex(delimiter_chars: str) -> re.Pattern:
+    """Return the pattern matching '<arg_name><delimiter_chars><help>' lines,
+    compiled once per delimiter."""
+    return re.compile(r"(?P<arg_name>\w+)\s*%s\s*(?P<help_msg>.+)" % delimiter_chars)
+
+
+def _get_indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+@lru_cache(maxsize=_DOC_CACHE_SIZE)
+def _parse_docstring(
+    docstring: str, delimiter_chars: str
+) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """Scan docstring once and return its description and the help message of
+    the arguments it documents.
+
+    The description is made of the lines up to the first blank line. The
+    arguments can then be documented with:
+        - '<arg_name><delimiter_chars><help>' lines, up to the first blank line
+        after them, the Google style when delimiter_chars is ':'
+        - ':param <arg_name>: <help>' Sphinx fields
+        - a NumPy 'Parameters' section
+
+    Args:
+        docstring: the docstring to parse
+        delimiter_chars: characters used to separate the parameters from their
+        help message in the docstring
+
+    Returns:
+        A tuple (description, ((arg_name, help), ...)), immutable as it is
+        shared by all the callers
+    """
+    arg_doc_regex = _get_arg_doc_regex(delimiter_chars)
+    lines = docstring.expandtabs().splitlines()
+    description: List[str] = []
+    # Help message parts of each argument, joined once the scan is done
+    args_help: Dict[str, List[str]] = {}
+    # Arguments the current help lines are added to
+    current: List[str] = []
+    # Lines following a Sphinx field are always part of its help message
+    in_sphinx_field = False
+    fill_description = True
+    # A blank line after '<arg_name><delimiter_chars><help>' lines ends them
+    delimited_done = False
+    delimited_args = False
+    # Indentation of the NumPy section we are in, None outside of any section
+    numpy_indent: Optional[int] = None
+    numpy_params = False
+    for index, raw_line in enumerate(lines):
+        line = raw_line.strip()
+        if fill_description:
+            if line and not line.startswith(":"):
+                description.append(line)
+                continue
+            fill_description = False
+            if not line:
+                continue
+        if not line:
+            if numpy_indent is None:
+                current = []
+                in_sphinx_field = False
+            if delimited_args:
+                delimited_done = True
+            continue
+        if index + 1 < len(lines) and _NUMPY_UNDERLINE.fullmatch(
+            lines[index + 1].strip()
+        ):
+            # NumPy section header, its underline is skipped as a non-matching
+            # line of the section
+            numpy_indent = _get_indent(raw_line)
+            numpy_params = line.lower() in _NUMPY_PARAM_SECTIONS
+            current = []
+            continue
+        if numpy_indent is not None:
+            if _get_indent(raw_line) > numpy_indent:
+                for arg_name in current:
+                    args_help[arg_name].append(line)
+                continue
+            current = []
+            param_match = _NUMPY_PARAM.fullmatch(line) if numpy_params else None
+            if param_match is not None:
+                for arg_name in param_match.group("arg_names").split(","):
+                    arg_name = arg_name.strip().lstrip("*")
+                    args_help[arg_name] = []
+                    current.append(arg_name)
+            continue
+        if line.startswith(":"):
+            sphinx_match = _SPHINX_PARAM.match(line)
+            if sphinx_match is not None:
+                arg_name = sphinx_match.group("arg_name")
+                help_msg = sphinx_match.group("help_msg").strip()
+                args_help[arg_name] = [help_msg] if help_msg else []
+                current = [arg_name]
+                in_sphinx_field = True
+                continue
+            if _SPHINX_FIELD.match(line):
+                current = []
+                in_sphinx_field = False
+                continue
+        if in_sphinx_field:
+            for arg_name in current:
+                args_help[arg_name].append(line)
+            continue
+        if line.endswith(":") and line[:-1].lower() in _GOOGLE_SECTIONS:
+            current = []
+            delimited_done = delimited_args
+            continue
+        if delimited_done:
+            continue
+        arg_match = arg_doc_regex.match(line)
+        if arg_match is not None:
+            arg_name = arg_match.group("arg_name").strip()
+            args_help[arg_name] = [arg_match.group("help_msg").strip()]
+            current = [arg_name]
+            delimited_args = True
+        else:
+            # The line didn't match the pattern we've hit a multiline argument
+            # docstring so we add it to the previous argument help message
+            for arg_name in current:
+                args_help[arg_name].append(line)
+    return " ".join(description), tuple(
+        (arg_name, " ".join(parts)) for arg_name, parts in args_help.items() if parts
+    )
+
 
 def _get_default_help_message(
     func: Callable,
@@ -38,7 +204,8 @@ def prepare_doc(
 ) -> Tuple[str, Dict[str, str]]:
     """From the function docstring get the arg parse description and arguments
         help message. If there is no docstring simple description and help
-        message are created.
+        message are created. The docstring can use the Google, NumPy or Sphinx
+        style and is only parsed once for a given delimiter_chars.
 
     Args:
         func: the function that needs argument parsing
@@ -54,34 +221,5 @@ def prepare_doc(
     _LOG.debug("Preparing doc for '%s'", func.__name__)
     if not func.__doc__:
         return _get_default_help_message(func, args)
-    description = []
-    args_help = {}
-    fill_description = True
-    arg_name = None
-    arg_doc_regex = re.compile(
-        r"(?P<arg_name>\w+)\s*%s\s*(?P<help_msg>.+)" % delimiter_chars
-    )
-    for line in func.__doc__.splitlines():
-        line = line.strip()
-        if line and fill_description:
-            description.append(line)
-        elif line:
-            arg_match = arg_doc_regex.match(line)
-            try:
-                arg_name = arg_match.groupdict()["arg_name"].strip()
-                args_help[arg_name] = arg_match.groupdict()["help_msg"].strip()
-            except AttributeError:
-                # The line didn't match the pattern we've hit a
-                # multiline argument docstring so we add it to the
-                # previous argument help message
-                if arg_name is not None:
-                    args_help[arg_name] = " ".join([args_help[arg_name], line])
-        else:
-            # The first empty line we encountered means we are done with
-            # the description. The first empty line we encounter after
-            # filling the argument help means we are done with argument
-            # parsing.
-            if not fill_description and args_help:
-                break
-            fill_description = False
-    return _get_default_help_message(func, args, " ".join(description), args_help)
+    description, args_help = _parse_docstring(func.__doc__, delimiter_chars)
+    return _get_default_help_message(func, args, description, dict(args_help))
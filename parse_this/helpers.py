@@ -1,8 +1,13 @@
+import array
+import collections.abc
 import enum
 import inspect
 import logging
 from argparse import ArgumentParser, ArgumentTypeError, _HelpAction
-from typing import Any, Callable, Type, get_args, get_origin
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Type, get_args, get_origin
+
+from parse_this.instrument import InstrumentationAction
 
 _LOG = logging.getLogger(__name__)
 
@@ -25,10 +30,67 @@ def _is_enum_type(arg_type: Any) -> bool:
     )
 
 
+# Number of enum member names listed in metavars and error messages
+_MAX_LISTED_CHOICES = 10
+
+
+class _EnumChoices(list):
+    """Members of an enum class, used as the choices of an argument.
+
+    It is a list so argparse and users can iterate and compare it as they did
+    with list(enum_class), membership tests are done on a set so checking the
+    parsed value does not depend on the number of members.
+    """
+
+    _members: frozenset
+
+    def __init__(self, enum_class: Type[enum.Enum]):
+        super().__init__(enum_class)
+        self._members = frozenset(self)
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            return value in self._members
+        except TypeError:
+            return False
+
+
+def _list_enum_names(enum_class: Type[enum.Enum], separator: str) -> str:
+    """Return the names of the members of enum_class joined by separator, only
+    the first ones are listed for large enums.
+
+    Args:
+        enum_class: the Enum class whose members are listed
+        separator: string inserted between two names
+    """
+    names = list(enum_class.__members__)
+    if len(names) <= _MAX_LISTED_CHOICES:
+        return separator.join(names)
+    return separator.join(
+        names[:_MAX_LISTED_CHOICES] + ["... (%d choices)" % len(names)]
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_enum_choices(enum_class: Type[enum.Enum]) -> _EnumChoices:
+    """Return the choices of an argument annotated with enum_class, shared by
+    all the arguments of that type."""
+    return _EnumChoices(enum_class)
+
+
+@lru_cache(maxsize=None)
+def _get_enum_metavar(enum_class: Type[enum.Enum]) -> str:
+    """Return the metavar '{NAME,...}' of an argument annotated with
+    enum_class, truncated for large enums."""
+    return "{%s}" % _list_enum_names(enum_class, ",")
+
+
+@lru_cache(maxsize=None)
 def _make_enum_converter(
     enum_class: Type[enum.Enum],
 ) -> Callable[[str], enum.Enum]:
-    """Return a callable that converts a string name to an enum member.
+    """Return a callable that converts a string name to an enum member. The
+        converter is created once per enum class.
 
     Args:
         enum_class: the Enum class whose members are valid choices
@@ -47,14 +109,18 @@ def _make_enum_converter(
         intended diagnostic:
             error: argument color: invalid choice: 'PURPLE'
             (choose from RED, GREEN, BLUE)
+        Only the first names are listed for large enums.
     """
+    members = enum_class.__members__
 
     def _convert(s: str) -> enum.Enum:
         try:
-            return enum_class[s]
+            return members[s]
         except KeyError:
-            valid = ", ".join(e.name for e in enum_class)
-            raise ArgumentTypeError("invalid choice: %r (choose from %s)" % (s, valid))
+            raise ArgumentTypeError(
+                "invalid choice: %r (choose from %s)"
+                % (s, _list_enum_names(enum_class, ", "))
+            )
 
     return _convert
 
@@ -71,11 +137,35 @@ def _is_sequence_type(arg_type: Any) -> bool:
     return arg_type in (list, tuple)
 
 
+def _is_iterable_type(arg_type: Any) -> bool:
+    """Return True if arg_type is Iterable or Iterator, from typing or
+    collections.abc, or a generic alias like Iterable[int].
+
+    Args:
+        arg_type: the type annotation to inspect
+    """
+    origin = get_origin(arg_type) or arg_type
+    return origin in (collections.abc.Iterable, collections.abc.Iterator)
+
+
+def _is_array_type(arg_type: Any) -> bool:
+    """Return True if arg_type is array.array, possibly with its typecode given
+    as Annotated[array.array, "i"].
+
+    Args:
+        arg_type: the type annotation to inspect
+    """
+    if get_origin(arg_type) is Annotated:
+        arg_type = get_args(arg_type)[0]
+    return arg_type is array.array
+
+
 def _get_element_type(arg_type: Any) -> Callable:
-    """Extract the element type from a generic list/tuple annotation.
+    """Extract the element type from a generic list/tuple/Iterable annotation.
 
     Args:
-        arg_type: a list or tuple type annotation (e.g. list[int], tuple[str, ...])
+        arg_type: a list, tuple or Iterable type annotation (e.g. list[int],
+        tuple[str, ...], Iterator[int])
 
     Returns:
         the element type, or str if no element type is specified
@@ -92,6 +182,15 @@ def _add_log_level_argument(parser: ArgumentParser):
     )
 
 
+def _add_batch_argument(parser: ArgumentParser):
+    parser.add_argument(
+        "--batch",
+        required=False,
+        metavar="FILE",
+        help="run the commands read from FILE, '-' for stdin, one per line",
+    )
+
+
 def _get_args_name_from_parser(parser: ArgumentParser):
     """Retrieve the name of the function argument linked to the given parser.
 
@@ -99,9 +198,10 @@ def _get_args_name_from_parser(parser: ArgumentParser):
         parser: a function parser
     """
     # Retrieve the 'action' destination of the method parser i.e. its
-    # argument name. The HelpAction is ignored.
+    # argument name. The HelpAction and the instrumentation options are ignored.
     return [
         action.dest
         for action in parser._actions
-        if not isinstance(action, _HelpAction) and action.dest != "log_level"
+        if not isinstance(action, (_HelpAction, InstrumentationAction))
+        and action.dest != "log_level"
     ]
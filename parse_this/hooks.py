@@ -0,0 +1,387 @@
+"""Callbacks notified of the calls made with <parser>.call and parse_this, e.g.
+to export metrics from the commands of a CLI without wrapping each of them.
+
+The events, in the order they fire, are:
+
+    - on_parse_start: before the command line is parsed
+    - on_parse_end: once the command line is parsed
+    - on_call_start: before the callable is called
+    - on_call_end: once the callable returned
+    - on_error: parsing or the call raised, nothing fires after it
+
+Each callback receives a HookEvent. Without any callback registered the calls
+are not affected.
+
+Set the PARSE_THIS_RECORD environment variable to the path of a file to record
+every command run to it, see InvocationRecorder and parse_this.replay.
+"""
+
+import logging
+import os
+import re
+import time
+from argparse import Namespace
+from contextlib import contextmanager
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from parse_this.exception import ParseThisException
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_LOG = logging.getLogger(__name__)
+
+ON_PARSE_START = "on_parse_start"
+ON_PARSE_END = "on_parse_end"
+ON_CALL_START = "on_call_start"
+ON_CALL_END = "on_call_end"
+ON_ERROR = "on_error"
+
+_EVENTS = (ON_PARSE_START, ON_PARSE_END, ON_CALL_START, ON_CALL_END, ON_ERROR)
+
+
+class HookEvent(NamedTuple):
+    """What a callback is notified of.
+
+    Attributes:
+        command: qualified name of the function, or '<Class>.<sub-command>'
+        for a class, only '<Class>' until the command line is parsed
+        arguments: the values parsed from the command line, empty until it is
+        parsed
+        seconds: duration of the parsing for on_parse_end, of the call for
+        on_call_end, of the phase that failed for on_error, None otherwise
+        error: the exception raised, only set for on_error
+        argv: the command line the command was run with
+        started: value of time.perf_counter() when the command started
+    """
+
+    command: str
+    arguments: Dict[str, Any]
+    seconds: Optional[float] = None
+    error: Optional[BaseException] = None
+    argv: Tuple[str, ...] = ()
+    started: float = 0.0
+
+
+# The registry is replaced rather than updated, so that calls running in other
+# threads keep iterating over the callbacks they started with
+_HOOKS: Dict[str, Tuple[Callable[[HookEvent], Any], ...]] = {
+    event: () for event in _EVENTS
+}
+
+
+def add_hook(event: str, callback: Callable[[HookEvent], Any]) -> None:
+    """Register callback to be called with a HookEvent each time event fires.
+
+    Args:
+        event: one of 'on_parse_start', 'on_parse_end', 'on_call_start',
+        'on_call_end' and 'on_error'
+        callback: callable taking a HookEvent, what it raises is logged and
+        ignored
+
+    Raises:
+        ParseThisException if event is unknown
+    """
+    if event not in _HOOKS:
+        raise ParseThisException(
+            "Unknown event '%s', use one of %s" % (event, ", ".join(_EVENTS))
+        )
+    _HOOKS[event] = _HOOKS[event] + (callback,)
+
+
+def remove_hook(event: str, callback: Callable[[HookEvent], Any]) -> None:
+    """Unregister callback from event, do nothing if it is not registered."""
+    _HOOKS[event] = tuple(hook for hook in _HOOKS.get(event, ()) if hook != callback)
+
+
+def _fire(event: str, hook_event: HookEvent) -> None:
+    """Call the callbacks of event with hook_event."""
+    for callback in _HOOKS[event]:
+        try:
+            callback(hook_event)
+        except Exception:
+            _LOG.exception("Hook %r of %s failed", callback, event)
+
+
+def _is_failure(error: BaseException) -> bool:
+    """Return False if error is the exit of a successful '--help'."""
+    return not isinstance(error, SystemExit) or error.code not in (0, None)
+
+
+@contextmanager
+def _phase(start: str, event: HookEvent) -> Iterator[List[float]]:
+    """Fire start, then on_error with the duration of the phase if it raises.
+    The phase is timed in the list yielded, holding its start time.
+
+    Args:
+        start: the event fired as the phase starts
+        event: what the callbacks of start are notified of
+    """
+    _fire(start, event)
+    started = [perf_counter()]
+    try:
+        yield started
+    except BaseException as error:
+        if _is_failure(error):
+            seconds = perf_counter() - started[0]
+            _fire(ON_ERROR, event._replace(seconds=seconds, error=error))
+        raise
+
+
+def _dispatch(
+    name: str,
+    argv: Sequence[str],
+    parse: Callable[[], Namespace],
+    call: Callable[[Namespace], Any],
+    sub_command: bool = False,
+) -> Any:
+    """Return call(parse()), firing the hooks registered around both phases.
+
+    Args:
+        name: qualified name of the decorated function or class
+        argv: the command line parse parses
+        parse: callable returning the namespace parsed from the command line
+        call: callable returning the result of the call for a namespace
+        sub_command: whether name is the name of a class, the name of the
+        sub-command is then added to it once the command line is parsed
+    """
+    if not any(_HOOKS.values()):
+        return call(parse())
+    event = HookEvent(name, {}, argv=tuple(argv), started=perf_counter())
+    with _phase(ON_PARSE_START, event) as started:
+        namespace = parse()
+    # No sub-command is selected in the batch mode of a class
+    method = getattr(namespace, "method", None) if sub_command else None
+    event = event._replace(
+        command=name if method is None else "%s.%s" % (name, method),
+        arguments=vars(namespace).copy(),
+    )
+    _fire(ON_PARSE_END, event._replace(seconds=perf_counter() - started[0]))
+    with _phase(ON_CALL_START, event) as started:
+        result = call(namespace)
+    _fire(ON_CALL_END, event._replace(seconds=perf_counter() - started[0]))
+    return result
+
+
+# Metrics written in the Prometheus text format, with their type and help
+_PROMETHEUS_METRICS = (
+    ("parse_this_commands_total", "counter", "Number of commands run."),
+    ("parse_this_command_errors_total", "counter", "Number of commands that failed."),
+    ("parse_this_command_seconds_total", "counter", "Time spent running commands."),
+)
+_PROMETHEUS_SAMPLE = re.compile(r'^(\w+)\{command="((?:[^"\\]|\\.)*)"\} (\S+)$')
+
+
+def _escape_label(value: str) -> str:
+    """Return value escaped as a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _unescape_label(value: str) -> str:
+    """Return the Prometheus label value as a string."""
+    return re.sub(
+        r"\\(.)", lambda match: "\n" if match.group(1) == "n" else match.group(1), value
+    )
+
+
+class MetricsExporter(object):
+    """Write the outcome and the duration of each command run to a file, once
+    installed.
+
+    With the 'jsonl' format a JSON object is appended to the file for each
+    command. With the 'prometheus' format the file holds the number of
+    commands run, failed and the time spent running them for each command,
+    the file is updated after each command so that the counters accumulate
+    over the processes, e.g. for the textfile collector of node_exporter.
+    """
+
+    _path: str
+    _format: str
+
+    def __init__(self, path: str, format: str = "jsonl"):
+        """
+        Args:
+            path: the file the metrics are written to
+            format: 'jsonl' or 'prometheus'
+        """
+        if format not in ("jsonl", "prometheus"):
+            raise ParseThisException(
+                "Unknown metrics format '%s', use 'jsonl' or 'prometheus'" % format
+            )
+        self._path = path
+        self._format = format
+
+    def install(self) -> "MetricsExporter":
+        """Start writing the metrics of the commands, return self."""
+        add_hook(ON_CALL_END, self._on_call_end)
+        add_hook(ON_ERROR, self._on_error)
+        return self
+
+    def uninstall(self) -> None:
+        """Stop writing the metrics of the commands."""
+        remove_hook(ON_CALL_END, self._on_call_end)
+        remove_hook(ON_ERROR, self._on_error)
+
+    def _on_call_end(self, event: HookEvent) -> None:
+        self._write(event.command, event.seconds or 0.0, None)
+
+    def _on_error(self, event: HookEvent) -> None:
+        self._write(event.command, event.seconds or 0.0, event.error)
+
+    def _write(
+        self, command: str, seconds: float, error: Optional[BaseException]
+    ) -> None:
+        if self._format == "jsonl":
+            import json
+
+            record = {
+                "time": time.time(),
+                "command": command,
+                "seconds": seconds,
+                "status": "ok" if error is None else "error",
+                "error": None if error is None else repr(error),
+            }
+            # A single write in append mode so that lines of concurrent
+            # processes do not interleave
+            with open(self._path, "a", encoding="utf-8") as metrics:
+                metrics.write(json.dumps(record) + "\n")
+            return
+        with self._lock():
+            samples = self._read_samples()
+            for name, value in (
+                ("parse_this_commands_total", 1),
+                ("parse_this_command_errors_total", 0 if error is None else 1),
+                ("parse_this_command_seconds_total", seconds),
+            ):
+                samples[(name, command)] = samples.get((name, command), 0) + value
+            self._write_samples(samples)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Lock the metrics file against the other processes updating it."""
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        with open(self._path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_samples(self) -> Dict[Tuple[str, str], float]:
+        """Return the samples of the metrics file, keyed by metric and
+        command."""
+        samples: Dict[Tuple[str, str], float] = {}
+        try:
+            with open(self._path, encoding="utf-8") as metrics:
+                for line in metrics:
+                    match = _PROMETHEUS_SAMPLE.match(line.strip())
+                    if match:
+                        name, command, value = match.groups()
+                        samples[(name, _unescape_label(command))] = float(value)
+        except FileNotFoundError:
+            pass
+        return samples
+
+    def _write_samples(self, samples: Dict[Tuple[str, str], float]) -> None:
+        """Replace the metrics file by one holding samples."""
+        lines = []
+        for name, metric_type, description in _PROMETHEUS_METRICS:
+            lines.append("# HELP %s %s" % (name, description))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+            for (sample_name, command), value in sorted(samples.items()):
+                if sample_name == name:
+                    lines.append(
+                        '%s{command="%s"} %s'
+                        % (name, _escape_label(command), repr(float(value)))
+                    )
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self._path))
+        # Written next to the file and renamed so that readers never see a
+        # partial file
+        handle, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as metrics:
+            metrics.write("\n".join(lines) + "\n")
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self._path)
+
+
+# Set to the path of a file to record the commands run to it
+_RECORD_ENV = "PARSE_THIS_RECORD"
+
+
+class InvocationRecorder(object):
+    """Append a JSON object to a file for each command run, once installed.
+
+    Each object holds the time the command ended, its command line, the name
+    of the command, the duration of the parsing and the call in seconds, its
+    status, 'ok' or 'error', and the error raised, so that the commands can be
+    run again with 'python -m parse_this.replay'.
+    """
+
+    _path: str
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: the file the commands are appended to
+        """
+        self._path = path
+
+    def install(self) -> "InvocationRecorder":
+        """Start recording the commands, return self."""
+        add_hook(ON_CALL_END, self._write)
+        add_hook(ON_ERROR, self._write)
+        return self
+
+    def uninstall(self) -> None:
+        """Stop recording the commands."""
+        remove_hook(ON_CALL_END, self._write)
+        remove_hook(ON_ERROR, self._write)
+
+    def _write(self, event: HookEvent) -> None:
+        import json
+
+        record = {
+            "time": time.time(),
+            "argv": list(event.argv),
+            "command": event.command,
+            "seconds": perf_counter() - event.started,
+            "status": "ok" if event.error is None else "error",
+            "error": None if event.error is None else repr(event.error),
+        }
+        # A single write in append mode so that lines of concurrent processes
+        # do not interleave
+        with open(self._path, "a", encoding="utf-8") as invocations:
+            invocations.write(json.dumps(record) + "\n")
+
+
+def _install_env_recorder() -> Optional[InvocationRecorder]:
+    """Install an InvocationRecorder writing to the file set by the
+    PARSE_THIS_RECORD environment variable, return None if it is not set."""
+    path = os.environ.get(_RECORD_ENV)
+    if not path:
+        return None
+    _LOG.debug("Recording the commands to '%s'", path)
+    return InvocationRecorder(path).install()
+
+
+# Installed on import so that the commands of a command line interface can be
+# recorded without changing its code
+_ENV_RECORDER = _install_env_recorder()
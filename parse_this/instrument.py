@@ -0,0 +1,481 @@
+"""Options instrumenting the whole call of a decorated callable from the
+command line: parsing, conversion, instance creation and the call itself.
+
+An instrumentation option is an argument using InstrumentationAction. As it has
+to be active before the command line is parsed, the arguments are scanned for
+its option string first and, if present, its value is parsed on its own.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import logging
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    TYPE_CHECKING,
+    NamedTuple,
+    Optional,
+)
+
+from parse_this.exception import ParseThisException
+from parse_this import phases
+from parse_this.phases import PHASE_LABELS, _observing
+
+if TYPE_CHECKING:
+    import tracemalloc
+
+_LOG = logging.getLogger(__name__)
+
+# Number of functions printed by '--profile' without a file
+_PROFILE_TOP = 25
+# ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+_MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+# Number of allocation sites reported by '--trace-memory' without a value
+_TRACE_MEMORY_TOP = 10
+
+
+class InstrumentationAction(argparse.Action):
+    """Action of the instrumentation options, they are not arguments of the
+    decorated callable. The option stores its value, or const if it takes no
+    value.
+
+    Attributes:
+        instrument: callable taking the value of the option and returning the
+        context manager the call runs in
+        always: enter the context of the instrument, with the default value of
+        the option, even if the option is not given
+    """
+
+    instrument: Callable[[Any], ContextManager]
+    always: bool
+
+    def __init__(
+        self,
+        option_strings: List[str],
+        dest: str,
+        instrument: Callable[[Any], ContextManager],
+        always: bool = False,
+        **kwargs,
+    ):
+        super().__init__(option_strings, dest, **kwargs)
+        self.instrument = instrument
+        self.always = always
+        # Parses the value of this option only, see get_value
+        self._value_parser: Optional[argparse.ArgumentParser] = None
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, self.const if self.nargs == 0 else values)
+
+    def get_value(self, args: List[str]) -> Any:
+        """Return the value of the option in args, parsed like the parser it
+        belongs to would.
+
+        Raises:
+            argparse.ArgumentError if the value is invalid
+        """
+        if self._value_parser is None:
+            self._value_parser = argparse.ArgumentParser(
+                add_help=False, exit_on_error=False
+            )
+            if self.nargs == 0:
+                self._value_parser.add_argument(
+                    *self.option_strings,
+                    dest="value",
+                    action="store_const",
+                    const=self.const,
+                )
+            else:
+                self._value_parser.add_argument(
+                    *self.option_strings,
+                    dest="value",
+                    nargs=self.nargs,
+                    const=self.const,
+                    type=self.type,
+                )
+        namespace, _ = self._value_parser.parse_known_args(args)
+        return namespace.value
+
+
+def _add_instrumentation_argument(
+    parser: argparse.ArgumentParser,
+    option: str,
+    instrument: Callable[[Any], ContextManager],
+    **kwargs,
+) -> None:
+    """Add the instrumentation option to parser and register it so that
+    _run_instrumented knows about it.
+
+    Args:
+        parser: the parser of the callable to instrument
+        option: option string of the argument, e.g. '--profile'
+        instrument: callable taking the value of the option and returning the
+        context manager the call runs in
+        kwargs: the other keyword arguments of add_argument, including always,
+        see InstrumentationAction
+    """
+    action = parser.add_argument(
+        option, action=InstrumentationAction, instrument=instrument, **kwargs
+    )
+    instruments = getattr(parser, "instruments", None)
+    if instruments is None:
+        instruments = parser.instruments = []  # type: ignore[attr-defined]
+    instruments.append(action)
+
+
+def _is_requested(
+    parser: argparse.ArgumentParser, args: List[str], action: argparse.Action
+) -> bool:
+    """Return True if the option of action is given in args, before any '--'.
+    Like argparse, an unambiguous prefix of the option is accepted if the
+    parser allows abbreviations.
+
+    Args:
+        parser: the parser action belongs to
+        args: the arguments to parse
+        action: the action of the option
+    """
+    for arg in args:
+        if arg == "--":
+            return False
+        option = arg.split("=", 1)[0]
+        if option in action.option_strings:
+            return True
+        if parser.allow_abbrev and option.startswith("--") and len(option) > 2:
+            matches = [
+                option_action
+                for option_string, option_action in parser._option_string_actions.items()
+                if option_string.startswith(option)
+            ]
+            if matches and all(match is action for match in matches):
+                return True
+    return False
+
+
+def _enter_instruments(stack: ExitStack, parser: Any, args: List[str]) -> None:
+    """Enter the context of the instrumentation options of parser given in
+    args.
+
+    Args:
+        stack: the stack the contexts are entered on
+        parser: the parser args are parsed with
+        args: the arguments to parse
+    """
+    for action in parser.instruments:
+        if _is_requested(parser, args, action):
+            try:
+                value = action.get_value(args)
+            except argparse.ArgumentError:
+                # Reported when args are parsed by run
+                continue
+        elif action.always:
+            value = action.default
+        else:
+            continue
+        _LOG.debug("Instrumenting the call with %s", action.option_strings[0])
+        stack.enter_context(action.instrument(value))
+
+
+def _run_instrumented(parser: Any, args: List[str], run: Callable[[], Any]) -> Any:
+    """Return the result of run, called within the context of the
+    instrumentation options of parser given in args.
+
+    Args:
+        parser: the parser args are parsed with
+        args: the arguments to parse
+        run: callable parsing args and calling the decorated callable
+    """
+    if not getattr(parser, "instruments", None):
+        return run()
+    with ExitStack() as stack:
+        _enter_instruments(stack, parser, args)
+        return run()
+
+
+async def _arun_instrumented(
+    parser: Any, args: List[str], run: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Same as _run_instrumented for the coroutine function run, the
+    instruments are active until its coroutine is done.
+
+    Args:
+        parser: the parser args are parsed with
+        args: the arguments to parse
+        run: coroutine function parsing args and calling the decorated callable
+    """
+    if not getattr(parser, "instruments", None):
+        return await run()
+    with ExitStack() as stack:
+        _enter_instruments(stack, parser, args)
+        return await run()
+
+
+@contextmanager
+def _profile(path: Optional[str]) -> Iterator[None]:
+    """Run the call under cProfile, write the stats to path or print the
+    functions with the highest cumulative time to stderr.
+
+    Args:
+        path: file the stats are written to, None or empty to print them
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        else:
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_PROFILE_TOP)
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    _add_instrumentation_argument(
+        parser,
+        "--profile",
+        _profile,
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="profile the call, write the stats to PATH or print the top %d "
+        "functions by cumulative time" % _PROFILE_TOP,
+    )
+
+
+def _get_usage(
+    before: Any, after: Any, children: Any, wall: float, cpu: float
+) -> Dict[str, Any]:
+    """Return the resource usage of the call.
+
+    Args:
+        before: resource.getrusage(RUSAGE_SELF) before the call
+        after: resource.getrusage(RUSAGE_SELF) after the call
+        children: resource.getrusage(RUSAGE_CHILDREN) after the call
+        wall: elapsed time of the call in seconds
+        cpu: CPU time of the process during the call in seconds
+    """
+    return {
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "user_seconds": after.ru_utime - before.ru_utime,
+        "system_seconds": after.ru_stime - before.ru_stime,
+        # Peak of the whole process, not of the call only
+        "max_rss_bytes": after.ru_maxrss * _MAX_RSS_UNIT,
+        "children_max_rss_bytes": children.ru_maxrss * _MAX_RSS_UNIT,
+        "minor_page_faults": after.ru_minflt - before.ru_minflt,
+        "major_page_faults": after.ru_majflt - before.ru_majflt,
+        "voluntary_context_switches": after.ru_nvcsw - before.ru_nvcsw,
+        "involuntary_context_switches": after.ru_nivcsw - before.ru_nivcsw,
+    }
+
+
+def _format_usage(usage: Dict[str, Any]) -> str:
+    """Return the report of the resource usage printed to stderr."""
+    return "\n".join(
+        [
+            "wall time         %.3f s" % usage["wall_seconds"],
+            "CPU time          %.3f s (user %.3f s, system %.3f s)"
+            % (usage["cpu_seconds"], usage["user_seconds"], usage["system_seconds"]),
+            "max RSS           %.1f MiB (children %.1f MiB)"
+            % (
+                usage["max_rss_bytes"] / 2**20,
+                usage["children_max_rss_bytes"] / 2**20,
+            ),
+            "page faults       %d minor, %d major"
+            % (usage["minor_page_faults"], usage["major_page_faults"]),
+            "context switches  %d voluntary, %d involuntary"
+            % (
+                usage["voluntary_context_switches"],
+                usage["involuntary_context_switches"],
+            ),
+        ]
+    )
+
+
+@contextmanager
+def _rusage(path: Optional[str]) -> Iterator[None]:
+    """Measure the resources used by the call, append them as a JSON object to
+    path or print them to stderr.
+
+    Args:
+        path: file the usage is appended to, None or empty to print it
+    """
+    # Checked by _add_rusage_argument, only imported when --rusage is given
+    import resource
+
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        usage = _get_usage(
+            before,
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+            time.perf_counter() - wall,
+            time.process_time() - cpu,
+        )
+        if path:
+            import json
+
+            with open(path, "a", encoding="utf-8") as report:
+                report.write(json.dumps(dict(usage, time=time.time())) + "\n")
+        else:
+            print(_format_usage(usage), file=sys.stderr)
+
+
+def _add_rusage_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the '--rusage' argument to parser.
+
+    Raises:
+        ParseThisException if the resource module is not available, e.g. on
+        Windows
+    """
+    if importlib.util.find_spec("resource") is None:  # pragma: no cover
+        raise ParseThisException(
+            "'rusage' needs the resource module which is not available"
+        )
+    _add_instrumentation_argument(
+        parser,
+        "--rusage",
+        _rusage,
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="report the CPU time, memory and page faults of the call, append "
+        "them as JSON to PATH or print them",
+    )
+
+
+class _PhaseMemory(NamedTuple):
+    """Memory allocated by a phase of the call, as traced by tracemalloc."""
+
+    phase: str
+    # Highest traced memory during the phase, above the memory traced when it
+    # started
+    peak: int
+    # Memory allocated by the phase and not released when it ended
+    retained: int
+    # The allocation sites whose memory grew the most during the phase, the
+    # memory allocated and released within the phase only shows in peak
+    top: List["tracemalloc.StatisticDiff"]
+
+
+def _get_tracing_files() -> FrozenSet[str]:
+    """Return the files whose allocations are made by tracemalloc and the
+    instrumentation itself, they are not reported."""
+    import tracemalloc
+
+    return frozenset(
+        [tracemalloc.__file__, contextlib.__file__, phases.__file__, __file__]
+    )
+
+
+@contextmanager
+def _trace_phase(top: int, reports: List[_PhaseMemory], phase: str) -> Iterator[None]:
+    """Trace the memory allocated by the phase and add it to reports.
+
+    Args:
+        top: number of allocation sites to report
+        reports: the memory allocated by the phases of the call
+        phase: name of the phase, see PHASE_LABELS
+    """
+    import tracemalloc
+
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        tracing_files = _get_tracing_files()
+        statistics = [
+            statistic
+            for statistic in tracemalloc.take_snapshot().compare_to(before, "lineno")
+            if statistic.size_diff > 0
+            and statistic.traceback[0].filename not in tracing_files
+        ]
+        reports.append(
+            _PhaseMemory(phase, peak - start, current - start, statistics[:top])
+        )
+
+
+def _format_memory(reports: List[_PhaseMemory]) -> str:
+    """Return the report of the memory allocated by each phase."""
+    lines = []
+    for report in reports:
+        lines.append(
+            "%s: peak %.1f KiB, retained %.1f KiB"
+            % (PHASE_LABELS[report.phase], report.peak / 1024, report.retained / 1024)
+        )
+        lines.extend("    %s" % statistic for statistic in report.top)
+    return "\n".join(lines)
+
+
+@contextmanager
+def _trace_memory(top: int) -> Iterator[None]:
+    """Trace the memory allocated by each phase of the call with tracemalloc
+    and print the peaks and the top allocation sites to stderr once the call
+    returns.
+
+    Args:
+        top: number of allocation sites reported for each phase
+    """
+    # Only imported when --trace-memory is given
+    import tracemalloc
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    reports: List[_PhaseMemory] = []
+    try:
+        with _observing(partial(_trace_phase, top, reports)):
+            yield
+    finally:
+        if started:
+            tracemalloc.stop()
+    print(_format_memory(reports), file=sys.stderr)
+
+
+def _positive_int(value: str) -> int:
+    """Return value as an int, raise an ArgumentTypeError if it is not
+    positive."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError("%r is not a positive integer" % value)
+    return number
+
+
+def _add_trace_memory_argument(parser: argparse.ArgumentParser) -> None:
+    _add_instrumentation_argument(
+        parser,
+        "--trace-memory",
+        _trace_memory,
+        nargs="?",
+        const=_TRACE_MEMORY_TOP,
+        type=_positive_int,
+        metavar="N",
+        help="trace the memory allocated by the conversion of the arguments and "
+        "by the call, print the peaks and the top N allocation sites, %d by "
+        "default" % _TRACE_MEMORY_TOP,
+    )
@@ -0,0 +1,146 @@
+import argparse
+import logging
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_LOG = logging.getLogger(__name__)
+
+
+class LazyArgumentParser(object):
+    """Stand-in for an ArgumentParser that is only built the first time it is
+    actually used.
+
+    Attributes set on the stand-in, e.g. 'call' and 'get_name', are kept on it
+    so they can be used without building the parser. Any other attribute is
+    looked up on the real parser, building it first if needed.
+    """
+
+    _build: Callable[[], ArgumentParser]
+    _parser: Optional[ArgumentParser]
+    _build_callbacks: List[Callable[[ArgumentParser], None]]
+
+    def __init__(self, build: Callable[[], ArgumentParser]):
+        """
+        Args:
+            build: callable returning the real parser, it is called at most once
+        """
+        self._build = build
+        self._parser = None
+        self._build_callbacks = []
+
+    @property
+    def is_built(self) -> bool:
+        """Return True if the real parser has been built."""
+        return self._parser is not None
+
+    def get_parser(self) -> ArgumentParser:
+        """Return the real parser, building it if it does not exist yet."""
+        if self._parser is None:
+            _LOG.debug("Building lazy parser")
+            self._parser = self._build()
+            for callback in self._build_callbacks:
+                callback(self._parser)
+        return self._parser
+
+    def on_build(self, callback: Callable[[ArgumentParser], None]) -> None:
+        """Call callback with the real parser once it is built.
+
+        Args:
+            callback: callable taking the real parser
+        """
+        self._build_callbacks.append(callback)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes that are not set on the stand-in itself
+        if name in ("_build", "_parser", "_build_callbacks"):
+            raise AttributeError(name)
+        return getattr(self.get_parser(), name)
+
+
+def _resolve_parser(parser: Any) -> ArgumentParser:
+    """Return the real parser of parser if it is a stand-in, parser otherwise.
+
+    argparse only accepts real parsers as 'parents', on Python 3.13+ it raises
+    a TypeError for any other object.
+    """
+    if isinstance(parser, LazyArgumentParser):
+        return parser.get_parser()
+    return parser
+
+
+class LazyChoices(dict):
+    """Mapping of sub-command names to their parser, where each parser is only
+    built the first time it is looked up.
+
+    Membership tests and iteration only use the names, so argparse can check
+    and display the available sub-commands without building any of them.
+    """
+
+    _factories: Dict[str, Callable[[], ArgumentParser]]
+
+    def __init__(self):
+        super().__init__()
+        self._factories = {}
+
+    def add_factory(self, name: str, factory: Callable[[], ArgumentParser]) -> None:
+        """Register name, its parser is built by calling factory when needed.
+
+        Args:
+            name: name of the sub-command
+            factory: callable returning the parser of the sub-command
+        """
+        self._factories[name] = factory
+        super().__setitem__(name, None)
+
+    def is_built(self, name: str) -> bool:
+        """Return True if the parser for the sub-command name has been built."""
+        return name not in self._factories
+
+    def __getitem__(self, name: str) -> ArgumentParser:
+        parser = super().__getitem__(name)
+        if parser is None:
+            _LOG.debug("Building parser for sub-command '%s'", name)
+            parser = self._factories.pop(name)()
+            super().__setitem__(name, parser)
+        return parser
+
+    def get(self, name: str, default: Any = None) -> Any:  # type: ignore[override]
+        return self[name] if name in self else default
+
+    def values(self) -> List[ArgumentParser]:  # type: ignore[override]
+        return [self[name] for name in self]
+
+    def items(self) -> List[Tuple[str, ArgumentParser]]:  # type: ignore[override]
+        return [(name, self[name]) for name in self]
+
+
+class LazySubParsersAction(argparse._SubParsersAction):
+    """Sub-parsers action whose sub-command parsers are built on demand, only
+    the sub-command selected on the command line is materialized."""
+
+    _lazy_choices: LazyChoices
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy_choices = LazyChoices()
+        self._name_parser_map = self.choices = self._lazy_choices
+
+    def add_lazy_parser(self, name: str, parent: Any, **kwargs) -> None:
+        """Register the sub-command name whose parser copies the arguments and
+        description of parent.
+
+        Args:
+            name: name of the sub-command
+            parent: parser, or stand-in, the sub-command parser is created from
+            kwargs: extra keyword arguments for the sub-command parser
+        """
+        kwargs.setdefault("prog", "%s %s" % (self._prog_prefix, name))
+
+        def build() -> ArgumentParser:
+            return self._parser_class(
+                parents=[_resolve_parser(parent)],
+                description=parent.description,
+                **kwargs,
+            )
+
+        self._lazy_choices.add_factory(name, build)
@@ -0,0 +1,268 @@
+"""Run many invocations of a decorated function or class on a pool of threads
+or processes.
+
+The arguments are parsed in the calling process and only the parsed values are
+sent to the workers, so they never parse a command line themselves.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from parse_this.call import CallError, _call_one, _get_call_plan, _run_coroutine
+from parse_this.exception import ParseThisException
+from parse_this.types import _release_mappings
+
+_LOG = logging.getLogger(__name__)
+
+_BACKENDS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+# Instances created by a worker, reused across jobs when reuse is enabled
+_WORKER_STATE = threading.local()
+
+
+class _Job(NamedTuple):
+    """Parsed values of an invocation, everything a worker needs to run it."""
+
+    # The class to instantiate before calling target, None for a function
+    init: Optional[Callable]
+    init_kwargs: Dict[str, Any]
+    target: Callable
+    kwargs: Dict[str, Any]
+    log_level: bool
+    level: Optional[str]
+    # Names of the kwargs mapping a file, released once target returns
+    mapped_args: Tuple[str, ...] = ()
+
+
+def _run_job(job: _Job, reuse_instance: bool) -> Any:
+    """Run job in a worker and return its result.
+
+    Args:
+        job: the parsed invocation
+        reuse_instance: reuse the instance the worker created for a previous
+        job of the same class if the __init__ arguments are equal
+    """
+    if job.log_level:
+        logging.basicConfig(level=job.level)
+    try:
+        if job.init is None:
+            return _run_coroutine(job.target(**job.kwargs))
+        instances = _WORKER_STATE.__dict__.setdefault("instances", {})
+        init_kwargs, instance = instances.get(job.init, (None, None))
+        if not reuse_instance or init_kwargs != job.init_kwargs:
+            instance = job.init(**job.init_kwargs)
+            if reuse_instance:
+                instances[job.init] = (job.init_kwargs, instance)
+        return _run_coroutine(job.target(instance, **job.kwargs))
+    finally:
+        _release_mappings([job.kwargs[name] for name in job.mapped_args])
+
+
+def _get_job_factory(target: Any) -> Tuple[Any, Callable[[Any], _Job]]:
+    """Return a 2-tuple (parser, make_job) where make_job creates the job of
+    target from a namespace parsed by parser.
+
+    Args:
+        target: a function decorated with 'create_parser' or a class decorated
+        with 'parse_class'
+
+    Raises:
+        ParseThisException if target is not decorated or is a class whose
+        __init__ is not decorated
+    """
+    parser = getattr(target, "parser", None)
+    if parser is None:
+        raise ParseThisException(
+            f"'{target}' is not decorated with 'create_parser' or 'parse_class'"
+        )
+    if not hasattr(parser, "parser_to_method"):
+        plan = _get_call_plan(parser, target)
+
+        def make_function_job(namespace):
+            values = vars(namespace)
+            kwargs = {name: values[name] for name in plan.arg_names}
+            # The decorated function, rather than the function of the plan,
+            # can be pickled as it is the one found in its module
+            return _Job(
+                None,
+                {},
+                target,
+                kwargs,
+                plan.log_level,
+                values.get("log_level"),
+                plan.mapped_args,
+            )
+
+        return parser, make_function_job
+    if "__init__" not in parser.parser_to_method:
+        raise ParseThisException(
+            f"'__init__' method of '{target.__name__}' must be decorated with "
+            f"'create_parser' to instantiate the class in the workers"
+        )
+    init_plan = parser.get_call_plan("__init__")
+
+    def make_method_job(namespace):
+        values = vars(namespace)
+        plan = parser.get_call_plan(namespace.method)
+        return _Job(
+            init_plan.target,
+            {name: values[name] for name in init_plan.arg_names},
+            plan.target,
+            {name: values[name] for name in plan.arg_names},
+            plan.log_level,
+            values.get("log_level"),
+            plan.mapped_args,
+        )
+
+    return parser, make_method_job
+
+
+def call_parallel(
+    target: Any,
+    args_list: Iterable[List[str]],
+    backend: str = "thread",
+    max_workers: int = None,
+    ordered: bool = True,
+    max_in_flight: int = None,
+    reuse_instance: bool = False,
+) -> Iterator[Any]:
+    """Lazily run target for each list of arguments on a pool of workers and
+    yield the results.
+
+    An item that can not be parsed, or whose call raises, yields a CallError
+    instead of aborting the whole batch.
+
+    Args:
+        target: a function decorated with 'create_parser' or a class decorated
+        with 'parse_class'
+        args_list: iterable of lists of arguments to parse
+        backend: 'thread' or 'process', the kind of pool the calls run on
+        max_workers: number of workers, defaults to the executor's default
+        ordered: yield the results in the order of args_list, otherwise as soon
+        as they are available
+        max_in_flight: maximum number of submitted calls whose result was not
+        yet yielded, args_list is not consumed further until one is. Defaults
+        to twice the number of workers
+        reuse_instance: for a class, each worker reuses the instance it created
+        for a previous call if the __init__ arguments are equal, like
+        'call_many' a new instance is created for every call by default
+
+    Raises:
+        ParseThisException if target is not decorated or backend is unknown
+    """
+    if backend not in _BACKENDS:
+        raise ParseThisException(
+            f"Unknown backend '{backend}', choose from {', '.join(_BACKENDS)}"
+        )
+    parser, make_job = _get_job_factory(target)
+    executor = _BACKENDS[backend](max_workers=max_workers)
+    if max_in_flight is None:
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    _LOG.debug("Running %s on %s workers", target, backend)
+    results = _ordered if ordered else _unordered
+    return results(
+        executor, parser, make_job, args_list, max(max_in_flight, 1), reuse_instance
+    )
+
+
+def _get_result(args: List[str], future: Union[Future, CallError]) -> Any:
+    """Return the result of future, or a CallError if the call raised."""
+    if isinstance(future, CallError):
+        return future
+    try:
+        return future.result()
+    except Exception as error:
+        return CallError(args, error, "")
+
+
+def _submit(
+    executor: Executor,
+    parser: Any,
+    make_job: Callable[[Any], _Job],
+    args: List[str],
+    reuse_instance: bool,
+) -> Union[Future, CallError]:
+    """Parse args and submit its job, return the future of its result or a
+    CallError if args can not be parsed."""
+    job = _call_one(parser.parse_args, args, make_job)
+    if isinstance(job, CallError):
+        return job
+    return executor.submit(_run_job, job, reuse_instance)
+
+
+def _ordered(
+    executor: Executor,
+    parser: Any,
+    make_job: Callable[[Any], _Job],
+    args_list: Iterable[List[str]],
+    max_in_flight: int,
+    reuse_instance: bool,
+) -> Iterator[Any]:
+    """Yield the results in the order of args_list."""
+    pending: Deque[Tuple[List[str], Union[Future, CallError]]] = deque()
+    try:
+        for args in args_list:
+            args = list(args)
+            pending.append(
+                (args, _submit(executor, parser, make_job, args, reuse_instance))
+            )
+            if len(pending) >= max_in_flight:
+                yield _get_result(*pending.popleft())
+        while pending:
+            yield _get_result(*pending.popleft())
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _unordered(
+    executor: Executor,
+    parser: Any,
+    make_job: Callable[[Any], _Job],
+    args_list: Iterable[List[str]],
+    max_in_flight: int,
+    reuse_instance: bool,
+) -> Iterator[Any]:
+    """Yield the results as soon as they are available."""
+    pending: Dict[Future, List[str]] = {}
+    try:
+        for args in args_list:
+            args = list(args)
+            future = _submit(executor, parser, make_job, args, reuse_instance)
+            if isinstance(future, CallError):
+                yield future
+                continue
+            pending[future] = args
+            if len(pending) >= max_in_flight:
+                done: Set[Future] = wait(pending, return_when=FIRST_COMPLETED)[0]
+                for future in done:
+                    yield _get_result(pending.pop(future), future)
+        while pending:
+            done = wait(pending, return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                yield _get_result(pending.pop(future), future)
+    finally:
+        executor.shutdown(cancel_futures=True)
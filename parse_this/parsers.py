@@ -1,21 +1,73 @@
 import logging
+import shlex
+import sys
 import typing
-from argparse import ArgumentParser
-from functools import wraps
-from inspect import getfullargspec
-from typing import Callable, Dict, Optional, Type
+from argparse import ArgumentParser, Namespace
+from contextlib import nullcontext
+from functools import partial, wraps
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+)
 
-from parse_this.args import _get_args_and_defaults, _get_args_to_parse
-from parse_this.call import _call, _call_method_from_namespace, _get_parser_call_method
+from parse_this.args import _get_args_to_parse
+from parse_this.cache import CacheInfo, ParserCache
+from parse_this.call import (
+    CallError,
+    _acall_many,
+    _call_from_plan,
+    _call_many,
+    _call_one,
+    _CallPlan,
+    _compile_call_plan,
+    _get_call_plan,
+    _get_parser_acall_many_method,
+    _get_parser_acall_method,
+    _get_parser_call_many_method,
+    _get_parser_call_method,
+    _maybe_await,
+)
 from parse_this.exception import ParseThisException
+from parse_this.fast import FastArgumentParser
 from parse_this.help.action import FullHelpAction
-from parse_this.helpers import _add_log_level_argument
-from parse_this.parsing import _get_arg_parser, _get_parseable_methods
-from parse_this.type_check import _check_types
+from parse_this.hooks import _dispatch
+from parse_this.helpers import _add_batch_argument, _add_log_level_argument
+from parse_this.instrument import (
+    _add_profile_argument,
+    _add_rusage_argument,
+    _add_trace_memory_argument,
+    _arun_instrumented,
+    _run_instrumented,
+)
+from parse_this.lazy import (
+    LazyArgumentParser,
+    LazySubParsersAction,
+    _resolve_parser,
+)
+from parse_this.parsing import _create_arg_parser, _get_parseable_methods
+from parse_this.phases import CALL, INIT, PARSE, _arun_phase, _run_phase
+from parse_this.sampling import _add_sample_profile_argument
+from parse_this.timings import _add_timings_argument, _time_conversions
 
 _LOG = logging.getLogger(__name__)
 
 
+def _serve(parser: Any, socket_path: str, instance: Any = None) -> None:
+    """Serve the command line interface of parser, see 'parse_this.daemon.serve'."""
+    # The daemon and the socket modules are only imported when serving
+    from parse_this.daemon import serve
+
+    serve(parser, socket_path, instance)
+
+
 class SubcommandAwareArgumentParser(ArgumentParser):
     """An ArgumentParser subclass that, when unrecognized arguments are present
     after a subcommand has been selected, reports the error using the
@@ -47,17 +99,43 @@ class SubcommandAwareArgumentParser(ArgumentParser):
         return namespace
 
 
+class FastSubcommandAwareArgumentParser(
+    FastArgumentParser, SubcommandAwareArgumentParser
+):
+    """A SubcommandAwareArgumentParser with the fast path of
+    FastArgumentParser, its sub-command parsers are created with the same
+    class."""
+
+
 class FunctionParser(object):
     """Parse command line arguments, transform them to the appropriate type and
     delegate the call to a given callable.
+
+    The parsers are memoized so that calling the same function repeatedly does
+    not introspect it again.
     """
 
+    _cache: ParserCache
+
+    def __init__(self, cache_size: int = 128):
+        """
+        Args:
+            cache_size: maximum number of parsers kept in memory, 0 disables
+            the cache
+        """
+        self._cache = ParserCache(cache_size)
+
     def __call__(
         self,
         func: Callable,
         args: typing.List[str] = None,
         delimiter_chars: str = ":",
         log_level: bool = False,
+        profile: bool = False,
+        timings: bool = False,
+        rusage: bool = False,
+        trace_memory: bool = False,
+        sample_profile: bool = False,
     ):
         """Create an ArgParser for the given function converting the command line
            arguments and passing them to the function, return the result of the
@@ -70,17 +148,172 @@ class FunctionParser(object):
             help message in the docstring. Defaults to ':'
             log_level: indicate whether or not a '--log-level' argument should be
             handled to set the log level during the execution
+            profile: add a '--profile' argument running the parsing and the
+            call under cProfile
+            timings: time each phase of the call, the timings are stored in
+            <func>.parser.last_timings and a '--timings' argument prints them
+            rusage: add a '--rusage' argument reporting the resources used by
+            the call
+            trace_memory: add a '--trace-memory' argument reporting the memory
+            allocated by the conversion of the arguments and by the call
+            sample_profile: add a '--sample-profile' argument sampling the
+            stack of the call and writing the collapsed stacks to a file
         """
-        _LOG.debug("Creating parser for %s", func.__name__)
-        func_args, _, _, defaults, _, _, annotations = getfullargspec(func)
-        func_args = _check_types(func.__name__, annotations, func_args, defaults)
-        args_and_defaults = _get_args_and_defaults(func_args, defaults)
-        parser = _get_arg_parser(
-            func, annotations, args_and_defaults, delimiter_chars, log_level
+        parser = self._get_parser(
+            func,
+            delimiter_chars,
+            log_level,
+            profile,
+            timings,
+            rusage,
+            trace_memory,
+            sample_profile,
         )
-        self._set_function_parser(func, parser)
+        args_to_parse = _get_args_to_parse(args)
+
+        def parse() -> Namespace:
+            return _run_phase(PARSE, parser.parse_args, args_to_parse)
+
+        def call(arguments: Namespace) -> Any:
+            plan = _get_call_plan(parser, func)
+            return _run_phase(CALL, _call_from_plan, plan, arguments)
+
+        return _run_instrumented(
+            parser,
+            args_to_parse,
+            lambda: _dispatch(func.__qualname__, args_to_parse, parse, call),
+        )
+
+    def call_many(
+        self,
+        func: Callable,
+        args_list: Iterable[typing.List[str]],
+        delimiter_chars: str = ":",
+        log_level: bool = False,
+    ) -> Iterator[Any]:
+        """Lazily call func for each list of arguments and yield the results.
+
+        The parser is created once for the whole batch. An item that can not
+        be parsed, or whose call raises, yields a CallError instead of
+        aborting the batch.
+
+        Args:
+            func: the function for which the command line arguments to be parsed
+            args_list: iterable of lists of arguments to be parsed
+            delimiter_chars: characters used to separate the parameters from their
+            help message in the docstring. Defaults to ':'
+            log_level: indicate whether or not a '--log-level' argument should be
+            handled to set the log level during the execution
+        """
+        parser = self._get_parser(func, delimiter_chars, log_level)
+        plan = _get_call_plan(parser, func)
+        return _call_many(
+            parser, args_list, lambda namespace: _call_from_plan(plan, namespace)
+        )
+
+    async def acall(
+        self,
+        func: Callable,
+        args: typing.List[str] = None,
+        delimiter_chars: str = ":",
+        log_level: bool = False,
+    ):
+        """Same as calling the FunctionParser but awaits the result of func if
+        it is a coroutine, to be used from a running event loop.
+
+        Args:
+            func: the function for which the command line arguments to be parsed
+            args: a list of arguments to be parsed if None sys.argv is used
+            delimiter_chars: characters used to separate the parameters from their
+            help message in the docstring. Defaults to ':'
+            log_level: indicate whether or not a '--log-level' argument should be
+            handled to set the log level during the execution
+        """
+        parser = self._get_parser(func, delimiter_chars, log_level)
         arguments = parser.parse_args(_get_args_to_parse(args))
-        return _call(func, func_args, arguments)
+        plan = _get_call_plan(parser, func)
+        return await _maybe_await(_call_from_plan(plan, arguments, run_coroutine=False))
+
+    def acall_many(
+        self,
+        func: Callable,
+        args_list: Iterable[typing.List[str]],
+        concurrency: int = 10,
+        delimiter_chars: str = ":",
+        log_level: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Asynchronously call func for each list of arguments on the running
+        event loop and yield the results in order.
+
+        At most concurrency coroutines are awaited at the same time. An item
+        that can not be parsed, or whose call raises, yields a CallError
+        instead of aborting the batch.
+
+        Args:
+            func: the function for which the command line arguments to be parsed
+            args_list: iterable of lists of arguments to be parsed
+            concurrency: maximum number of calls awaited at the same time
+            delimiter_chars: characters used to separate the parameters from their
+            help message in the docstring. Defaults to ':'
+            log_level: indicate whether or not a '--log-level' argument should be
+            handled to set the log level during the execution
+        """
+        parser = self._get_parser(func, delimiter_chars, log_level)
+        plan = _get_call_plan(parser, func)
+        return _acall_many(
+            parser,
+            args_list,
+            lambda namespace: _call_from_plan(plan, namespace, run_coroutine=False),
+            concurrency,
+        )
+
+    def _get_parser(
+        self,
+        func: Callable,
+        delimiter_chars: str,
+        log_level: bool,
+        profile: bool = False,
+        timings: bool = False,
+        rusage: bool = False,
+        trace_memory: bool = False,
+        sample_profile: bool = False,
+    ) -> ArgumentParser:
+        """Return the memoized parser of func, creating it if needed."""
+        options = (
+            delimiter_chars,
+            log_level,
+            profile,
+            timings,
+            rusage,
+            trace_memory,
+            sample_profile,
+        )
+        parser = self._cache.get(func, *options)
+        if parser is None:
+            _LOG.debug("Creating parser for %s", func.__name__)
+            start = perf_counter()
+            parser = _create_arg_parser(func, delimiter_chars, log_level)
+            if profile:
+                _add_profile_argument(parser)
+            if rusage:
+                _add_rusage_argument(parser)
+            if trace_memory:
+                _add_trace_memory_argument(parser)
+            if sample_profile:
+                _add_sample_profile_argument(parser)
+            if timings:
+                _add_timings_argument(parser, perf_counter() - start)
+            self._cache.put(func, *options, value=parser)
+        self._set_function_parser(func, parser)
+        return parser
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hits/misses statistics of the parser cache."""
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Drop all the memoized parsers."""
+        self._cache.clear()
 
     @typing.no_type_check  # dynamically attaches .parser to callables
     def _set_function_parser(self, func: Callable, parser: ArgumentParser):
@@ -98,9 +331,30 @@ class MethodParser(object):
     _name: Optional[str]
     _delimiter_chars: str
     _log_level: bool
+    _lazy: bool
+    _fast: bool
+    _typed_arrays: bool
+    _value_files: bool
+    _profile: bool
+    _timings: bool
+    _rusage: bool
+    _trace_memory: bool
+    _sample_profile: bool
 
     def __init__(
-        self, delimiter_chars: str = ":", name: str = None, log_level: bool = False
+        self,
+        delimiter_chars: str = ":",
+        name: str = None,
+        log_level: bool = False,
+        lazy: bool = False,
+        fast: bool = False,
+        typed_arrays: bool = False,
+        value_files: bool = False,
+        profile: bool = False,
+        timings: bool = False,
+        rusage: bool = False,
+        trace_memory: bool = False,
+        sample_profile: bool = False,
     ):
         """
         Args:
@@ -111,10 +365,42 @@ class MethodParser(object):
             be used
             log_level: indicate whether or not a '--log-level' argument should be
             handled to set the log level during the execution
+            lazy: defer the introspection of the decorated function and the
+            creation of its parser until the parser is first used
+            fast: parse the command lines made of positional values, options
+            and flags without going through argparse, see FastArgumentParser
+            typed_arrays: give the list/tuple of int or float arguments as an
+            array.array rather than a list
+            value_files: a single '@path' value of a list, tuple, Iterable or
+            array argument reads its values from a file, one per line, and a
+            single '-' from stdin
+            profile: add a '--profile' argument running the parsing and the
+            call under cProfile, only used by <parser>.call and
+            <parser>.acall
+            timings: time each phase of the calls made with <parser>.call or
+            <parser>.acall, the timings are stored in <parser>.last_timings
+            and a '--timings' argument prints them
+            rusage: add a '--rusage' argument reporting the resources used by
+            the call, only used by <parser>.call and <parser>.acall
+            trace_memory: add a '--trace-memory' argument reporting the memory
+            allocated by the conversion of the arguments and by the call, only
+            used by <parser>.call and <parser>.acall
+            sample_profile: add a '--sample-profile' argument sampling the
+            stack of the call and writing the collapsed stacks to a file, only
+            used by <parser>.call and <parser>.acall
         """
         self._delimiter_chars = delimiter_chars
         self._name = name
         self._log_level = log_level
+        self._lazy = lazy
+        self._fast = fast
+        self._typed_arrays = typed_arrays
+        self._value_files = value_files
+        self._profile = profile
+        self._timings = timings
+        self._rusage = rusage
+        self._trace_memory = trace_memory
+        self._sample_profile = sample_profile
 
     def __call__(self, func: Callable):
         """Add an argument parser attribute `parser` to the decorated function.
@@ -123,22 +409,12 @@ class MethodParser(object):
             func: the function for which we want to create an argument parser
         """
         if not hasattr(func, "parser"):
-            _LOG.debug(
-                "Creating parser for '%s'%s",
-                func.__name__,
-                "/%s" % self._name if self._name else "",
-            )
-            func_args, _, _, defaults, _, _, annotations = getfullargspec(func)
-            func_args = _check_types(func.__name__, annotations, func_args, defaults)
-            args_and_defaults = _get_args_and_defaults(func_args, defaults)
-            parser = _get_arg_parser(
-                func,
-                annotations,
-                args_and_defaults,
-                self._delimiter_chars,
-                self._log_level,
-            )
-            parser.get_name = lambda: self._name or func.__name__  # type: ignore[attr-defined]
+            parser: typing.Union[ArgumentParser, LazyArgumentParser]
+            if self._lazy:
+                parser = LazyArgumentParser(lambda: self._get_parser(func))
+            else:
+                parser = self._get_parser(func)
+            parser.get_name = lambda: self._name or func.__name__  # type: ignore[union-attr]
             self._set_method_parser(func, parser)
 
         @wraps(func)
@@ -147,10 +423,47 @@ class MethodParser(object):
 
         return decorated
 
+    def _get_parser(self, func: Callable) -> ArgumentParser:
+        """Introspect func and return its argument parser.
+
+        Args:
+            func: the function for which we want to create an argument parser
+        """
+        _LOG.debug(
+            "Creating parser for '%s'%s",
+            func.__name__,
+            "/%s" % self._name if self._name else "",
+        )
+        start = perf_counter()
+        parser = _create_arg_parser(
+            func,
+            self._delimiter_chars,
+            self._log_level,
+            self._fast,
+            self._typed_arrays,
+            self._value_files,
+        )
+        if self._profile:
+            _add_profile_argument(parser)
+        if self._rusage:
+            _add_rusage_argument(parser)
+        if self._trace_memory:
+            _add_trace_memory_argument(parser)
+        if self._sample_profile:
+            _add_sample_profile_argument(parser)
+        if self._timings:
+            _add_timings_argument(parser, perf_counter() - start)
+        return parser
+
     @typing.no_type_check  # dynamically attaches .parser to callables
-    def _set_method_parser(self, func: Callable, parser: ArgumentParser):
+    def _set_method_parser(
+        self, func: Callable, parser: typing.Union[ArgumentParser, LazyArgumentParser]
+    ):
         func.parser = parser
         func.parser.call = _get_parser_call_method(func)
+        func.parser.call_many = _get_parser_call_many_method(func)
+        func.parser.acall = _get_parser_acall_method(func)
+        func.parser.acall_many = _get_parser_acall_many_method(func)
 
 
 class ClassParser(object):
@@ -161,12 +474,28 @@ class ClassParser(object):
     _description: Optional[str]
     _cls: Type = None
     _log_level: bool
+    _lazy: bool
+    _batch: bool
+    _fast: bool
+    _profile: bool
+    _timings: bool
+    _rusage: bool
+    _trace_memory: bool
+    _sample_profile: bool
 
     def __init__(
         self,
         description: str = None,
         parse_private: bool = False,
         log_level: bool = False,
+        lazy: bool = False,
+        batch: bool = False,
+        fast: bool = False,
+        profile: bool = False,
+        timings: bool = False,
+        rusage: bool = False,
+        trace_memory: bool = False,
+        sample_profile: bool = False,
     ):
         """
 
@@ -177,10 +506,37 @@ class ClassParser(object):
             parsed, defaults to False
             log_level: indicate whether or not a '--log-level' argument should be
             handled to set the log level during the execution
+            lazy: only register the sub-commands names, the parser of a
+            sub-command is built when it is selected on the command line
+            batch: add a '--batch' argument to read commands, one per line,
+            from a file or stdin and run them all on the same instance
+            fast: parse the command lines made of positional values, options
+            and flags without going through argparse, see FastArgumentParser
+            profile: add a '--profile' argument running the parsing, the
+            instance creation and the call under cProfile
+            timings: time each phase of the calls made with <parser>.call or
+            <parser>.acall, the timings are stored in <parser>.last_timings
+            and a '--timings' argument prints them
+            rusage: add a '--rusage' argument reporting the resources used by
+            the instance creation and the call
+            trace_memory: add a '--trace-memory' argument reporting the memory
+            allocated by the conversion of the arguments, the instance creation
+            and the call
+            sample_profile: add a '--sample-profile' argument sampling the
+            stack of the call of the method and writing the collapsed stacks
+            to a file
         """
         self._description = description
         self._parse_private = parse_private
         self._log_level = log_level
+        self._lazy = lazy
+        self._batch = batch
+        self._fast = fast
+        self._profile = profile
+        self._timings = timings
+        self._rusage = rusage
+        self._trace_memory = trace_memory
+        self._sample_profile = sample_profile
 
     def __call__(self, cls: Type):
         """
@@ -188,9 +544,18 @@ class ClassParser(object):
             cls: class to be decorated
         """
         _LOG.debug("Creating parser for class '%s'", cls.__name__)
+        start = perf_counter()
         self._cls = cls
         init_parser, methods_to_parse = _get_parseable_methods(cls)
         self._set_class_parser(init_parser, methods_to_parse, cls)
+        if self._timings:
+            for parser in methods_to_parse.values():
+                # The sub-commands share the arguments of the method parsers
+                if not isinstance(parser, LazyArgumentParser) or parser.is_built:
+                    _time_conversions(parser)
+                else:
+                    parser.on_build(_time_conversions)
+            _add_timings_argument(cls.parser, perf_counter() - start)
         return cls
 
     def _add_sub_parsers(
@@ -214,9 +579,14 @@ class ClassParser(object):
             action added to top_level_parser
         """
         description = f"Accessible methods of {class_name}"
-        sub_parsers = top_level_parser.add_subparsers(
-            description=description, dest="method"
-        )
+        if self._lazy:
+            sub_parsers = top_level_parser.add_subparsers(
+                description=description, dest="method", action=LazySubParsersAction
+            )
+        else:
+            sub_parsers = top_level_parser.add_subparsers(
+                description=description, dest="method"
+            )
         # Holds the mapping between the name registered for the parser
         # and the method real name. It is useful in the 'inner_call'
         # method retrieve the real method
@@ -236,12 +606,17 @@ class ClassParser(object):
                 parser_name = parser_name.strip("_")
             parser_name = parser_name.replace("_", "-")
             parser_to_method[parser_name] = method_name
-            sub_parsers.add_parser(
-                parser_name,
-                parents=[parser],
-                add_help=False,
-                description=parser.description,
-            )
+            if self._lazy:
+                # Only the name is registered, the sub-parser is built when
+                # the sub-command is selected or the full help is displayed
+                sub_parsers.add_lazy_parser(parser_name, parser, add_help=False)
+            else:
+                sub_parsers.add_parser(
+                    parser_name,
+                    parents=[_resolve_parser(parser)],
+                    add_help=False,
+                    description=parser.description,
+                )
         return parser_to_method, sub_parsers
 
     def _set_class_parser(
@@ -261,9 +636,14 @@ class ClassParser(object):
         Returns:
             The decorated class with an added attribute 'parser'
         """
-        top_level_parents = [init_parser] if init_parser else []
+        top_level_parents = [_resolve_parser(init_parser)] if init_parser else []
         description = self._description or cls.__doc__
-        top_level_parser = SubcommandAwareArgumentParser(
+        parser_class = (
+            FastSubcommandAwareArgumentParser
+            if self._fast
+            else SubcommandAwareArgumentParser
+        )
+        top_level_parser = parser_class(
             description=description,
             parents=top_level_parents,
             add_help=False,
@@ -274,6 +654,16 @@ class ClassParser(object):
         )
         if self._log_level:
             _add_log_level_argument(top_level_parser)
+        if self._batch:
+            _add_batch_argument(top_level_parser)
+        if self._profile:
+            _add_profile_argument(top_level_parser)
+        if self._rusage:
+            _add_rusage_argument(top_level_parser)
+        if self._trace_memory:
+            _add_trace_memory_argument(top_level_parser)
+        if self._sample_profile:
+            _add_sample_profile_argument(top_level_parser)
         parser_to_method, sub_parsers_action = self._add_sub_parsers(
             top_level_parser, methods_to_parse, cls.__name__
         )
@@ -291,9 +681,50 @@ class ClassParser(object):
     def _set_parser_call_method(
         self, parser_to_method: Dict[str, str], top_level_parser: ArgumentParser
     ):
+        top_level_parser.parser_to_method = parser_to_method
+        top_level_parser.call_plans = {}
         top_level_parser.call = self._get_parser_call_method(parser_to_method)
+        top_level_parser.call_many = self._get_parser_call_many_method(parser_to_method)
+        top_level_parser.acall = self._get_parser_acall_method(parser_to_method)
+        top_level_parser.acall_many = self._get_parser_acall_many_method(
+            parser_to_method
+        )
+        top_level_parser.get_call_plan = partial(
+            self._get_sub_command_plan, parser_to_method
+        )
+        top_level_parser.serve = partial(_serve, top_level_parser)
+
+    def _get_sub_command_plan(
+        self, parser_to_method: Dict[str, str], parser_name: str
+    ) -> _CallPlan:
+        """Return the call plan of a sub-command, or of '__init__', compiling it
+        and storing it on the class parser on first use.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+            parser_name: the registered name of the parser
+        """
+        call_plans = self._cls.parser.call_plans
+        plan = call_plans.get(parser_name)
+        if plan is None:
+            method_name = parser_to_method[parser_name]
+            method = getattr(self._cls, method_name)
+            # The class itself is called to create an instance
+            target = self._cls if parser_name == "__init__" else method
+            # A log level defined on the top level parser is in every namespace
+            log_level = any(
+                action.dest == "log_level" for action in self._cls.parser._actions
+            )
+            plan = _compile_call_plan(method.parser, target, log_level, method_name)
+            if parser_name == "__init__":
+                # The instance may keep the mappings it is created with, they
+                # are released with the instance by the garbage collector
+                plan = plan._replace(mapped_args=())
+            call_plans[parser_name] = plan
+        return plan
 
-    def _get_parser_call_method(self, parser_to_method: Dict[str, Callable]):
+    def _get_parser_call_method(self, parser_to_method: Dict[str, str]):
         """Return the parser special method 'call' that handles sub-command
             calling.
 
@@ -313,20 +744,286 @@ class ClassParser(object):
                     instantiated on the fly from the command line arguments
             """
             parser = self._cls.parser
-            namespace = parser.parse_args(_get_args_to_parse(args))
-            if instance is None:
-                # If the __init__ method is not part of the method to
-                # decorate we cannot instantiate the class
-                if "__init__" not in parser_to_method:
-                    raise ParseThisException(
-                        f"'__init__' method is not decorated. "
-                        f"Please provide an instance to "
-                        f"'{self._cls.__name__}.parser.call' or decorate the "
-                        f"'__init___' method with 'create_parser'"
-                    )
-                # We instantiate the class from the command line arguments
-                instance = _call_method_from_namespace(self._cls, "__init__", namespace)
-            method_name = parser_to_method[namespace.method]
-            return _call_method_from_namespace(instance, method_name, namespace)
+            args_to_parse = _get_args_to_parse(args)
+            batch_succeeded = False
+
+            def parse():
+                return _run_phase(PARSE, parser.parse_args, args_to_parse)
+
+            def call(namespace):
+                nonlocal batch_succeeded
+                batch = getattr(namespace, "batch", None) if self._batch else None
+                if batch is not None and namespace.method is not None:
+                    parser.error("argument --batch: not allowed with a sub-command")
+                obj = _run_phase(
+                    INIT, self._get_instance, parser_to_method, namespace, instance
+                )
+                if batch is not None:
+                    failures = self._run_batch(parser_to_method, namespace, obj)
+                    if failures:
+                        parser.exit(1, "%d command(s) failed\n" % failures)
+                    batch_succeeded = True
+                    return None
+                plan = self._get_sub_command_plan(parser_to_method, namespace.method)
+                return _run_phase(CALL, _call_from_plan, plan, namespace, obj)
+
+            result = _run_instrumented(
+                parser,
+                args_to_parse,
+                lambda: _dispatch(
+                    self._cls.__qualname__, args_to_parse, parse, call, True
+                ),
+            )
+            # Exits once the hooks and the instruments are done with the batch
+            if batch_succeeded:
+                parser.exit(0)
+            return result
 
         return inner_call
+
+    def _get_parser_acall_method(self, parser_to_method: Dict[str, str]):
+        """Return the parser special coroutine function 'acall' that handles
+            sub-command calling from a running event loop.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+        """
+
+        async def acall(args=None, instance=None):
+            """Same as <parser>.call but awaits the result of the method if it
+            is a coroutine.
+
+            Args:
+                args: list of arguments to parse, defaults to command line arguments
+                instance: an instance of the decorated class. If instance is None,
+                    the default, and __init__ is decorated the object will be
+                    instantiated on the fly from the command line arguments
+            """
+            parser = self._cls.parser
+            args_to_parse = _get_args_to_parse(args)
+
+            async def call(namespace, obj):
+                plan = self._get_sub_command_plan(parser_to_method, namespace.method)
+                return await _maybe_await(
+                    _call_from_plan(plan, namespace, obj, run_coroutine=False)
+                )
+
+            async def run():
+                namespace = _run_phase(PARSE, parser.parse_args, args_to_parse)
+                if self._batch and namespace.batch is not None:
+                    parser.error("argument --batch: not allowed with acall")
+                obj = _run_phase(
+                    INIT, self._get_instance, parser_to_method, namespace, instance
+                )
+                return await _arun_phase(CALL, call, namespace, obj)
+
+            return await _arun_instrumented(parser, args_to_parse, run)
+
+        return acall
+
+    def _get_parser_call_many_method(self, parser_to_method: Dict[str, str]):
+        """Return the parser special method 'call_many' that handles calling
+            sub-commands for a batch of arguments.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+        """
+
+        def call_many(
+            args_list: Iterable[List[str]],
+            instance: Any = None,
+            reuse_instance: bool = False,
+        ) -> Iterator[Any]:
+            """Lazily call the sub-command of each list of arguments, the parser
+            is reused and a failing item yields a CallError instead of aborting
+            the batch.
+
+            Args:
+                args_list: iterable of lists of arguments to parse
+                instance: an instance of the decorated class used for every
+                    item. If instance is None, the default, and __init__ is
+                    decorated the object is instantiated from the arguments
+                    of each item
+                reuse_instance: reuse the instance created for the previous
+                    item if the __init__ arguments are equal
+            """
+            dispatch = self._get_batch_dispatch(
+                parser_to_method, instance, reuse_instance, run_coroutine=True
+            )
+            return _call_many(self._cls.parser, args_list, dispatch)
+
+        return call_many
+
+    def _get_parser_acall_many_method(self, parser_to_method: Dict[str, str]):
+        """Return the parser special method 'acall_many' that handles calling
+            sub-commands for a batch of arguments on the running event loop.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+        """
+
+        def acall_many(
+            args_list: Iterable[List[str]],
+            concurrency: int = 10,
+            instance: Any = None,
+            reuse_instance: bool = False,
+        ) -> AsyncIterator[Any]:
+            """Asynchronously call the sub-command of each list of arguments
+            and yield the results in order. A failing item yields a CallError
+            instead of aborting the batch.
+
+            Args:
+                args_list: iterable of lists of arguments to parse
+                concurrency: maximum number of calls awaited at the same time
+                instance: an instance of the decorated class used for every
+                    item. If instance is None, the default, and __init__ is
+                    decorated the object is instantiated from the arguments
+                    of each item
+                reuse_instance: reuse the instance created for the previous
+                    item if the __init__ arguments are equal
+            """
+            dispatch = self._get_batch_dispatch(
+                parser_to_method, instance, reuse_instance, run_coroutine=False
+            )
+            return _acall_many(self._cls.parser, args_list, dispatch, concurrency)
+
+        return acall_many
+
+    def _get_instance(
+        self, parser_to_method: Dict[str, str], namespace: Namespace, instance: Any
+    ) -> Any:
+        """Return instance, or a new instance created from the namespace if
+        instance is None.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+            namespace: the namespace parsed from the command line
+            instance: an instance of the decorated class or None
+        """
+        if instance is None:
+            self._check_init_is_decorated(parser_to_method)
+            # We instantiate the class from the command line arguments
+            init_plan = self._get_sub_command_plan(parser_to_method, "__init__")
+            instance = _call_from_plan(init_plan, namespace)
+        return instance
+
+    def _get_batch_dispatch(
+        self,
+        parser_to_method: Dict[str, str],
+        instance: Any,
+        reuse_instance: bool,
+        run_coroutine: bool,
+    ) -> Callable[[Namespace], Any]:
+        """Return the function calling the sub-command of a namespace for the
+        items of a batch.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+            instance: an instance of the decorated class used for every item,
+            if None an instance is created from the arguments of each item
+            reuse_instance: reuse the instance created for the previous item if
+            the __init__ arguments are equal
+            run_coroutine: run the coroutine returned by a method to completion
+            instead of returning it
+        """
+        if instance is None:
+            self._check_init_is_decorated(parser_to_method)
+        # The __init__ arguments of the last instance created, and the
+        # instance itself
+        last_init: List[Any] = [None, None]
+
+        def dispatch(namespace):
+            obj = instance
+            if obj is None:
+                init_plan = self._get_sub_command_plan(parser_to_method, "__init__")
+                values = vars(namespace)
+                init_args = [values[name] for name in init_plan.arg_names]
+                if reuse_instance and last_init[0] == init_args:
+                    obj = last_init[1]
+                else:
+                    obj = _call_from_plan(init_plan, namespace)
+                    last_init[:] = [init_args, obj]
+            plan = self._get_sub_command_plan(parser_to_method, namespace.method)
+            return _call_from_plan(plan, namespace, obj, run_coroutine=run_coroutine)
+
+        return dispatch
+
+    def _run_batch(
+        self, parser_to_method: Dict[str, str], namespace: Namespace, instance: Any
+    ) -> int:
+        """Run the commands read from the '--batch' file on instance, write
+        their result to stdout as soon as they are available and return the
+        number of commands that failed.
+
+        Args:
+            parser_to_method: mapping of the parser registered name
+            to the method it is linked to
+            namespace: the namespace parsed from the top level command line
+            instance: the instance every command is called on
+        """
+        parser = self._cls.parser
+        sub_parsers = parser._subparsers_action
+        values = vars(namespace)
+
+        def parse(tokens: List[str]) -> Namespace:
+            sub_parser = sub_parsers.choices.get(tokens[0])
+            if sub_parser is None:
+                parser.error(
+                    "invalid choice: %r (choose from %s)"
+                    % (tokens[0], ", ".join(sub_parsers.choices))
+                )
+            # Like argparse, the sub-command values override the top level ones
+            sub_namespace = Namespace(**values)
+            vars(sub_namespace).update(vars(sub_parser.parse_args(tokens[1:])))
+            sub_namespace.method = tokens[0]
+            return sub_namespace
+
+        def dispatch(sub_namespace: Namespace) -> Any:
+            plan = self._get_sub_command_plan(parser_to_method, sub_namespace.method)
+            return _call_from_plan(plan, sub_namespace, instance)
+
+        failures = 0
+        path = namespace.batch
+        from_stdin = path == "-"
+        # Lines are read one at a time so that memory does not depend on the
+        # size of the file
+        with (
+            nullcontext(sys.stdin) if from_stdin else open(path, encoding="utf-8")
+        ) as commands:
+            for line_number, line in enumerate(commands, 1):
+                try:
+                    tokens = shlex.split(line, comments=True)
+                except ValueError as error:
+                    result: Any = CallError([line], error, "")
+                else:
+                    if not tokens:
+                        continue
+                    result = _call_one(parse, tokens, dispatch)
+                if isinstance(result, CallError):
+                    failures += 1
+                    lines = result.message.strip().splitlines()
+                    reason = lines[-1] if lines else repr(result.error)
+                    print("%s:%d: %s" % (path, line_number, reason), file=sys.stderr)
+                    continue
+                # Like the daemon, commands returning nothing print nothing
+                if result is not None:
+                    print(result, flush=from_stdin)
+        return failures
+
+    def _check_init_is_decorated(self, parser_to_method: Dict[str, str]) -> None:
+        """Raise a ParseThisException if the class can not be instantiated
+        from the command line arguments."""
+        # If the __init__ method is not part of the method to
+        # decorate we cannot instantiate the class
+        if "__init__" not in parser_to_method:
+            raise ParseThisException(
+                f"'__init__' method is not decorated. "
+                f"Please provide an instance to "
+                f"'{self._cls.__name__}.parser.call' or decorate the "
+                f"'__init___' method with 'create_parser'"
+            )
@@ -1,22 +1,38 @@
 import enum
 import logging
 from argparse import ArgumentParser
+from inspect import getfullargspec
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, cast
 
-from parse_this.args import _NO_DEFAULT
+from parse_this.args import _NO_DEFAULT, _get_args_and_defaults
 from parse_this.exception import ParseThisException
+from parse_this.fast import FastArgumentParser
 from parse_this.help.description import prepare_doc
 from parse_this.helpers import (
     _add_log_level_argument,
-    _get_element_type,
+    _get_enum_choices,
+    _get_enum_metavar,
     _is_enum_type,
-    _is_sequence_type,
     _make_enum_converter,
 )
+from parse_this.sequences import (
+    _get_sequence_kwargs,
+    _is_multi_value_type,
+    _use_typed_arrays,
+    _use_value_files,
+)
+from parse_this.spec_cache import get_spec_cache
+from parse_this.type_check import _check_types
+from parse_this.types import _FILE_CONVERTERS, _is_file_type
 
 _LOG = logging.getLogger(__name__)
 
 
+def _identity(value: str) -> str:
+    """Type of the required arguments that are not annotated."""
+    return value
+
+
 def _get_parseable_methods(
     cls: type,
 ) -> Tuple[Optional[ArgumentParser], Dict[str, ArgumentParser]]:
@@ -52,12 +68,98 @@ def _get_parseable_methods(
     return init_parser, methods_to_parse
 
 
+def _is_valid_spec(spec: Any, func: Callable) -> bool:
+    """Return whether spec, read from the on-disk cache, holds the names of
+    the arguments of func, the description and the help message of each
+    argument."""
+    if not isinstance(spec, dict):
+        return False
+    code = func.__code__
+    func_args = list(code.co_varnames[: code.co_argcount])
+    if func_args and func_args[0] in ("self", "cls"):
+        func_args = func_args[1:]
+    args, description, arg_help = (
+        spec.get("args"),
+        spec.get("description"),
+        spec.get("help"),
+    )
+    return (
+        args == func_args
+        and isinstance(description, str)
+        and isinstance(arg_help, dict)
+        and all(arg in arg_help for arg in args)
+    )
+
+
+def _create_arg_parser(
+    func: Callable,
+    delimiter_chars: str,
+    log_level: bool = False,
+    fast: bool = False,
+    typed_arrays: bool = False,
+    value_files: bool = False,
+) -> ArgumentParser:
+    """Introspect func and return its ArgumentParser. If the on-disk spec cache
+        is enabled the arguments and help messages are read from it rather than
+        from the function signature and docstring.
+
+    Args:
+        func: function for which we want an ArgumentParser
+        delimiter_chars: characters used to separate the parameters from their
+        help message in the docstring
+        log_level: indicate whether or not a '--log-level' argument should be
+        handled to set the log level during the execution
+        fast: create a FastArgumentParser
+        typed_arrays: store the list/tuple of int or float arguments in an
+        array.array
+        value_files: read the values of the sequence arguments from a file with
+        '@path' or from stdin with '-'
+    """
+    spec_cache = get_spec_cache()
+    spec = spec_cache.get(func, delimiter_chars) if spec_cache else None
+    if spec is not None and not _is_valid_spec(spec, func):
+        _LOG.debug("Ignoring invalid cached spec for '%s'", func.__name__)
+        spec = None
+    if spec is None:
+        func_args, _, _, defaults, _, _, annotations = getfullargspec(func)
+        func_args = _check_types(func.__name__, annotations, func_args, defaults)
+        doc = prepare_doc(func, func_args, delimiter_chars)
+        if spec_cache:
+            spec_cache.put(
+                func,
+                delimiter_chars,
+                {"args": func_args, "description": doc[0], "help": doc[1]},
+            )
+    else:
+        _LOG.debug("Using cached spec for '%s'", func.__name__)
+        func_args = spec["args"]
+        defaults = func.__defaults__
+        annotations = func.__annotations__
+        doc = (spec["description"], spec["help"])
+    args_and_defaults = _get_args_and_defaults(func_args, defaults)
+    return _get_arg_parser(
+        func,
+        annotations,
+        args_and_defaults,
+        delimiter_chars,
+        log_level,
+        doc,
+        fast,
+        typed_arrays,
+        value_files,
+    )
+
+
 def _get_arg_parser(
     func: Callable,
     annotations: Dict[str, Callable],
     args_and_defaults: List[Tuple[str, Any]],
     delimiter_chars: str,
     log_level: bool = False,
+    doc: Optional[Tuple[str, Dict[str, str]]] = None,
+    fast: bool = False,
+    typed_arrays: bool = False,
+    value_files: bool = False,
 ) -> ArgumentParser:
     """Return an ArgumentParser for the given function. Arguments are defined
         from the function arguments and their associated defaults.
@@ -70,22 +172,35 @@ def _get_arg_parser(
         help message in the docstring
         log_level: indicate whether or not a '--log-level' argument should be
         handled to set the log level during the execution
+        doc: the description and arguments help, as returned by prepare_doc,
+        if they are already known
+        fast: create a FastArgumentParser, parsing simple command lines
+        without going through argparse
+        typed_arrays: store the list/tuple of int or float arguments in an
+        array.array rather than a list of Python objects
+        value_files: let a single '@path' value read the values of a sequence
+        argument from a file, and a single '-' from stdin
     """
     _LOG.debug("Creating ArgumentParser for '%s'", func.__name__)
-    description, arg_help = prepare_doc(
-        func, [x for (x, _) in args_and_defaults], delimiter_chars
-    )
-    parser = ArgumentParser(description=description)
+    if doc is None:
+        doc = prepare_doc(func, [x for (x, _) in args_and_defaults], delimiter_chars)
+    description, arg_help = doc
+    parser_class = FastArgumentParser if fast else ArgumentParser
+    parser = parser_class(description=description)
     if log_level:
         _add_log_level_argument(parser)
     for arg, default in args_and_defaults:
         help_msg = arg_help[arg]
         arg_type = annotations.get(arg)
         if default is _NO_DEFAULT:
-            arg_type = arg_type or (lambda x: x)
+            arg_type = arg_type or _identity
             _add_required_argument(parser, func, arg, arg_type, help_msg)
         else:
             _add_optional_argument(parser, func, arg, arg_type, default, help_msg)
+    if typed_arrays:
+        _use_typed_arrays(parser)
+    if value_files:
+        _use_value_files(parser)
     return parser
 
 
@@ -122,23 +237,28 @@ def _add_required_argument(
             arg_type,
         )
         _enum_class = cast(Type[enum.Enum], arg_type)
-        _names: List[str] = [e.name for e in _enum_class]
         parser.add_argument(
             arg,
             help=help_msg,
             type=_make_enum_converter(_enum_class),
-            choices=list(_enum_class),
-            metavar="{%s}" % ",".join(_names),
+            choices=_get_enum_choices(_enum_class),
+            metavar=_get_enum_metavar(_enum_class),
         )
-    elif _is_sequence_type(arg_type):
+    elif _is_multi_value_type(arg_type):
         _LOG.debug(
             "Adding positional sequence argument %s.%s: %s",
             func.__name__,
             arg,
             arg_type,
         )
-        element_type = _get_element_type(arg_type)
-        parser.add_argument(arg, help=help_msg, type=element_type, nargs="+")
+        parser.add_argument(arg, help=help_msg, **_get_sequence_kwargs(arg_type))
+    elif _is_file_type(arg_type):
+        _LOG.debug(
+            "Adding positional file argument %s.%s: %s", func.__name__, arg, arg_type
+        )
+        parser.add_argument(
+            arg, help=help_msg, type=_FILE_CONVERTERS[arg_type], metavar="PATH"
+        )
     else:
         _LOG.debug("Adding positional argument %s.%s: %s", func.__name__, arg, arg_type)
         parser.add_argument(arg, help=help_msg, type=arg_type)
@@ -187,16 +307,15 @@ def _add_optional_argument(
             default,
         )
         _enum_class = cast(Type[enum.Enum], arg_type)
-        _names = [e.name for e in _enum_class]
         parser.add_argument(
             "--%s" % arg,
             help=help_msg,
             default=default,
             type=_make_enum_converter(_enum_class),
-            choices=list(_enum_class),
-            metavar="{%s}" % ",".join(_names),
+            choices=_get_enum_choices(_enum_class),
+            metavar=_get_enum_metavar(_enum_class),
         )
-    elif _is_sequence_type(arg_type):
+    elif _is_multi_value_type(arg_type):
         _LOG.debug(
             "Adding optional sequence argument %s.%s: %s (default: %s)",
             func.__name__,
@@ -204,9 +323,26 @@ def _add_optional_argument(
             arg_type,
             default,
         )
-        element_type = _get_element_type(arg_type)
         parser.add_argument(
-            "--%s" % arg, help=help_msg, default=default, type=element_type, nargs="+"
+            "--%s" % arg,
+            help=help_msg,
+            default=default,
+            **_get_sequence_kwargs(arg_type),
+        )
+    elif _is_file_type(arg_type):
+        _LOG.debug(
+            "Adding optional file argument %s.%s: %s (default: %s)",
+            func.__name__,
+            arg,
+            arg_type,
+            default,
+        )
+        parser.add_argument(
+            "--%s" % arg,
+            help=help_msg,
+            default=default,
+            type=_FILE_CONVERTERS[arg_type],
+            metavar="PATH",
         )
     else:
         _LOG.debug(
@@ -0,0 +1,83 @@
+"""Phases of a call made with <parser>.call or <parser>.acall: the parsing of
+the command line, including the conversion of the arguments, the creation of
+the instance of a class and the call itself.
+
+The instrumentation options observe the phases by registering an observer for
+the duration of the call: a callable taking the name of a phase and returning
+the context manager the phase runs in. Without observers the phases are run as
+is, after a single context variable lookup.
+"""
+
+import logging
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, ContextManager, Iterator, Tuple
+
+_LOG = logging.getLogger(__name__)
+
+# Phases of a call, in the order they run
+PARSE = "parse"
+INIT = "init"
+CALL = "call"
+
+PHASE_LABELS = {
+    PARSE: "parse_args",
+    INIT: "instance creation",
+    CALL: "call",
+}
+
+_Observer = Callable[[str], ContextManager]
+
+# Observers of the call running in the current thread or task
+_OBSERVERS: ContextVar[Tuple[_Observer, ...]] = ContextVar("observers", default=())
+
+
+def _run_phase(phase: str, func: Callable, *args: Any) -> Any:
+    """Return func(*args), run within the context of the observers of the
+    current call.
+
+    Args:
+        phase: name of the phase, see PHASE_LABELS
+        func: the callable running the phase
+        args: positional arguments of func
+    """
+    observers = _OBSERVERS.get()
+    if not observers:
+        return func(*args)
+    with ExitStack() as stack:
+        for observer in observers:
+            stack.enter_context(observer(phase))
+        return func(*args)
+
+
+async def _arun_phase(phase: str, func: Callable[..., Awaitable], *args: Any) -> Any:
+    """Same as _run_phase for the coroutine function func, the phase lasts
+    until its coroutine is done.
+
+    Args:
+        phase: name of the phase, see PHASE_LABELS
+        func: the coroutine function running the phase
+        args: positional arguments of func
+    """
+    observers = _OBSERVERS.get()
+    if not observers:
+        return await func(*args)
+    with ExitStack() as stack:
+        for observer in observers:
+            stack.enter_context(observer(phase))
+        return await func(*args)
+
+
+@contextmanager
+def _observing(observer: _Observer) -> Iterator[None]:
+    """Observe the phases run in the current thread or task until exiting.
+
+    Args:
+        observer: callable taking the name of a phase and returning the context
+        manager the phase runs in
+    """
+    token = _OBSERVERS.set(_OBSERVERS.get() + (observer,))
+    try:
+        yield
+    finally:
+        _OBSERVERS.reset(token)
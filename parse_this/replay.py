@@ -0,0 +1,256 @@
+"""Run the commands recorded by an InvocationRecorder again, e.g. recorded in
+production with the PARSE_THIS_RECORD environment variable, and compare their
+latency with the recorded one.
+
+Usage: python -m parse_this.replay LOG mymodule:MyClass [--repeat N] [--threshold PERCENT]
+
+Only the commands of the decorated class or function, or of the function
+called with parse_this, are replayed, their output is discarded. All the
+commands are run in a single process: unlike the recorded commands of
+short-lived processes, only the first one builds the parsers.
+"""
+
+import argparse
+import inspect
+import io
+import json
+import logging
+import math
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from parse_this import hooks, parse_this
+from parse_this.compile import _resolve
+from parse_this.exception import ParseThisException
+from parse_this.instrument import _positive_int
+
+_LOG = logging.getLogger(__name__)
+
+
+class CommandReport(NamedTuple):
+    """Latencies, in seconds, of the invocations of a command.
+
+    Attributes:
+        command: name of the command, see HookEvent
+        recorded: latency of each recorded invocation
+        replayed: latency of each replayed invocation
+        changed: number of replayed invocations whose status, 'ok' or 'error',
+        differs from the recorded one
+    """
+
+    command: str
+    recorded: List[float]
+    replayed: List[float]
+    changed: int
+
+    def get_change(self) -> float:
+        """Return the change of the median latency, in percent of the
+        recorded one."""
+        recorded = _percentile(self.recorded, 50)
+        if not recorded:
+            return 0.0
+        return (_percentile(self.replayed, 50) - recorded) * 100 / recorded
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of values, 0 if there are none.
+
+    Args:
+        values: the values to compute the percentile of
+        percent: the percentile, between 0 and 100
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent * len(ordered) / 100) - 1)]
+
+
+def _read_invocations(path: str, name: str) -> List[Dict[str, Any]]:
+    """Return the invocations of the command name recorded in path.
+
+    Args:
+        path: the file the invocations were recorded to
+        name: qualified name of the decorated class or function, the
+        invocations of its sub-commands are returned for a class
+
+    Raises:
+        ParseThisException if a line of the file is not a recorded invocation
+    """
+    invocations = []
+    with open(path, encoding="utf-8") as records:
+        for line_number, line in enumerate(records, 1):
+            if not line.strip():
+                continue
+            try:
+                invocation = json.loads(line)
+                command, argv = invocation["command"], invocation["argv"]
+            except (ValueError, TypeError, KeyError):
+                command, argv = None, None
+            if not isinstance(command, str) or not isinstance(argv, list):
+                raise ParseThisException(
+                    "Line %d of '%s' is not a recorded invocation" % (line_number, path)
+                )
+            if command == name or command.startswith(name + "."):
+                invocations.append(invocation)
+    _LOG.debug("Read %d invocations of %s from '%s'", len(invocations), name, path)
+    return invocations
+
+
+def _run(call: Callable[[List[str]], Any], argv: List[str]) -> bool:
+    """Run the command line argv with call, return whether the call succeeded.
+
+    Args:
+        call: callable parsing the command line it is given and calling the
+        target with it
+        argv: the command line to parse
+    """
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        try:
+            call(argv)
+        except SystemExit as error:
+            return error.code in (0, None)
+        except Exception:
+            return False
+    return True
+
+
+def _call_parser(parser: Any, argv: List[str]) -> Any:
+    """Call the decorated class or function of parser with argv."""
+    return parser.call(args=argv)
+
+
+def replay(path: str, target: str, repeat: int = 1) -> List[CommandReport]:
+    """Run the invocations of target recorded in path again, return the report
+    of each command, sorted by name.
+
+    Args:
+        path: the file the invocations were recorded to
+        target: the decorated class or function as module:name
+        repeat: number of times each invocation is run
+
+    Raises:
+        ParseThisException if target is not decorated or path is not a log of
+        recorded invocations
+    """
+    obj = _resolve(target)
+    parser = getattr(obj, "parser", None)
+    call: Callable[[List[str]], Any]
+    if hasattr(parser, "call"):
+        call = partial(_call_parser, parser)
+    elif inspect.isfunction(obj):
+        # Recorded from 'parse_this(obj, argv)', the function is not decorated
+        call = partial(parse_this, obj)
+    else:
+        raise ParseThisException(
+            "'%s' is neither a function nor decorated with 'create_parser' or "
+            "'parse_class'" % target
+        )
+    recorded: Dict[str, List[float]] = {}
+    replayed: Dict[str, List[float]] = {}
+    changed: Dict[str, int] = {}
+    for invocation in _read_invocations(path, obj.__qualname__):
+        command = invocation["command"]
+        recorded.setdefault(command, []).append(invocation.get("seconds", 0.0))
+        expected = invocation.get("status", "ok") == "ok"
+        for _ in range(repeat):
+            start = perf_counter()
+            succeeded = _run(call, invocation["argv"])
+            replayed.setdefault(command, []).append(perf_counter() - start)
+            changed[command] = changed.get(command, 0) + (succeeded != expected)
+    return [
+        CommandReport(command, recorded[command], replayed[command], changed[command])
+        for command in sorted(recorded)
+    ]
+
+
+def _format_reports(reports: List[CommandReport], threshold: Optional[float]) -> str:
+    """Return the table of the reports, one command per line, the commands
+    whose median latency grew by more than threshold percent are flagged.
+
+    Args:
+        reports: the reports of the commands replayed
+        threshold: the change of the median latency flagged as a regression
+    """
+    rows = [
+        (
+            "command",
+            "runs",
+            "p50 ms",
+            "p90 ms",
+            "p99 ms",
+            "recorded p50 ms",
+            "change",
+            "status changed",
+        )
+    ]
+    for report in reports:
+        change = report.get_change()
+        flag = " !" if threshold is not None and change > threshold else ""
+        rows.append(
+            (
+                report.command,
+                str(len(report.replayed)),
+                "%.3f" % (_percentile(report.replayed, 50) * 1000),
+                "%.3f" % (_percentile(report.replayed, 90) * 1000),
+                "%.3f" % (_percentile(report.replayed, 99) * 1000),
+                "%.3f" % (_percentile(report.recorded, 50) * 1000),
+                "%+.1f%%%s" % (change, flag),
+                str(report.changed),
+            )
+        )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if column == 0 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in rows
+    )
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of 'python -m parse_this.replay', return the exit code: 1 if
+    a command regressed by more than the threshold, 0 otherwise."""
+    parser = argparse.ArgumentParser(
+        prog="python -m parse_this.replay",
+        description="Run recorded commands again and compare their latency "
+        "with the recorded one.",
+    )
+    parser.add_argument("log", help="the file the commands were recorded to")
+    parser.add_argument("target", help="the decorated class or function as module:name")
+    parser.add_argument(
+        "--repeat",
+        type=_positive_int,
+        default=1,
+        help="number of times each command is run, 1 by default",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="fail if the median latency of a command grew by more than "
+        "THRESHOLD percent of the recorded one",
+    )
+    namespace = parser.parse_args(args)
+    # The replayed commands are not recorded again
+    if hooks._ENV_RECORDER is not None:
+        hooks._ENV_RECORDER.uninstall()
+    try:
+        reports = replay(namespace.log, namespace.target, namespace.repeat)
+    except (ParseThisException, ImportError, AttributeError, OSError) as error:
+        parser.error(str(error))
+    if not reports:
+        print("No command of %s was recorded" % namespace.target, file=sys.stderr)
+        return 0
+    print(_format_reports(reports, namespace.threshold))
+    if namespace.threshold is not None and any(
+        report.get_change() > namespace.threshold for report in reports
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
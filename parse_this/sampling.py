@@ -0,0 +1,204 @@
+"""Sampling profiler of the call of a decorated callable, '--sample-profile'.
+
+A background thread samples the stack of the thread running the call at a
+fixed rate, only the target is sampled: not the parsing nor the creation of
+the instance of a class. The stacks are written in the collapsed format read
+by flamegraph.pl, speedscope or inferno, one stack per line with the number of
+times it was sampled:
+
+    <module>.main;[parse_this] parse_this.call.inner_call;script.work 42
+
+The frames of parse_this are labeled with '[parse_this]' so that they can be
+told apart, or filtered out, e.g. with sed 's/\\[parse_this\\][^;]*;//g'.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from types import CodeType
+from typing import Counter as CounterType
+from typing import Dict, Iterator, List, Tuple
+
+from parse_this.exception import ParseThisException
+from parse_this.instrument import _add_instrumentation_argument
+from parse_this.phases import CALL, _observing
+
+_LOG = logging.getLogger(__name__)
+
+# Number of samples taken per second, see _get_sample_rate
+_SAMPLE_RATE_ENV = "PARSE_THIS_SAMPLE_RATE"
+_DEFAULT_SAMPLE_RATE = 100.0
+# Label of the frames of parse_this
+_PARSE_THIS_LABEL = "[parse_this] "
+
+
+def _get_sample_rate() -> float:
+    """Return the number of samples per second, set by the
+    PARSE_THIS_SAMPLE_RATE environment variable.
+
+    Raises:
+        ParseThisException if the rate is not a positive number
+    """
+    setting = os.environ.get(_SAMPLE_RATE_ENV)
+    if not setting:
+        return _DEFAULT_SAMPLE_RATE
+    try:
+        rate = float(setting)
+    except ValueError:
+        rate = 0
+    if rate <= 0:
+        raise ParseThisException(
+            "%s must be a positive number of samples per second, not '%s'"
+            % (_SAMPLE_RATE_ENV, setting)
+        )
+    return rate
+
+
+class _Sampler(threading.Thread):
+    """Thread sampling the stack of another thread until stopped.
+
+    Attributes:
+        stacks: number of times each stack was sampled, a stack is the tuple of
+        the code objects of its frames from the outermost one
+        modules: name of the module of each code object sampled
+    """
+
+    stacks: CounterType[Tuple[CodeType, ...]]
+    modules: Dict[CodeType, str]
+
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Args:
+            thread_id: identifier of the thread to sample
+            interval: seconds between two samples
+        """
+        super().__init__(name="parse_this-sampler", daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        self.stacks = Counter()
+        self.modules = {}
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            codes = []
+            while frame is not None:
+                code = frame.f_code
+                if code not in self.modules:
+                    self.modules[code] = frame.f_globals.get("__name__", "?")
+                codes.append(code)
+                frame = frame.f_back
+            if codes:
+                codes.reverse()
+                self.stacks[tuple(codes)] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to exit."""
+        self._stopped.set()
+        self.join()
+
+
+def _get_label(code: CodeType, module: str) -> str:
+    """Return the name of a frame in the collapsed stacks.
+
+    Args:
+        code: the code object of the frame
+        module: name of the module the code belongs to
+    """
+    # co_qualname is only available from Python 3.11
+    label = "%s.%s" % (module, getattr(code, "co_qualname", code.co_name))
+    if module == "parse_this" or module.startswith("parse_this."):
+        return _PARSE_THIS_LABEL + label
+    return label
+
+
+def _collapse(sampler: _Sampler) -> List[str]:
+    """Return the lines of the collapsed stacks sampled by sampler."""
+    labels: Dict[CodeType, str] = {}
+    lines = []
+    for codes, count in sampler.stacks.most_common():
+        frames = []
+        for code in codes:
+            if code not in labels:
+                labels[code] = _get_label(code, sampler.modules[code])
+            frames.append(labels[code])
+        lines.append("%s %d" % (";".join(frames), count))
+    return lines
+
+
+@contextmanager
+def _sample_phase(
+    samplers: List[_Sampler], interval: float, phase: str
+) -> Iterator[None]:
+    """Sample the stack of the current thread while the call phase runs.
+
+    Args:
+        samplers: the samplers of the call, the sampler of the phase is added
+        interval: seconds between two samples
+        phase: name of the phase, only the call is sampled
+    """
+    if phase != CALL:
+        yield
+        return
+    sampler = _Sampler(threading.get_ident(), interval)
+    samplers.append(sampler)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+
+
+@contextmanager
+def _sample_profile(path: str) -> Iterator[None]:
+    """Sample the stack of the call and write the collapsed stacks to path.
+
+    Args:
+        path: file the collapsed stacks are written to
+
+    Raises:
+        ParseThisException if tracemalloc is tracing, e.g. with --trace-memory
+    """
+    # Not imported if it is not already, it can only be tracing once imported
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        raise ParseThisException(
+            "--sample-profile can not be combined with --trace-memory, the "
+            "allocations of the sampler would be traced with the ones of the call"
+        )
+    interval = 1 / _get_sample_rate()
+    samplers: List[_Sampler] = []
+    try:
+        with _observing(partial(_sample_phase, samplers, interval)):
+            yield
+    finally:
+        lines: List[str] = []
+        for sampler in samplers:
+            lines.extend(_collapse(sampler))
+        _LOG.debug("Writing %d sampled stacks to '%s'", len(lines), path)
+        with open(path, "w", encoding="utf-8") as folded:
+            folded.writelines(line + "\n" for line in lines)
+
+
+def _add_sample_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the '--sample-profile' argument to parser, the stack of the calls
+    made with it is then sampled.
+
+    Args:
+        parser: the parser of the callable to sample
+    """
+    _add_instrumentation_argument(
+        parser,
+        "--sample-profile",
+        _sample_profile,
+        metavar="PATH",
+        help="sample the stack of the call, %d times per second unless set by "
+        "%s, and write the collapsed stacks to PATH"
+        % (_DEFAULT_SAMPLE_RATE, _SAMPLE_RATE_ENV),
+    )
@@ -0,0 +1,288 @@
+"""Sequence arguments whose values are given on the command line or, with
+value_files, read from a file with '@path' or from stdin with '-'."""
+
+import argparse
+import array
+import collections.abc
+import logging
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, get_args, get_origin
+
+from parse_this.exception import ParseThisException
+from parse_this.helpers import (
+    _get_element_type,
+    _is_array_type,
+    _is_iterable_type,
+    _is_sequence_type,
+)
+
+_LOG = logging.getLogger(__name__)
+
+# Single value reading the values of a sequence argument from stdin
+_STDIN = "-"
+# Prefix of the single value reading the values of a sequence from a file
+_FILE_PREFIX = "@"
+# Typecode of the array.array annotations not giving one
+_DEFAULT_TYPECODE = "d"
+# Typecode of the list/tuple arguments stored in an array with typed_arrays
+_ARRAY_TYPECODES: Dict[Callable, str] = {int: "q", float: "d"}
+
+
+def _is_multi_value_type(arg_type: Any) -> bool:
+    """Return True if arg_type is a list, tuple, Iterable, Iterator or
+    array.array annotation, handled by SequenceAction.
+
+    Args:
+        arg_type: the type annotation to inspect
+    """
+    return (
+        _is_sequence_type(arg_type)
+        or _is_iterable_type(arg_type)
+        or _is_array_type(arg_type)
+    )
+
+
+def _get_array_typecode(arg_type: Any) -> str:
+    """Return the typecode of an array.array annotation.
+
+    Args:
+        arg_type: array.array or Annotated[array.array, typecode]
+
+    Raises:
+        ParseThisException if the typecode is not a numeric array typecode
+    """
+    typecodes = [meta for meta in get_args(arg_type)[1:] if isinstance(meta, str)]
+    typecode = typecodes[0] if typecodes else _DEFAULT_TYPECODE
+    if typecode not in array.typecodes or typecode in "uw":
+        raise ParseThisException(
+            f"'{typecode}' is not a numeric array typecode, use one of "
+            f"{array.typecodes.replace('u', '').replace('w', '')}"
+        )
+    return typecode
+
+
+def _get_sequence_kwargs(arg_type: Any) -> Dict[str, Any]:
+    """Return the add_argument keyword arguments of a sequence argument.
+
+    Args:
+        arg_type: a list, tuple, Iterable, Iterator or array.array type
+        annotation
+    """
+    if _is_array_type(arg_type):
+        typecode = _get_array_typecode(arg_type)
+        return {
+            "action": SequenceAction,
+            "element_type": float if typecode in "fd" else int,
+            "typecode": typecode,
+        }
+    return {
+        "action": SequenceAction,
+        "element_type": _get_element_type(arg_type),
+        "lazy": _is_iterable_type(arg_type),
+        "iterator": (get_origin(arg_type) or arg_type) is collections.abc.Iterator,
+    }
+
+
+def _use_typed_arrays(parser: argparse.ArgumentParser) -> None:
+    """Store the values of the list/tuple of int or float arguments of parser
+    in an array.array rather than a list.
+
+    Args:
+        parser: the parser whose sequence arguments are updated
+    """
+    for action in parser._actions:
+        if (
+            isinstance(action, SequenceAction)
+            and not action.lazy
+            and action.typecode is None
+            and action.element_type in _ARRAY_TYPECODES
+        ):
+            action.typecode = _ARRAY_TYPECODES[action.element_type]
+
+
+def _use_value_files(parser: argparse.ArgumentParser) -> None:
+    """Read the values of the sequence arguments of parser from a file when a
+    single '@path' value is given, or from stdin for a single '-'.
+
+    Args:
+        parser: the parser whose sequence arguments are updated
+    """
+    for action in parser._actions:
+        if isinstance(action, SequenceAction):
+            action.value_files = True
+
+
+def _get_source(values: List[str]) -> Optional[str]:
+    """Return the path the values should be read from, '-' for stdin, None if
+    values are the sequence itself.
+
+    Args:
+        values: the strings given on the command line for the argument
+    """
+    if len(values) != 1:
+        return None
+    if values[0] == _STDIN:
+        return _STDIN
+    if values[0].startswith(_FILE_PREFIX) and len(values[0]) > 1:
+        return values[0][1:]
+    return None
+
+
+def _read_lines(source: str) -> Iterator[str]:
+    """Yield the stripped non-empty lines of source, one at a time.
+
+    Args:
+        source: path of the file to read, '-' for stdin
+    """
+    if source == _STDIN:
+        for line in sys.stdin:
+            line = line.strip()
+            if line:
+                yield line
+        return
+    with open(source, encoding="utf-8") as lines:
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class LazyValues(collections.abc.Iterable):
+    """Values of a sequence argument, converted one at a time while they are
+    iterated over. Values read from a file are read again on each iteration,
+    values read from stdin can only be iterated over once.
+    """
+
+    _dest: str
+    _convert: Callable
+    _source: Optional[str]
+    _values: List[str]
+
+    def __init__(
+        self, dest: str, convert: Callable, source: Optional[str], values: List[str]
+    ):
+        """
+        Args:
+            dest: name of the argument, used in error messages
+            convert: callable converting a string to an element
+            source: path of the file the values are read from, '-' for stdin,
+            None to use values
+            values: the values given on the command line
+        """
+        self._dest = dest
+        self._convert = convert
+        self._source = source
+        self._values = values
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._source is None:
+            lines: Iterator[str] = iter(self._values)
+            location = "command line"
+        else:
+            lines = _read_lines(self._source)
+            location = "stdin" if self._source == _STDIN else self._source
+        for index, line in enumerate(lines, 1):
+            try:
+                yield self._convert(line)
+            except (TypeError, ValueError, argparse.ArgumentTypeError) as error:
+                raise ParseThisException(
+                    f"Invalid value {line!r} for '{self._dest}' "
+                    f"({location}, value {index}): {error}"
+                )
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self._source or self._values)
+
+
+class SequenceAction(argparse.Action):
+    """Action of the sequence arguments, taking one or more values. If
+    value_files is set a single '@path' value reads the values from a file and
+    a single '-' from stdin, one value per line.
+
+    Values are converted with element_type. The argument is a list, or an
+    array.array if typecode is set, unless it is lazy, it is then an iterable,
+    or an iterator, converting the values as they are consumed so they never
+    all are in memory.
+    """
+
+    element_type: Callable
+    lazy: bool
+    iterator: bool
+    typecode: Optional[str]
+    value_files: bool
+
+    def __init__(
+        self,
+        option_strings: List[str],
+        dest: str,
+        element_type: Callable = str,
+        lazy: bool = False,
+        iterator: bool = False,
+        typecode: Optional[str] = None,
+        value_files: bool = False,
+        **kwargs,
+    ):
+        """
+        Args:
+            option_strings: the option strings of the argument, empty for
+            positional arguments
+            dest: name of the argument
+            element_type: callable converting a value to an element
+            lazy: give an iterable converting the values on demand rather than a
+            list
+            iterator: give an iterator rather than an iterable, only used if
+            lazy is True
+            typecode: store the values in an array.array of typecode rather
+            than a list
+            value_files: read the values from the file of a single '@path'
+            value, or from stdin for a single '-', rather than taking them as is
+            kwargs: the other keyword arguments of argparse.Action
+        """
+        super().__init__(option_strings, dest, nargs="+", **kwargs)
+        self.element_type = element_type
+        self.lazy = lazy
+        self.iterator = iterator
+        self.typecode = typecode
+        self.value_files = value_files
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        source = _get_source(values) if self.value_files else None
+        if source is not None and source != _STDIN:
+            try:
+                open(source, encoding="utf-8").close()
+            except OSError as error:
+                raise argparse.ArgumentError(
+                    self, "can't open '%s': %s" % (source, error)
+                )
+        if self.lazy:
+            _LOG.debug("Lazily reading '%s' from %s", self.dest, source or "argv")
+            lazy_values = LazyValues(self.dest, self.element_type, source, values)
+            setattr(
+                namespace,
+                self.dest,
+                iter(lazy_values) if self.iterator else lazy_values,
+            )
+            return
+        lines = values if source is None else _read_lines(source)
+        if self.typecode is None:
+            setattr(namespace, self.dest, [self._convert(line) for line in lines])
+            return
+        try:
+            # Each value is stored in the array as soon as it is converted
+            converted = array.array(self.typecode, map(self._convert, lines))
+        except OverflowError as error:
+            raise argparse.ArgumentError(
+                self,
+                "value out of range for typecode '%s': %s" % (self.typecode, error),
+            )
+        setattr(namespace, self.dest, converted)
+
+    def _convert(self, value: str) -> Any:
+        """Convert value to an element, raising the same errors as argparse."""
+        try:
+            return self.element_type(value)
+        except argparse.ArgumentTypeError as error:
+            raise argparse.ArgumentError(self, str(error))
+        except (TypeError, ValueError):
+            name = getattr(self.element_type, "__name__", repr(self.element_type))
+            raise argparse.ArgumentError(self, "invalid %s value: %r" % (name, value))
@@ -0,0 +1,199 @@
+import atexit
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+_LOG = logging.getLogger(__name__)
+
+# Set to '1' to use the default cache directory or to the path of a directory
+_CACHE_ENV = "PARSE_THIS_CACHE"
+# Bump when the content of the specs or the way they are computed changes
+_SPEC_VERSION = 3
+
+_SPEC_CACHES: Dict[str, "SpecCache"] = {}
+
+
+def _get_default_cache_dir() -> str:
+    """Return the parse_this directory under $XDG_CACHE_HOME, or ~/.cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "parse_this")
+
+
+def get_spec_cache() -> Optional["SpecCache"]:
+    """Return the on-disk spec cache if it is enabled through the
+    PARSE_THIS_CACHE environment variable, None otherwise."""
+    setting = os.environ.get(_CACHE_ENV)
+    if not setting or setting == "0":
+        return None
+    directory = _get_default_cache_dir() if setting == "1" else setting
+    if directory not in _SPEC_CACHES:
+        _SPEC_CACHES[directory] = SpecCache(directory)
+    return _SPEC_CACHES[directory]
+
+
+class SpecCache(object):
+    """Persistent cache of the argument specs of decorated callables.
+
+    A spec is everything that is costly to compute from a callable, i.e. the
+    names of its arguments and the help messages parsed from its docstring.
+    The specs of all the callables of a source file are stored in a single
+    JSON file, valid as long as the source file's mtime and size are unchanged.
+    New specs are kept in memory and the files are written once, by flush,
+    which is called when the interpreter exits. Files are written to a
+    temporary file and atomically renamed so concurrent processes never read a
+    partial file. Any error reading or writing the cache is logged and ignored,
+    the callable is then simply introspected.
+    """
+
+    _directory: str
+    _files: Dict[str, Dict[str, Any]]
+    _dirty: Set[str]
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: the directory where the cache files are stored
+        """
+        self._directory = directory
+        # Content of the cache files already read, indexed on the source path
+        self._files = {}
+        # Source paths whose cache file has specs not written yet
+        self._dirty = set()
+
+    def get(self, func: Callable, delimiter_chars: str) -> Optional[Dict[str, Any]]:
+        """Return the cached spec of func, None if there is no valid one.
+
+        Args:
+            func: the callable whose spec is looked up
+            delimiter_chars: the delimiter used to parse the func's docstring
+        """
+        key = self._get_key(func, delimiter_chars)
+        if key is None:
+            return None
+        source, spec_key, stamp = key
+        content = self._files.get(source)
+        if content is None:
+            content = self._read(source, stamp)
+            self._files[source] = content
+        if content["stamp"] != stamp:
+            return None
+        return content["specs"].get(spec_key)
+
+    def put(self, func: Callable, delimiter_chars: str, spec: Dict[str, Any]) -> None:
+        """Store the spec of func, it is written to disk by flush.
+
+        Args:
+            func: the callable the spec was computed for
+            delimiter_chars: the delimiter used to parse the func's docstring
+            spec: JSON serializable spec of func
+        """
+        key = self._get_key(func, delimiter_chars)
+        if key is None:
+            return
+        source, spec_key, stamp = key
+        content = self._files.get(source)
+        if content is None or content["stamp"] != stamp:
+            content = self._read(source, stamp)
+            self._files[source] = content
+        content["specs"][spec_key] = spec
+        if not self._dirty:
+            atexit.register(self.flush)
+        self._dirty.add(source)
+
+    def flush(self) -> None:
+        """Write the specs stored since the last flush to disk."""
+        dirty, self._dirty = self._dirty, set()
+        if dirty:
+            atexit.unregister(self.flush)
+        for source in dirty:
+            content = self._files[source]
+            # Merge with what other processes may have written in the meantime
+            merged = self._read(source, content["stamp"])
+            merged["specs"].update(content["specs"])
+            self._files[source] = merged
+            self._write(source, merged)
+
+    def _get_key(self, func: Callable, delimiter_chars: str) -> Optional[tuple]:
+        """Return a 3-tuple (source_path, spec_key, stamp) identifying the spec
+        of func, None if func can not be cached.
+
+        Args:
+            func: the callable whose spec is cached
+            delimiter_chars: the delimiter used to parse the func's docstring
+        """
+        code = getattr(func, "__code__", None)
+        qualname = getattr(func, "__qualname__", "<locals>")
+        # Nested functions do not have a unique name in their module, and a
+        # wrapper has the name of the function it wraps but its own code
+        if code is None or "<locals>" in qualname or hasattr(func, "__wrapped__"):
+            return None
+        try:
+            stat = os.stat(code.co_filename)
+        except OSError:
+            return None
+        spec_key = "%s:%d:%s" % (qualname, code.co_firstlineno, delimiter_chars)
+        return code.co_filename, spec_key, [stat.st_mtime_ns, stat.st_size]
+
+    def _get_cache_path(self, source: str) -> str:
+        # Only imported when the cache is enabled
+        import hashlib
+
+        name = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, "%s.json" % name)
+
+    def _read(self, source: str, stamp: list) -> Dict[str, Any]:
+        """Return the content of the cache file of source, an empty content if
+        the file does not exist, is invalid or stale.
+
+        Args:
+            source: path of the source file
+            stamp: the current [mtime_ns, size] of the source file
+        """
+        import json
+
+        empty: Dict[str, Any] = {
+            "version": _SPEC_VERSION,
+            "source": source,
+            "stamp": stamp,
+            "specs": {},
+        }
+        try:
+            with open(self._get_cache_path(source), encoding="utf-8") as cache_file:
+                content = json.load(cache_file)
+        except (OSError, ValueError) as error:
+            _LOG.debug("No spec cache for '%s': %s", source, error)
+            return empty
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != _SPEC_VERSION
+            or content.get("source") != source
+            or content.get("stamp") != stamp
+            or not isinstance(content.get("specs"), dict)
+        ):
+            _LOG.debug("Spec cache for '%s' is stale", source)
+            return empty
+        return content
+
+    def _write(self, source: str, content: Dict[str, Any]) -> None:
+        """Atomically write content to the cache file of source.
+
+        Args:
+            source: path of the source file
+            content: the cache content to write
+        """
+        import json
+        import tempfile
+
+        tmp_path = None
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(content, tmp_file)
+            os.replace(tmp_path, self._get_cache_path(source))
+        except (OSError, TypeError, ValueError) as error:
+            _LOG.debug("Could not write spec cache for '%s': %s", source, error)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,192 @@
+"""Timing of the phases of a call made with <parser>.call: the construction of
+the parser, the parsing of the command line, the conversion of each argument,
+the creation of the instance of a class and the call itself.
+
+The phases are timed by an observer, see parse_this.phases. The conversions
+are only timed while a call of a parser created with timings=True runs.
+"""
+
+import argparse
+import logging
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from parse_this.instrument import InstrumentationAction, _add_instrumentation_argument
+from parse_this.phases import PARSE, PHASE_LABELS, _observing
+from parse_this.sequences import SequenceAction
+
+_LOG = logging.getLogger(__name__)
+
+# Timings of the call running in the current thread or task, None if the call
+# is not timed
+_CURRENT: ContextVar[Optional["Timings"]] = ContextVar("timings", default=None)
+
+
+class Timings(object):
+    """Durations, in seconds, of the phases of a call made with <parser>.call,
+    stored in <parser>.last_timings.
+
+    Attributes:
+        construction: time taken to build the parser, it is built once so this
+        is not part of total, None if unknown
+        phases: duration of each phase in the order they ran, 'parse', 'init'
+        for the creation of the instance of a class and 'call'
+        conversions: time spent converting the values of each argument, it is
+        part of the 'parse' phase
+        total: duration of the whole call
+    """
+
+    construction: Optional[float]
+    phases: Dict[str, float]
+    conversions: Dict[str, float]
+    total: float
+
+    def __init__(self, construction: Optional[float] = None):
+        self.construction = construction
+        self.phases = {}
+        self.conversions = {}
+        self.total = 0.0
+
+    def format(self) -> str:
+        """Return the table of the timings, one phase per line."""
+        rows = []
+        if self.construction is not None:
+            rows.append(("parser construction (once)", self.construction))
+        for phase, seconds in self.phases.items():
+            rows.append((PHASE_LABELS[phase], seconds))
+            if phase == PARSE:
+                for dest, conversion in self.conversions.items():
+                    rows.append(("  conversion of '%s'" % dest, conversion))
+        rows.append(("total", self.total))
+        width = max(len(label) for label, _ in rows)
+        lines = ["%-*s  %12s" % (width, "phase", "milliseconds")]
+        lines.extend(
+            "%-*s  %12.3f" % (width, label, seconds * 1000) for label, seconds in rows
+        )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return "%s(total=%f, phases=%r)" % (
+            type(self).__name__,
+            self.total,
+            self.phases,
+        )
+
+
+@contextmanager
+def _time_phase(timings: Timings, phase: str) -> Iterator[None]:
+    """Add the duration of the phase to timings.
+
+    Args:
+        timings: the timings of the call
+        phase: name of the phase, see PHASE_LABELS
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] = timings.phases.get(phase, 0.0) + (
+            perf_counter() - start
+        )
+
+
+def _timed_converter(dest: str, convert: Callable) -> Callable:
+    """Return convert, adding the time it takes to the conversions of dest if
+    the call is timed.
+
+    Args:
+        dest: name of the argument convert is the type of
+        convert: callable converting a string to the value of the argument
+    """
+
+    @wraps(convert)
+    def timed(value: str) -> Any:
+        timings = _CURRENT.get()
+        if timings is None:
+            return convert(value)
+        start = perf_counter()
+        try:
+            return convert(value)
+        finally:
+            timings.conversions[dest] = timings.conversions.get(dest, 0.0) + (
+                perf_counter() - start
+            )
+
+    timed.timed = True  # type: ignore[attr-defined]
+    return timed
+
+
+def _time_conversions(parser: argparse.ArgumentParser) -> None:
+    """Time the conversion of the values of the arguments of parser.
+
+    Args:
+        parser: the parser whose argument types are wrapped
+
+    Note:
+        The values of lazy sequence arguments are converted by the call, they
+        are not timed as conversions.
+    """
+    for action in parser._actions:
+        if isinstance(action, SequenceAction):
+            if not action.lazy and not hasattr(action.element_type, "timed"):
+                action.element_type = _timed_converter(action.dest, action.element_type)
+        elif (
+            callable(action.type)
+            and not isinstance(action, InstrumentationAction)
+            and not hasattr(action.type, "timed")
+        ):
+            action.type = _timed_converter(action.dest, action.type)
+
+
+@contextmanager
+def _record_timings(parser: Any, show: bool) -> Iterator[None]:
+    """Time the call, store its timings in parser.last_timings and print them
+    to stderr if show is True and the call succeeded.
+
+    Args:
+        parser: the parser of the call
+        show: whether '--timings' was given
+    """
+    timings = Timings()
+    token = _CURRENT.set(timings)
+    start = perf_counter()
+    try:
+        with _observing(partial(_time_phase, timings)):
+            yield
+    finally:
+        timings.total = perf_counter() - start
+        _CURRENT.reset(token)
+        # Read once the call is done, a lazy parser is built by its first call
+        timings.construction = getattr(parser, "build_seconds", None)
+        parser.last_timings = timings
+    if show:
+        print(timings.format(), file=sys.stderr)
+
+
+def _add_timings_argument(
+    parser: argparse.ArgumentParser, build_seconds: Optional[float] = None
+) -> None:
+    """Add the '--timings' flag to parser, the calls of parser are then timed
+    and their timings stored in parser.last_timings.
+
+    Args:
+        parser: the parser of the callable to time
+        build_seconds: time it took to build parser
+    """
+    parser.build_seconds = build_seconds  # type: ignore[attr-defined]
+    parser.last_timings = None  # type: ignore[attr-defined]
+    _time_conversions(parser)
+    _add_instrumentation_argument(
+        parser,
+        "--timings",
+        partial(_record_timings, parser),
+        always=True,
+        nargs=0,
+        const=True,
+        default=False,
+        help="print how long each phase of the call took",
+    )
@@ -0,0 +1,105 @@
+"""Annotations loading an argument from the path given on the command line.
+
+    - MMap: a read-only mmap.mmap of the file
+    - memoryview: a read-only memoryview of a mmap of the file
+    - bytes: the content of the file
+
+The file is only opened when the command line is parsed. The mappings are
+closed once the call they are passed to returns, the function should copy
+whatever it needs to keep.
+"""
+
+import logging
+import mmap
+from argparse import ArgumentTypeError
+from typing import Any, Callable, Dict, Iterable, NewType
+
+_LOG = logging.getLogger(__name__)
+
+MMap = NewType("MMap", mmap.mmap)
+
+
+def _open_mmap(path: str) -> mmap.mmap:
+    """Return a read-only mapping of the file at path.
+
+    Raises:
+        ArgumentTypeError if the file can not be mapped, e.g. it is empty
+    """
+    try:
+        with open(path, "rb") as mapped_file:
+            return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as error:
+        raise ArgumentTypeError("can't map '%s': %s" % (path, error))
+
+
+def _open_memoryview(path: str) -> memoryview:
+    """Return a read-only memoryview of the mapping of the file at path, an
+    empty memoryview if the file is empty."""
+    try:
+        with open(path, "rb") as mapped_file:
+            if not mapped_file.seek(0, 2):
+                return memoryview(b"")
+    except OSError as error:
+        raise ArgumentTypeError("can't map '%s': %s" % (path, error))
+    return memoryview(_open_mmap(path))
+
+
+def _read_bytes(path: str) -> bytes:
+    """Return the content of the file at path."""
+    try:
+        with open(path, "rb") as read_file:
+            return read_file.read()
+    except OSError as error:
+        raise ArgumentTypeError("can't read '%s': %s" % (path, error))
+
+
+_FILE_CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    MMap: _open_mmap,
+    memoryview: _open_memoryview,
+    bytes: _read_bytes,
+}
+
+# Converters whose result must be released once the call returns
+_MAPPING_CONVERTERS = frozenset([_open_mmap, _open_memoryview])
+
+
+def _is_file_type(arg_type: Any) -> bool:
+    """Return True if arg_type is loaded from a path, see _FILE_CONVERTERS.
+
+    Args:
+        arg_type: the type annotation to inspect
+    """
+    try:
+        return arg_type in _FILE_CONVERTERS
+    except TypeError:
+        # Unhashable annotation
+        return False
+
+
+def _is_file_converter(converter: Any) -> bool:
+    """Return True if converter is the argparse type of a file argument."""
+    return converter in _FILE_CONVERTERS.values()
+
+
+def _release_mappings(values: Iterable[Any]) -> None:
+    """Release the memoryviews and close the mappings created for the
+    arguments of a call.
+
+    Args:
+        values: the mmap.mmap and memoryview arguments of the call
+
+    Note:
+        A mapping still referenced, e.g. by a slice of the memoryview returned
+        by the function, can not be closed: it is left to the garbage
+        collector.
+    """
+    for value in values:
+        mapping = value
+        if isinstance(value, memoryview):
+            mapping = value.obj
+            value.release()
+        if isinstance(mapping, mmap.mmap):
+            try:
+                mapping.close()
+            except BufferError as error:
+                _LOG.debug("Mapping still in use, not closed: %s", error)
@@ -0,0 +1,180 @@
+import asyncio
+import time
+import unittest
+
+from parse_this import CallError, create_parser, parse_class
+from parse_this.call import _run_coroutine
+from parse_this.exception import ParseThisException
+from parse_this.parallel import call_parallel
+from parse_this.parsers import FunctionParser
+from test.helpers import (
+    AsyncCommands,
+    Batchable,
+    NeedInitDecorator,
+    async_concatenate_string,
+    concatenate_string,
+)
+from test.utils import captured_output
+
+
+async def collect(results):
+    return [result async for result in results]
+
+
+async def sleep_and_concatenate(string: str, nb_concat: int):
+    await asyncio.sleep(0)
+    return string * nb_concat
+
+
+class TestSyncCall(unittest.TestCase):
+    def test_function_call_runs_coroutine(self):
+        self.assertEqual(async_concatenate_string.parser.call(args=["a", "2"]), "aa")
+
+    def test_function_parser_runs_coroutine(self):
+        async def sleep_and_double(a: int):
+            await asyncio.sleep(0)
+            return a * 2
+
+        self.assertEqual(FunctionParser()(sleep_and_double, ["2"]), 4)
+
+    def test_class_call_runs_coroutine(self):
+        self.assertEqual(AsyncCommands.parser.call("1 wait-and-add 2".split()), 3)
+
+    def test_call_many_runs_coroutine(self):
+        results = AsyncCommands.parser.call_many(
+            ["1 wait-and-add 2".split(), "1 wait-and-add -- -1".split()]
+        )
+        self.assertEqual(next(results), 3)
+        self.assertIsInstance(next(results).error, ValueError)
+
+    def test_call_parallel_runs_coroutine(self):
+        results = call_parallel(AsyncCommands, ["1 wait-and-add 2".split()])
+        self.assertEqual(list(results), [3])
+        results = call_parallel(async_concatenate_string, [["a", "2"]])
+        self.assertEqual(list(results), ["aa"])
+
+    def test_run_coroutine_without_coroutine(self):
+        self.assertEqual(_run_coroutine(12), 12)
+
+
+class TestAsyncCall(unittest.IsolatedAsyncioTestCase):
+    async def test_call_from_running_loop_returns_coroutine(self):
+        result = async_concatenate_string.parser.call(args=["a", "2"])
+        self.assertTrue(asyncio.iscoroutine(result))
+        self.assertEqual(await result, "aa")
+
+    async def test_function_acall(self):
+        parser = async_concatenate_string.parser
+        self.assertEqual(await parser.acall(args=["a", "3"]), "aaa")
+        self.assertEqual(await concatenate_string.parser.acall(args=["a", "1"]), "a")
+
+    async def test_method_acall(self):
+        parser = AsyncCommands.wait_and_add.parser
+        self.assertEqual(await parser.acall(AsyncCommands(2), ["3"]), 5)
+
+    async def test_acall_on_init(self):
+        with self.assertRaises(ParseThisException):
+            await AsyncCommands.__init__.parser.acall(args=["1"])
+
+    async def test_function_parser_acall(self):
+        parser = FunctionParser()
+        self.assertEqual(await parser.acall(sleep_and_concatenate, ["b", "2"]), "bb")
+
+    async def test_class_acall(self):
+        parser = AsyncCommands.parser
+        self.assertEqual(await parser.acall("1 wait-and-add 2".split()), 3)
+        self.assertEqual(await parser.acall("1 add 2".split()), 3)
+        instance = AsyncCommands(10)
+        self.assertEqual(await parser.acall("0 add 2".split(), instance), 12)
+
+    async def test_class_acall_with_batch(self):
+        with captured_output():
+            with self.assertRaises(SystemExit):
+                await Batchable.parser.acall("1 --batch -".split())
+
+    async def test_class_acall_init_need_decoration(self):
+        with self.assertRaises(ParseThisException):
+            await NeedInitDecorator.parser.acall("do-stuff 12".split())
+
+    async def test_function_acall_many(self):
+        args_list = [[str(i), "2"] for i in range(5)] + [["x"]]
+        results = await collect(async_concatenate_string.parser.acall_many(args_list))
+        self.assertEqual(results[:5], [str(i) * 2 for i in range(5)])
+        self.assertIsInstance(results[5], CallError)
+        self.assertIn("required", results[5].message)
+
+    async def test_method_acall_many(self):
+        parser = AsyncCommands.wait_and_add.parser
+        results = parser.acall_many([["1"], ["-1"]], instance=AsyncCommands(1))
+        results = await collect(results)
+        self.assertEqual(results[0], 2)
+        self.assertIsInstance(results[1].error, ValueError)
+
+    async def test_acall_many_on_init(self):
+        with self.assertRaises(ParseThisException):
+            AsyncCommands.__init__.parser.acall_many([])
+
+    async def test_function_parser_acall_many(self):
+        results = FunctionParser().acall_many(
+            sleep_and_concatenate, [["a", "1"], ["b", "2"]]
+        )
+        self.assertEqual(await collect(results), ["a", "bb"])
+
+    async def test_class_acall_many_overlaps_waits(self):
+        args_list = [["1", "wait-and-add", str(i), "--delay", "0.1"] for i in range(20)]
+        start = time.perf_counter()
+        results = AsyncCommands.parser.acall_many(args_list, concurrency=20)
+        self.assertEqual(await collect(results), list(range(1, 21)))
+        # All the calls wait at the same time instead of one after the other
+        self.assertLess(time.perf_counter() - start, 1)
+
+    async def test_class_acall_many_concurrency(self):
+        running = []
+        max_running = []
+
+        @parse_class()
+        class Tracked(object):
+            @create_parser()
+            def __init__(self):
+                pass
+
+            @create_parser()
+            async def wait(self, b: int):
+                running.append(b)
+                max_running.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(b)
+                return b
+
+        results = Tracked.parser.acall_many(
+            [["wait", str(i)] for i in range(10)], concurrency=3
+        )
+        self.assertEqual(await collect(results), list(range(10)))
+        self.assertEqual(max(max_running), 3)
+
+    async def test_class_acall_many_reuse_instance(self):
+        instance = AsyncCommands(5)
+        results = AsyncCommands.parser.acall_many(
+            [["0", "add", "1"], ["0", "wait-and-add", "2"]], instance=instance
+        )
+        self.assertEqual(await collect(results), [6, 7])
+        results = AsyncCommands.parser.acall_many(
+            [["0", "add", "1"], ["0", "unknown"], ["0", "add", "x"]],
+            reuse_instance=True,
+        )
+        results = await collect(results)
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], CallError)
+        self.assertIsInstance(results[2], CallError)
+
+    async def test_acall_many_stops_pending_calls(self):
+        args_list = [["1", "wait-and-add", str(i), "--delay", "10"] for i in range(4)]
+        results = AsyncCommands.parser.acall_many(
+            [["1", "add", "1"]] + args_list, concurrency=2
+        )
+        self.assertEqual(await anext(results), 2)
+        await results.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from parse_this.cache import CacheInfo, ParserCache
+from test.helpers import parse_me, with_args
+
+
+class TestParserCache(unittest.TestCase):
+    def test_get_missing_entry(self):
+        cache = ParserCache()
+        self.assertIsNone(cache.get(parse_me, ":"))
+        self.assertEqual(cache.info(), CacheInfo(0, 1, 128, 0))
+
+    def test_put_then_get(self):
+        cache = ParserCache()
+        cache.put(parse_me, ":", value="parser")
+        self.assertEqual(cache.get(parse_me, ":"), "parser")
+        self.assertEqual(cache.info(), CacheInfo(1, 0, 128, 1))
+
+    def test_options_are_part_of_the_key(self):
+        cache = ParserCache()
+        cache.put(parse_me, ":", value="parser")
+        self.assertIsNone(cache.get(parse_me, "--"))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ParserCache(maxsize=2)
+        cache.put(parse_me, ":", value=1)
+        cache.put(with_args, ":", value=2)
+        cache.get(parse_me, ":")
+        cache.put(parse_me, "--", value=3)
+        self.assertIsNone(cache.get(with_args, ":"))
+        self.assertEqual(cache.get(parse_me, ":"), 1)
+        self.assertEqual(cache.info().currsize, 2)
+
+    def test_zero_size_disables_cache(self):
+        cache = ParserCache(maxsize=0)
+        cache.put(parse_me, ":", value="parser")
+        self.assertIsNone(cache.get(parse_me, ":"))
+        self.assertEqual(cache.info().currsize, 0)
+
+    def test_stale_on_new_defaults(self):
+        def func(a: int, b: int = 1):
+            return a * b
+
+        cache = ParserCache()
+        cache.put(func, ":", value="parser")
+        func.__defaults__ = (2,)
+        self.assertIsNone(cache.get(func, ":"))
+        self.assertEqual(cache.info().currsize, 0)
+
+    def test_stale_on_new_code(self):
+        def func(a: int):
+            return a
+
+        cache = ParserCache()
+        cache.put(func, ":", value="parser")
+        func.__code__ = (lambda a: a * 2).__code__
+        self.assertIsNone(cache.get(func, ":"))
+
+    def test_stale_on_new_annotations(self):
+        def func(a: int):
+            return a
+
+        cache = ParserCache()
+        cache.put(func, ":", value="parser")
+        func.__annotations__ = {"a": float}
+        self.assertIsNone(cache.get(func, ":"))
+
+    def test_stale_on_new_docstring(self):
+        def func(a: int):
+            """Before."""
+            return a
+
+        cache = ParserCache()
+        cache.put(func, ":", value="parser")
+        self.assertEqual(cache.get(func, ":"), "parser")
+        func.__doc__ = "After."
+        self.assertIsNone(cache.get(func, ":"))
+
+    def test_clear(self):
+        cache = ParserCache()
+        cache.put(parse_me, ":", value="parser")
+        cache.get(parse_me, ":")
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 128, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
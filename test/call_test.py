@@ -1,15 +1,25 @@
 import unittest
-from collections import namedtuple
+from argparse import Namespace
+from unittest.mock import patch
 
 from parse_this.call import (
-    _call,
-    _call_method_from_namespace,
+    CallError,
+    _call_many,
+    _call_from_plan,
+    _CallPlan,
+    _compile_call_plan,
+    _get_call_plan,
+    _get_parser_call_many_method,
     _get_parser_call_method,
 )
 from parse_this.exception import ParseThisException
 from test.helpers import (
+    Overridden,
+    Overriding,
     Parseable,
+    ParseableWithLogLevel,
     concatenate_string,
+    function_with_log_level,
     i_am_parseable,
     parse_me_no_docstring,
 )
@@ -32,28 +42,6 @@ class TestCall(unittest.TestCase):
         call_method = _get_parser_call_method(concatenate_string)
         self.assertEqual(call_method(args="yes 2".split()), "yesyes")
 
-    def test_call_on_parse_me_no_docstring(self):
-        Namespace = namedtuple("Namespace", ["one", "two", "three"])
-        fake_namespace = Namespace(**{"one": 2, "two": 12, "three": 3})
-        self.assertEqual(
-            _call(parse_me_no_docstring, ["one", "two", "three"], fake_namespace),
-            (24, 9),
-        )
-
-    def test_call_method_from_namespace_create_instance(self):
-        Namespace = namedtuple("Namespace", ["a"])
-        fake_namespace = Namespace(a=2)
-        parseable = _call_method_from_namespace(Parseable, "__init__", fake_namespace)
-        self.assertIsInstance(parseable, Parseable)
-        self.assertEqual(parseable._a, 2)
-
-    def test_call_method_from_namespace_execution(self):
-        Namespace = namedtuple("Namespace", ["d"])
-        fake_namespace = Namespace(d=2)
-        self.assertEqual(
-            _call_method_from_namespace(Parseable(12), "parseable", fake_namespace), 24
-        )
-
     def test_get_parser_call_method_preserves_name(self):
         call_method = _get_parser_call_method(concatenate_string)
         self.assertEqual(call_method.__name__, "concatenate_string")
@@ -67,5 +55,137 @@ class TestCall(unittest.TestCase):
         self.assertIs(call_method.__wrapped__, concatenate_string)
 
 
+class TestCallPlan(unittest.TestCase):
+    def test_compile_call_plan(self):
+        plan = _compile_call_plan(i_am_parseable.parser, i_am_parseable)
+        self.assertEqual(
+            plan,
+            _CallPlan(
+                i_am_parseable, ("one", "two", "three"), False, name="i_am_parseable"
+            ),
+        )
+
+    def test_compile_call_plan_with_log_level(self):
+        plan = _compile_call_plan(
+            function_with_log_level.parser, function_with_log_level
+        )
+        self.assertEqual(plan.arg_names, ("string", "nb_concat"))
+        self.assertTrue(plan.log_level)
+
+    def test_compile_call_plan_forced_log_level(self):
+        plan = _compile_call_plan(
+            concatenate_string.parser, concatenate_string, log_level=True
+        )
+        self.assertTrue(plan.log_level)
+
+    def test_get_call_plan_is_stored_on_parser(self):
+        concatenate_string.parser.call(args="yes 2".split())
+        plan = _get_call_plan(concatenate_string.parser, concatenate_string)
+        self.assertIs(concatenate_string.parser.call_plan, plan)
+        self.assertIs(_get_call_plan(concatenate_string.parser, None), plan)
+
+    def test_call_from_plan(self):
+        plan = _CallPlan(parse_me_no_docstring, ("one", "two", "three"), False)
+        namespace = Namespace(one=2, two=12, three=3)
+        self.assertEqual(_call_from_plan(plan, namespace), (24, 9))
+
+    def test_call_from_plan_create_instance(self):
+        plan = _CallPlan(Parseable, ("a",), False, name="__init__")
+        parseable = _call_from_plan(plan, Namespace(a=2))
+        self.assertIsInstance(parseable, Parseable)
+        self.assertEqual(parseable._a, 2)
+
+    def test_call_from_plan_with_instance(self):
+        plan = _CallPlan(Parseable.parseable, ("d",), False, name="parseable")
+        self.assertEqual(_call_from_plan(plan, Namespace(d=2), Parseable(12)), 24)
+
+    def test_subclass_override_is_called(self):
+        self.assertEqual(
+            Overridden.parser.call(["1", "go", "2"], instance=Overriding(5)),
+            ("sub", 5, 2),
+        )
+        self.assertEqual(
+            Overridden.go.parser.call(instance=Overriding(5), args=["2"]),
+            ("sub", 5, 2),
+        )
+        self.assertEqual(
+            list(Overridden.parser.call_many([["1", "go", "2"]], Overriding(5))),
+            [("sub", 5, 2)],
+        )
+        self.assertEqual(Overridden.parser.call(["1", "go", "2"]), ("base", 1, 2))
+
+    @patch("parse_this.call.logging.basicConfig")
+    def test_call_from_plan_with_log_level(self, mock_basic_config):
+        plan = _CallPlan(parse_me_no_docstring, ("one", "two", "three"), True)
+        namespace = Namespace(one=2, two=12, three=3, log_level="INFO")
+        self.assertEqual(_call_from_plan(plan, namespace), (24, 9))
+        mock_basic_config.assert_called_once_with(level="INFO")
+
+    @patch("parse_this.call.logging.basicConfig")
+    def test_class_call_plans_are_stored_on_parser(self, mock_basic_config):
+        self.assertEqual(
+            ParseableWithLogLevel.parser.call("12 parseable 2".split()), 24
+        )
+        call_plans = ParseableWithLogLevel.parser.call_plans
+        self.assertIs(call_plans["__init__"].target, ParseableWithLogLevel)
+        self.assertEqual(call_plans["__init__"].arg_names, ("a",))
+        self.assertEqual(call_plans["parseable"].arg_names, ("d",))
+        self.assertTrue(call_plans["parseable"].log_level)
+        mock_basic_config.assert_called_with(level=None)
+
+
+class TestCallMany(unittest.TestCase):
+    def test_call_many(self):
+        results = _call_many(
+            concatenate_string.parser,
+            [["a", "2"], ["b", "3"]],
+            lambda namespace: namespace.string * namespace.nb_concat,
+        )
+        self.assertEqual(list(results), ["aa", "bbb"])
+
+    def test_call_many_is_lazy(self):
+        calls = []
+        results = _call_many(concatenate_string.parser, [["a", "2"]], calls.append)
+        self.assertEqual(calls, [])
+        next(results)
+        self.assertEqual(len(calls), 1)
+
+    def test_call_many_parse_error(self):
+        results = list(
+            _call_many(
+                concatenate_string.parser,
+                [["a", "not-an-int"], ("b", "2")],
+                lambda namespace: namespace.nb_concat,
+            )
+        )
+        error = results[0]
+        self.assertIsInstance(error, CallError)
+        self.assertEqual(error.args, ["a", "not-an-int"])
+        self.assertIsInstance(error.error, SystemExit)
+        self.assertIn("usage:", error.message)
+        self.assertIn("invalid int value", error.message)
+        self.assertEqual(results[1], 2)
+
+    def test_call_many_call_error(self):
+        def dispatch(namespace):
+            raise ValueError(namespace.string)
+
+        (error,) = _call_many(concatenate_string.parser, [["a", "2"]], dispatch)
+        self.assertIsInstance(error.error, ValueError)
+        self.assertEqual(error.message, "")
+
+    def test_parser_call_many_on_function(self):
+        call_many = _get_parser_call_many_method(concatenate_string)
+        self.assertEqual(list(call_many([["a", "2"], ["b", "1"]])), ["aa", "b"])
+
+    def test_parser_call_many_on_method(self):
+        call_many = _get_parser_call_many_method(Parseable.parseable)
+        self.assertEqual(list(call_many([["2"], ["3"]], Parseable(12))), [24, 36])
+
+    def test_parser_call_many_raise_on_init(self):
+        call_many = _get_parser_call_many_method(Parseable.__init__)
+        self.assertRaises(ParseThisException, call_many, [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,251 @@
+import argparse
+import array
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from collections.abc import Iterable
+from unittest.mock import patch
+
+from parse_this import create_parser, parse_class
+from parse_this.compile import _generate_source, main
+from parse_this.exception import ParseThisException
+from test.helpers import (
+    Batchable,
+    Color,
+    Compilable,
+    NeedInitDecorator,
+    NeedParsing,
+)
+from test.utils import captured_output
+
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmp_dir, "_cli_generated.py")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _compile(self, target):
+        self.assertEqual(main([target, "-o", self.output]), 0)
+        spec = importlib.util.spec_from_file_location("_cli_generated", self.output)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def _assert_same_call(self, parser, generated, args, instance=None):
+        self.assertEqual(
+            generated.call(args.split(), instance), parser.call(args.split(), instance)
+        )
+
+    def test_generated_call(self):
+        generated = self._compile("test.helpers:Compilable")
+        for args in (
+            "2 describe yes",
+            "2 --color GREEN --verbose describe yes --uppercase",
+            "3 paint BLUE 1 2.5 --factor 2",
+            "3 untyped value --name name",
+            "3 toggle",
+            "3 toggle --flag",
+            "3 tag a b --sizes 1 2",
+            "3 tag @%s" % self._write_values("a", "", "b"),
+        ):
+            self._assert_same_call(Compilable.parser, generated, args)
+
+    def test_generated_call_stdin_values(self):
+        generated = self._compile("test.helpers:Compilable")
+        for call in (generated.call, Compilable.parser.call):
+            with patch("sys.stdin", io.StringIO("1\n\n2\n")):
+                self.assertEqual(call("3 tag a --sizes -".split()), (["a"], [1, 2]))
+
+    def test_generated_values_are_taken_as_is_by_default(self):
+        generated = self._compile("test.helpers:Compilable")
+        action = generated._SequenceAction(["--names"], "names")
+        namespace = argparse.Namespace()
+        action(None, namespace, ["-"])
+        self.assertEqual(namespace.names, ["-"])
+
+    def _write_values(self, *values):
+        path = os.path.join(self.tmp_dir, "values.txt")
+        with open(path, "w") as values_file:
+            values_file.write("\n".join(values))
+        return path
+
+    def test_generated_call_with_log_level(self):
+        generated = self._compile("test.helpers:Compilable")
+        with patch("logging.basicConfig") as basic_config:
+            generated.call("2 --log-level DEBUG describe yes".split())
+        basic_config.assert_called_once_with(level="DEBUG")
+
+    def test_generated_call_enum_result(self):
+        generated = self._compile("test.helpers:Compilable")
+        color, _ = generated.call("1 paint RED 1".split())
+        self.assertIs(color, Color.RED)
+
+    def test_generated_call_with_instance(self):
+        generated = self._compile("test.helpers:NeedInitDecorator")
+        instance = NeedInitDecorator(2)
+        self._assert_same_call(
+            NeedInitDecorator.parser, generated, "do-stuff 12 --div 3", instance
+        )
+        with self.assertRaises(ParseThisException):
+            generated.call("do-stuff 12".split())
+
+    def test_generated_help(self):
+        generated = self._compile("test.helpers:NeedParsing")
+        for args in (["-h"], ["12", "could-you-parse-me", "-h"]):
+            with captured_output() as (expected, _):
+                with self.assertRaises(SystemExit):
+                    NeedParsing.parser.parse_args(args)
+            with captured_output() as (actual, _):
+                with self.assertRaises(SystemExit):
+                    generated.build_parser().parse_args(args)
+            self.assertEqual(actual.getvalue(), expected.getvalue())
+
+    def test_generated_errors(self):
+        generated = self._compile("test.helpers:Compilable")
+        for args in (
+            "1 paint PURPLE 1",
+            "1 paint RED one",
+            "one describe yes",
+            "1 describe yes --unknown",
+            "1 tag a --sizes one",
+            "1 tag @does-not-exist",
+            "1 tag a --sizes @%s" % self._write_values("1", "one"),
+        ):
+            with captured_output() as (_, expected):
+                with self.assertRaises(SystemExit):
+                    Compilable.parser.call(args.split())
+            with captured_output() as (_, actual):
+                with self.assertRaises(SystemExit):
+                    generated.call(args.split())
+            self.assertEqual(actual.getvalue(), expected.getvalue())
+
+    def test_generated_lazy_type(self):
+        generated = self._compile("test.helpers:Compilable")
+        convert = generated._lazy_type("decimal:Decimal")
+        self.assertEqual(convert.__name__, "Decimal")
+        self.assertEqual(str(convert("1.5")), "1.5")
+        self.assertEqual(str(convert("2")), "2")
+
+    def test_check_up_to_date(self):
+        self._compile("test.helpers:NeedParsing")
+        self.assertEqual(
+            main(["test.helpers:NeedParsing", "-o", self.output, "--check"]), 0
+        )
+
+    def test_check_out_of_date(self):
+        self._compile("test.helpers:NeedParsing")
+        with open(self.output, "a") as generated:
+            generated.write("# edited\n")
+        with captured_output() as (_, err):
+            self.assertEqual(
+                main(["test.helpers:NeedParsing", "-o", self.output, "--check"]), 1
+            )
+        self.assertIn("out of date", err.getvalue())
+
+    def test_check_missing(self):
+        with captured_output():
+            self.assertEqual(
+                main(["test.helpers:NeedParsing", "-o", self.output, "--check"]), 1
+            )
+
+    def test_not_a_decorated_class(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                main(["test.helpers:Dummy", "-o", self.output])
+        self.assertIn("is not decorated with 'parse_class'", err.getvalue())
+
+    def test_unknown_target(self):
+        with captured_output():
+            with self.assertRaises(SystemExit):
+                main(["test.helpers:DoesNotExist", "-o", self.output])
+
+
+class Local(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class CustomAction(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        pass
+
+
+class TestGenerateUnsupported(unittest.TestCase):
+    def test_local_type(self):
+        class LocalType(object):
+            def __init__(self, value):
+                self.value = value
+
+        @parse_class()
+        class HasLocalType(object):
+            @create_parser()
+            def method(self, a: LocalType):
+                return a
+
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasLocalType, "module:HasLocalType")
+
+    def test_non_literal_default(self):
+        @parse_class()
+        class HasObjectDefault(object):
+            @create_parser()
+            def method(self, a: Local = Local(1)):
+                return a
+
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasObjectDefault, "module:HasObjectDefault")
+
+    def test_unsupported_action(self):
+        @parse_class()
+        class HasCustomAction(object):
+            @create_parser()
+            def method(self, a: int):
+                return a
+
+        HasCustomAction.parser.add_argument("--custom", action=CustomAction)
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasCustomAction, "module:HasCustomAction")
+
+    def test_iterable_is_not_supported(self):
+        @parse_class()
+        class HasIterable(object):
+            @create_parser()
+            def method(self, a: Iterable[int]):
+                return a
+
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasIterable, "module:HasIterable")
+
+    def test_array_is_not_supported(self):
+        @parse_class()
+        class HasArray(object):
+            @create_parser()
+            def method(self, a: array.array):
+                return a
+
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasArray, "module:HasArray")
+
+    def test_file_argument_is_not_supported(self):
+        @parse_class()
+        class HasFile(object):
+            @create_parser()
+            def method(self, a: bytes):
+                return a
+
+        with self.assertRaises(ParseThisException):
+            _generate_source(HasFile, "module:HasFile")
+
+    def test_batch_mode_is_not_supported(self):
+        with self.assertRaises(ParseThisException):
+            _generate_source(Batchable, "test.helpers:Batchable")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+import logging
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from parse_this import create_parser, parse_class
+from parse_this.client import main
+from parse_this.daemon import _CommandServer, _get_exit_code, _StreamWriter
+from parse_this.exception import ParseThisException
+from test.helpers import NeedParsing
+from test.utils import captured_output
+
+_LOG = logging.getLogger(__name__)
+
+
+@parse_class(log_level=True)
+class Served(object):
+    """A class served by the daemon."""
+
+    @create_parser()
+    def __init__(self, a: int = 1):
+        self._a = a
+        self.calls = 0
+
+    @create_parser()
+    def count(self):
+        self.calls += 1
+        return self.calls
+
+    @create_parser()
+    def where(self, name: str):
+        return "%s %s" % (os.getcwd(), os.environ.get(name))
+
+    @create_parser()
+    def talk(self, message: str):
+        print(message)
+        print(message, file=sys.stderr)
+        _LOG.info("logged %s", message)
+
+    @create_parser()
+    def fail(self, reason: str = None):
+        if reason is not None:
+            sys.exit(reason)
+        raise ValueError("failed")
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, "cli.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _start(self, parser, instance=None):
+        server = _CommandServer(self.socket_path, parser, instance)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return server
+
+    def _run(self, *args):
+        with captured_output() as (out, err):
+            code = main([self.socket_path] + list(args))
+        return code, out.getvalue(), err.getvalue()
+
+    def test_call(self):
+        self._start(NeedParsing.parser)
+        self.assertEqual(self._run("12", "multiply-self-arg", "2"), (0, "24\n", ""))
+
+    def test_none_result_is_not_printed(self):
+        self._start(Served.parser)
+        code, out, _ = self._run("talk", "hello")
+        self.assertEqual((code, out), (0, "hello\n"))
+
+    def test_output_streams(self):
+        self._start(Served.parser)
+        self.assertEqual(self._run("talk", "hi"), (0, "hi\n", "hi\n"))
+
+    def test_log_level(self):
+        self._start(Served.parser)
+        handlers = logging.getLogger().handlers[:]
+        code, _, err = self._run("--log-level", "INFO", "talk", "hi")
+        self.assertEqual(code, 0)
+        self.assertIn("logged hi", err)
+        self.assertEqual(logging.getLogger().handlers, handlers)
+        _, _, err = self._run("talk", "hi")
+        self.assertNotIn("logged hi", err)
+
+    def test_warm_instance(self):
+        self._start(Served.parser, Served())
+        self.assertEqual(self._run("count")[1], "1\n")
+        self.assertEqual(self._run("count")[1], "2\n")
+
+    def test_new_instance_per_call(self):
+        self._start(Served.parser)
+        self.assertEqual(self._run("count")[1], "1\n")
+        self.assertEqual(self._run("count")[1], "1\n")
+
+    def test_cwd_and_env(self):
+        self._start(Served.parser)
+        cwd = os.getcwd()
+        with patch.dict(os.environ, {"PARSE_THIS_TEST": "from-client"}):
+            os.chdir(self.tmp_dir)
+            try:
+                code, out, _ = self._run("where", "PARSE_THIS_TEST")
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "%s from-client\n" % os.path.realpath(self.tmp_dir))
+        self.assertNotIn("PARSE_THIS_TEST", os.environ)
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_help(self):
+        self._start(Served.parser)
+        code, out, err = self._run("--help")
+        self.assertEqual(code, 0)
+        self.assertIn("A class served by the daemon.", out)
+        self.assertEqual(err, "")
+
+    def test_parse_error(self):
+        self._start(Served.parser)
+        code, out, err = self._run("where")
+        self.assertEqual(code, 2)
+        self.assertEqual(out, "")
+        self.assertIn("usage:", err)
+        self.assertIn("required: name", err)
+
+    def test_exception(self):
+        self._start(Served.parser)
+        code, _, err = self._run("fail")
+        self.assertEqual(code, 1)
+        self.assertIn("Traceback", err)
+        self.assertIn("ValueError: failed", err)
+
+    def test_system_exit_message(self):
+        self._start(Served.parser)
+        self.assertEqual(self._run("fail", "--reason", "bye"), (1, "", "bye\n"))
+
+    def test_already_serving(self):
+        self._start(Served.parser)
+        with self.assertRaises(ParseThisException):
+            _CommandServer(self.socket_path, Served.parser)
+
+    def test_stale_socket_is_replaced(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.socket_path)
+        self._start(Served.parser)
+        self.assertEqual(self._run("count")[0], 0)
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_socket_is_created_private(self):
+        previous_umask = os.umask(0)
+        try:
+            with patch("os.chmod") as chmod:
+                self._start(Served.parser)
+            self.assertEqual(os.umask(0), 0)
+        finally:
+            os.umask(previous_umask)
+        chmod.assert_not_called()
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_serve(self):
+        with patch.object(
+            _CommandServer, "serve_forever", side_effect=KeyboardInterrupt
+        ):
+            Served.parser.serve(self.socket_path)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_get_exit_code(self):
+        self.assertEqual(_get_exit_code(SystemExit()), 0)
+        self.assertEqual(_get_exit_code(SystemExit(3)), 3)
+
+    def test_stream_writer(self):
+        messages = []
+        writer = _StreamWriter(messages.append, "stdout")
+        self.assertTrue(writer.writable())
+        self.assertEqual(writer.write(""), 0)
+        self.assertEqual(messages, [])
+
+
+class TestClient(unittest.TestCase):
+    def test_usage(self):
+        with captured_output() as (_, err):
+            self.assertEqual(main([]), 2)
+        self.assertIn("usage:", err.getvalue())
+
+    def test_no_server(self):
+        with captured_output() as (_, err):
+            self.assertEqual(main(["/nonexistent/cli.sock"]), 1)
+        self.assertIn("Can not connect", err.getvalue())
+
+    def test_connection_closed(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        socket_path = os.path.join(tmp_dir, "cli.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+
+            def close_connection():
+                connection, _ = server.accept()
+                connection.recv(4096)
+                connection.close()
+
+            thread = threading.Thread(target=close_connection)
+            thread.start()
+            with captured_output() as (_, err):
+                self.assertEqual(main([socket_path, "count"]), 1)
+            thread.join()
+        self.assertIn("Connection closed", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
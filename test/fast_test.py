@@ -0,0 +1,222 @@
+import argparse
+import random
+from argparse import ArgumentParser
+import unittest
+
+from parse_this import create_parser, parse_class
+from parse_this.fast import FastArgumentParser, _compile_fast_spec
+from parse_this.parsers import (
+    FastSubcommandAwareArgumentParser,
+    SubcommandAwareArgumentParser,
+)
+from test.helpers import Color
+from test.utils import captured_output
+
+
+@create_parser(fast=True, log_level=True)
+def scalars(
+    count: int,
+    name: str,
+    ratio: float,
+    color: Color,
+    strict: bool,
+    limit: int = 10,
+    label: str = "default",
+    verbose: bool = False,
+    quiet: bool = True,
+    tint: Color = Color.RED,
+    scale: float = None,
+):
+    return count
+
+
+@parse_class(fast=True, log_level=True)
+class FastCommands(object):
+    @create_parser()
+    def __init__(self, base: int, color: Color = Color.RED, verbose: bool = False):
+        self._base = base
+
+    @create_parser()
+    def add(self, value: int, times: int = 1):
+        return self._base + value * times
+
+    @create_parser(name="paint")
+    def paint_it(self, color: Color, base: int = 0, glossy: bool = False):
+        return color
+
+    @create_parser()
+    def noop(self):
+        return None
+
+
+_VALUES = ["0", "12", "-3", "1.5", "-.5", "abc", "", "-", "RED", "BLUE", "PURPLE"]
+_NOISE = ["--", "-h", "--help", "--unknown", "-x", "--lim", "--limit=3", "-1x", "a b"]
+
+
+def _argparse_result(parse, args):
+    """Return the 2-tuple ('ok', values) or ('error', exit code) of parse."""
+    with captured_output():
+        try:
+            return "ok", vars(parse(args))
+        except SystemExit as error:
+            return "error", error.code
+
+
+class TestFastEquivalence(unittest.TestCase):
+    def _assert_equivalent(self, parser, argparse_parse, args_list):
+        fast_hits = 0
+        for args in args_list:
+            expected = _argparse_result(argparse_parse, args)
+            namespace = parser.fast_parse(args)
+            if namespace is not None:
+                fast_hits += 1
+                self.assertEqual(("ok", vars(namespace)), expected, args)
+            self.assertEqual(_argparse_result(parser.parse_args, args), expected, args)
+        return fast_hits
+
+    def _random_args(self, rng, options):
+        tokens = _VALUES + _NOISE + options
+        return [rng.choice(tokens) for _ in range(rng.randint(0, 7))]
+
+    def test_function_random_inputs(self):
+        parser = scalars.parser
+        options = [s for a in parser._actions for s in a.option_strings]
+        rng = random.Random(42)
+        args_list = [self._random_args(rng, options) for _ in range(1000)]
+        self._assert_equivalent(
+            parser, lambda args: ArgumentParser.parse_args(parser, args), args_list
+        )
+
+    def test_function_valid_inputs(self):
+        parser = scalars.parser
+        rng = random.Random(7)
+        args_list = []
+        for _ in range(1000):
+            positionals = [
+                str(rng.randint(-5, 5)),
+                rng.choice(["x", "-", "", "-2"]),
+                rng.choice(["1", "-0.5", "2e3"]),
+                rng.choice(["RED", "GREEN", "BLUE"]),
+            ]
+            options = rng.sample(
+                [
+                    ["--limit", str(rng.randint(-9, 9))],
+                    ["--label", rng.choice(["a", "-1", ""])],
+                    ["--verbose"],
+                    ["--quiet"],
+                    ["--strict"],
+                    ["--tint", rng.choice(["RED", "BLUE"])],
+                    ["--scale", "-.25"],
+                    ["--log-level", rng.choice(["INFO", "DEBUG"])],
+                ],
+                rng.randint(0, 4),
+            )
+            # Options are interleaved with the positionals, kept in order
+            units = [[value] for value in positionals]
+            for option in options:
+                units.insert(rng.randint(0, len(units)), option)
+            args = [token for unit in units for token in unit]
+            args_list.append(args)
+        fast_hits = self._assert_equivalent(
+            parser, lambda args: ArgumentParser.parse_args(parser, args), args_list
+        )
+        self.assertEqual(fast_hits, len(args_list))
+
+    def test_class_random_inputs(self):
+        parser = FastCommands.parser
+        options = ["--color", "--verbose", "--log-level", "INFO", "add", "paint"]
+        options += ["noop", "--times", "--base", "--glossy", "GREEN", "-h"]
+        rng = random.Random(3)
+        args_list = [self._random_args(rng, options) for _ in range(1000)]
+        args_list += [
+            "12 add 3".split(),
+            "12 --color BLUE add 3 --times 2".split(),
+            "--verbose 12 --log-level INFO paint GREEN --base -2 --glossy".split(),
+            "12 paint GREEN --color BLUE".split(),
+            "12 noop".split(),
+            ["12"],
+        ]
+        fast_hits = self._assert_equivalent(
+            parser,
+            lambda args: SubcommandAwareArgumentParser.parse_args(parser, args),
+            args_list,
+        )
+        self.assertGreater(fast_hits, 0)
+
+
+class TestFastArgumentParser(unittest.TestCase):
+    def test_parser_classes(self):
+        self.assertIsInstance(scalars.parser, FastArgumentParser)
+        self.assertIsInstance(FastCommands.parser, FastSubcommandAwareArgumentParser)
+        sub_parsers = FastCommands.parser._subparsers_action.choices
+        self.assertIsInstance(sub_parsers["add"], FastArgumentParser)
+
+    def test_call(self):
+        self.assertEqual(FastCommands.parser.call("2 add 3 --times 2".split()), 8)
+        self.assertEqual(scalars.parser.call(args="1 a 2 RED".split()), 1)
+
+    def test_fast_path_values(self):
+        namespace = FastCommands.parser.fast_parse("2 --color BLUE add 3".split())
+        self.assertEqual(namespace.color, Color.BLUE)
+        self.assertEqual(namespace.method, "add")
+        self.assertEqual(namespace.times, 1)
+
+    def test_unsupported_arguments(self):
+        parser = FastArgumentParser()
+        parser.add_argument("values", nargs="+")
+        self.assertIsNone(_compile_fast_spec(parser))
+        self.assertIsNone(parser.fast_parse(["a"]))
+        self.assertEqual(parser.parse_args(["a", "b"]).values, ["a", "b"])
+
+    def test_unsupported_parsers(self):
+        parser = FastArgumentParser(fromfile_prefix_chars="@")
+        self.assertIsNone(_compile_fast_spec(parser))
+        parser = FastArgumentParser()
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--a", action="store_true")
+        self.assertIsNone(_compile_fast_spec(parser))
+        parser = FastArgumentParser()
+        parser.add_subparsers(dest="command")
+        parser.add_argument("last")
+        self.assertIsNone(_compile_fast_spec(parser))
+
+    def test_required_option_and_sub_command(self):
+        parser = FastArgumentParser()
+        parser.add_argument("--name", required=True)
+        self.assertIsNone(parser.fast_parse([]))
+        self.assertEqual(parser.fast_parse(["--name", "a"]).name, "a")
+        parser = FastArgumentParser()
+        sub_parsers = parser.add_subparsers(dest="command", required=True)
+        sub_parsers.add_parser("run")
+        self.assertIsNone(parser.fast_parse([]))
+        self.assertEqual(parser.fast_parse(["run"]).command, "run")
+
+    def test_sub_parser_without_fast_path(self):
+        parser = FastArgumentParser()
+        sub_parsers = parser.add_subparsers(
+            dest="command", parser_class=argparse.ArgumentParser
+        )
+        sub_parsers.add_parser("run")
+        self.assertIsNone(parser.fast_parse(["run"]))
+        self.assertEqual(parser.parse_args(["run"]).command, "run")
+
+    def test_string_default_is_converted(self):
+        parser = FastArgumentParser()
+        parser.add_argument("--count", type=int, default="3")
+        self.assertEqual(parser.fast_parse([]).count, 3)
+
+    def test_spec_is_updated_with_new_arguments(self):
+        parser = FastArgumentParser()
+        parser.add_argument("a")
+        self.assertEqual(vars(parser.fast_parse(["1"])), {"a": "1"})
+        parser.add_argument("--b", default="x")
+        self.assertEqual(vars(parser.fast_parse(["1"])), {"a": "1", "b": "x"})
+
+    def test_sys_argv_uses_argparse(self):
+        parser = FastArgumentParser(prog="prog")
+        namespace = argparse.Namespace(existing=1)
+        self.assertEqual(parser.parse_args([], namespace).existing, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,23 @@
 import unittest
 
-from parse_this.help.description import _get_default_help_message, prepare_doc
+from parse_this.help.description import (
+    _get_arg_doc_regex,
+    _get_default_help_message,
+    _parse_docstring,
+    prepare_doc,
+)
 from test.helpers import (
     Parseable,
     ParseableWithPrivateMethod,
     blank_line_in_wrong_place,
     different_delimiter_chars,
+    google_sections_docstring,
     multiline_docstring,
     no_docstring,
+    numpy_docstring,
     parse_me_full_docstring,
     parse_me_no_docstring,
+    sphinx_docstring,
     with_args,
 )
 from test.utils import captured_output
@@ -96,6 +104,67 @@ class TestHelp(unittest.TestCase):
             },
         )
 
+    def test_prepare_doc_numpy(self):
+        description, help_msg = prepare_doc(
+            numpy_docstring, ["one", "two", "three"], ":"
+        )
+        self.assertEqual(description, "I am documented the NumPy way.")
+        self.assertEqual(
+            help_msg,
+            {
+                "one": "the first one, on two lines",
+                "two": "both share this help",
+                "three": "both share this help",
+            },
+        )
+
+    def test_prepare_doc_sphinx(self):
+        description, help_msg = prepare_doc(
+            sphinx_docstring, ["one", "two", "three"], ":"
+        )
+        self.assertEqual(description, "I am documented the Sphinx way.")
+        self.assertEqual(
+            help_msg,
+            {
+                "one": "the first one on two lines",
+                "two": "typed in the field",
+                "three": "Help message for three",
+            },
+        )
+
+    def test_prepare_doc_google_sections(self):
+        _, help_msg = prepare_doc(google_sections_docstring, ["one", "two"], ":")
+        self.assertEqual(
+            help_msg, {"one": "the first one", "two": "Help message for two"}
+        )
+
+    def test_prepare_doc_description_ends_at_sphinx_field(self):
+        description, help_msg = _parse_docstring("Short.\n:param one: help", ":")
+        self.assertEqual(description, "Short.")
+        self.assertEqual(help_msg, (("one", "help"),))
+
+    def test_prepare_doc_is_cached(self):
+        _parse_docstring.cache_clear()
+        prepare_doc(parse_me_full_docstring, ["one", "two", "three"], ":")
+        _, help_msg = prepare_doc(parse_me_full_docstring, ["one", "two"], ":")
+        self.assertEqual(_parse_docstring.cache_info().hits, 1)
+        # The default help messages are not added to the cached result
+        self.assertNotIn("three", prepare_doc(parse_me_full_docstring, [], "--")[1])
+        help_msg["one"] = "changed"
+        _, help_msg = prepare_doc(parse_me_full_docstring, ["one"], ":")
+        self.assertEqual(help_msg["one"], "some stuff shouldn't be written down")
+
+    def test_arg_doc_regex_is_shared(self):
+        self.assertIs(_get_arg_doc_regex("--"), _get_arg_doc_regex("--"))
+
+    def test_prepare_doc_long_docstring(self):
+        lines = ["Long.", "", "Args:"]
+        lines += ["    arg%d: help %d" % (i, i) for i in range(2000)]
+        lines += ["        more help"] * 2000
+        _, help_msg = _parse_docstring("\n".join(lines), ":")
+        self.assertEqual(len(help_msg), 2000)
+        self.assertEqual(len(help_msg[-1][1].split("more help")), 2001)
+
 
 class TestFullHelpAction(unittest.TestCase):
     def test_help_is_complete(self):
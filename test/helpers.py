@@ -1,6 +1,12 @@
+import array
+import asyncio
 import enum
+import time
+from collections.abc import Iterable, Iterator
+from typing import Annotated
 
 from parse_this import create_parser, parse_class
+from parse_this.types import MMap
 
 
 class Color(enum.Enum):
@@ -9,6 +15,12 @@ class Color(enum.Enum):
     BLUE = 3
 
 
+# Members are generated so mypy can not know them, they are looked up by name
+Region = enum.Enum(  # type: ignore[misc]
+    "Region", ["R%d" % index for index in range(10000)]
+)
+
+
 def no_docstring():
     pass
 
@@ -77,6 +89,50 @@ def different_delimiter_chars(one: int, two: int, three: int):
     return one * two, three * three
 
 
+def numpy_docstring(one: int, two: int, three: int = 12):
+    """I am documented the NumPy way.
+
+    Parameters
+    ----------
+    one : int
+        the first one,
+        on two lines
+
+    two, three : int
+        both share this help
+
+    Returns
+    -------
+    int
+        the product, not an argument
+    """
+    return one * two * three
+
+
+def sphinx_docstring(one: int, two: int, three: int = 12):
+    """I am documented the Sphinx way.
+
+    :param one: the first one
+        on two lines
+    :type one: int
+    :param int two: typed in the field
+    :param three:
+    :returns: not an argument
+    """
+    return one * two * three
+
+
+def google_sections_docstring(one: int, two: int):
+    """I have sections without blank lines.
+
+    Args:
+        one: the first one
+    Returns:
+        two: this is not an argument
+    """
+    return one * two
+
+
 def parse_me(one: str, two: int, three: int = 12):
     """Could use some parsing.
 
@@ -294,6 +350,11 @@ def has_enum_default(a: int, color: Color = Color.RED):
 
 
 @create_parser()
+def has_large_enum_argument(region: Region, other: Region = Region["R1"]):
+    return region, other
+
+
+@create_parser(value_files=True)
 def has_list_argument(values: list[int]):
     """Sum a list of values.
 
@@ -303,7 +364,7 @@ def has_list_argument(values: list[int]):
     return sum(values)
 
 
-@create_parser()
+@create_parser(value_files=True)
 def has_optional_list_argument(name: str, tags: list[str] = None):
     """Tag something.
 
@@ -314,6 +375,65 @@ def has_optional_list_argument(name: str, tags: list[str] = None):
     return name, tags
 
 
+@create_parser(value_files=True)
+def has_iterable_argument(values: Iterable[int], scale: int = 1):
+    """Lazily scale values.
+
+    Args:
+        values: integers to scale
+        scale: multiplies each value
+    """
+    return values, scale
+
+
+@create_parser(value_files=True)
+def has_iterator_argument(first: int, names: Iterator[int] = None):
+    return [next(names) for _ in range(first)] if names else []
+
+
+@create_parser(value_files=True)
+def has_array_argument(values: array.array, small: Annotated[array.array, "b"] = None):
+    return values, small
+
+
+@create_parser(typed_arrays=True)
+def has_typed_list_arguments(
+    ints: list[int], floats: tuple[float, ...] = None, names: list[str] = None
+):
+    return ints, floats, names
+
+
+@create_parser()
+def has_file_arguments(mapped: MMap, view: memoryview, content: bytes = None):
+    """Load files.
+
+    Args:
+        mapped: mapped file
+        view: viewed file
+        content: read file
+    """
+    return mapped, view, bytes(view[:3]), content
+
+
+@create_parser()
+async def has_async_file_argument(mapped: MMap):
+    await asyncio.sleep(0)
+    return mapped, mapped.closed
+
+
+@parse_class()
+class MappedFile(object):
+    """A class keeping the file it is created with mapped."""
+
+    @create_parser()
+    def __init__(self, mapped: MMap):
+        self._mapped = mapped
+
+    @create_parser()
+    def head(self, size: int):
+        return self._mapped[:size]
+
+
 @create_parser()
 def has_tuple_argument(coords: tuple[float, ...]):
     """Process coordinates.
@@ -376,3 +496,307 @@ class ParseMyInitOnly(object):
     @create_parser()
     def __init__(self):
         pass
+
+
+@create_parser(lazy=True)
+def lazy_concatenate_string(string: str, nb_concat: int = 2):
+    """Concatenate a string with itself.
+
+    Args:
+        string: the string to concatenate
+        nb_concat: number of times the string is concatenated
+    """
+    return string * nb_concat
+
+
+@parse_class()
+class LazyMethods(object):
+    """A class whose methods' parsers are lazily created."""
+
+    @create_parser(lazy=True)
+    def __init__(self, a: int):
+        self._a = a
+
+    @create_parser(lazy=True, name="times")
+    def multiply(self, b: int):
+        return self._a * b
+
+
+@parse_class(lazy=True)
+class LazyCommands(object):
+    """A class whose sub-commands are lazily created."""
+
+    @create_parser(lazy=True)
+    def __init__(self, a: int):
+        self._a = a
+
+    @create_parser(lazy=True)
+    def add_to(self, b: int):
+        """Add to a.
+
+        Args:
+            b: added to a
+        """
+        return self._a + b
+
+    @create_parser(lazy=True)
+    def multiply_by(self, b: int):
+        """Multiply a.
+
+        Args:
+            b: multiplied by a
+        """
+        return self._a * b
+
+
+@parse_class(log_level=True)
+class Compilable(object):
+    """A class exercising every kind of argument."""
+
+    @create_parser()
+    def __init__(self, base: int, color: Color = Color.RED, verbose: bool = False):
+        """Init.
+
+        Args:
+            base: the base value
+            color: the color of the base
+            verbose: be verbose
+        """
+        self._base = base
+        self._color = color
+        self._verbose = verbose
+
+    @create_parser()
+    def describe(self, suffix: str, uppercase: bool = False):
+        """Describe the instance.
+
+        Args:
+            suffix: appended to the description
+            uppercase: upper case the description
+        """
+        description = "%s %s %s %s" % (self._base, self._color, self._verbose, suffix)
+        return description.upper() if uppercase else description
+
+    @create_parser()
+    def paint(self, color: Color, values: list[float], factor: float = 1.5):
+        return color, [value * factor * self._base for value in values]
+
+    @create_parser(value_files=True)
+    def tag(self, names: list[str], sizes: list[int] = None):
+        return names, sizes
+
+    @create_parser(log_level=True)
+    def untyped(self, value, name: str = None):
+        return value, name
+
+    @create_parser()
+    def toggle(self, flag: bool):
+        return flag
+
+
+@parse_class(batch=True, log_level=True)
+class Batchable(object):
+    """A class whose commands can be read from a file."""
+
+    @create_parser()
+    def __init__(self, a: int):
+        self._a = a
+        self._total = 0
+
+    @create_parser()
+    def add(self, b: int):
+        """Add to the running total.
+
+        Args:
+            b: added to the total
+        """
+        self._total += self._a * b
+        return self._total
+
+    @create_parser()
+    def divide(self, b: int, label: str = "result"):
+        """Divide the running total.
+
+        Args:
+            b: the total is divided by b
+            label: prefix of the result
+        """
+        return "%s %s" % (label, self._total // b)
+
+    @create_parser()
+    def reset(self):
+        """Set the running total back to 0."""
+        self._total = 0
+
+
+@create_parser()
+async def async_concatenate_string(string: str, nb_concat: int):
+    await asyncio.sleep(0)
+    return string * nb_concat
+
+
+@parse_class()
+class AsyncCommands(object):
+    """A class with coroutine methods."""
+
+    @create_parser()
+    def __init__(self, a: int):
+        self._a = a
+
+    @create_parser()
+    async def wait_and_add(self, b: int, delay: float = 0):
+        await asyncio.sleep(delay)
+        if b < 0:
+            raise ValueError(b)
+        return self._a + b
+
+    @create_parser()
+    def add(self, b: int):
+        return self._a + b
+
+
+@create_parser(profile=True)
+def profiled(a: int, b: int = 2):
+    """Multiply a by b.
+
+    Args:
+        a: multiplied by b
+        b: multiplies a
+    """
+    return a * b
+
+
+@parse_class(profile=True)
+class Profiled(object):
+    """Profile me."""
+
+    @create_parser()
+    def __init__(self, base: int):
+        self._base = base
+
+    @create_parser()
+    def add(self, value: int):
+        return self._base + value
+
+
+@create_parser(timings=True)
+def timed(a: int, values: list[float] = None):
+    """Add the values to a.
+
+    Args:
+        a: the value to add the values to
+        values: the values to add
+    """
+    if a < 0:
+        raise ValueError(a)
+    return a + sum(values or [])
+
+
+@parse_class(timings=True)
+class Timed(object):
+    """Time me."""
+
+    @create_parser()
+    def __init__(self, base: int):
+        self._base = base
+
+    @create_parser()
+    def add(self, value: int):
+        return self._base + value
+
+
+@create_parser(rusage=True)
+def allocate(size: int):
+    """Allocate size bytes.
+
+    Args:
+        size: number of bytes to allocate
+    """
+    return len(bytearray(size))
+
+
+@parse_class(rusage=True)
+class Measured(object):
+    """Measure me."""
+
+    @create_parser()
+    def __init__(self, size: int):
+        self._size = size
+
+    @create_parser()
+    def allocate(self):
+        return len(bytearray(self._size))
+
+
+@create_parser(trace_memory=True)
+def repeat(values: list[int], times: int = 1):
+    """Repeat the values.
+
+    Args:
+        values: the values to repeat
+        times: number of times the values are repeated
+    """
+    return values * times
+
+
+@parse_class(trace_memory=True)
+class Repeater(object):
+    """Trace me."""
+
+    @create_parser()
+    def __init__(self, times: int):
+        self._times = times
+
+    @create_parser()
+    def repeat(self, value: str):
+        return len(value * self._times)
+
+
+def _spin(seconds: float) -> int:
+    """Keep the thread busy for seconds, return the number of iterations."""
+    iterations = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        iterations += 1
+    return iterations
+
+
+@create_parser(sample_profile=True)
+def spin(seconds: float):
+    """Keep busy.
+
+    Args:
+        seconds: how long to keep busy
+    """
+    return _spin(seconds) > 0
+
+
+@parse_class(sample_profile=True)
+class Spinner(object):
+    """Sample me."""
+
+    @create_parser()
+    def __init__(self, seconds: float):
+        self._seconds = seconds
+
+    @create_parser()
+    def spin(self):
+        return _spin(self._seconds) > 0
+
+
+@parse_class()
+class Overridden(object):
+    @create_parser()
+    def __init__(self, a: int):
+        self._a = a
+
+    @create_parser()
+    def go(self, b: int):
+        return "base", self._a, b
+
+
+@parse_class()
+class Overriding(Overridden):
+    @create_parser()
+    def go(self, b: int):
+        return "sub", self._a, b
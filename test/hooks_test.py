@@ -0,0 +1,289 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parse_this import parse_this
+from parse_this.exception import ParseThisException
+from parse_this.hooks import (
+    _RECORD_ENV,
+    ON_CALL_END,
+    ON_CALL_START,
+    ON_ERROR,
+    ON_PARSE_END,
+    ON_PARSE_START,
+    InvocationRecorder,
+    MetricsExporter,
+    _escape_label,
+    _install_env_recorder,
+    _unescape_label,
+    add_hook,
+    remove_hook,
+)
+from test.helpers import (
+    Batchable,
+    Parseable,
+    concatenate_string,
+    parse_me_no_docstring,
+)
+from test.utils import captured_output
+
+_EVENTS = (ON_PARSE_START, ON_PARSE_END, ON_CALL_START, ON_CALL_END, ON_ERROR)
+
+
+class TestHooks(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.callbacks = {}
+        for event in _EVENTS:
+            self.callbacks[event] = lambda hook_event, event=event: self.events.append(
+                (event, hook_event)
+            )
+            add_hook(event, self.callbacks[event])
+
+    def tearDown(self):
+        for event, callback in self.callbacks.items():
+            remove_hook(event, callback)
+
+    def _get_names(self):
+        return [(event, hook_event.command) for event, hook_event in self.events]
+
+    def test_method_call(self):
+        self.assertEqual(concatenate_string.parser.call(args=["a", "2"]), "aa")
+        self.assertEqual(
+            self._get_names(),
+            [(event, "concatenate_string") for event in _EVENTS[:-1]],
+        )
+        parse_start, parse_end, call_start, call_end = (
+            hook_event for _, hook_event in self.events
+        )
+        self.assertEqual(parse_start.arguments, {})
+        self.assertIsNone(parse_start.seconds)
+        self.assertEqual(parse_end.arguments, {"string": "a", "nb_concat": 2})
+        self.assertGreater(parse_end.seconds, 0)
+        self.assertIsNone(call_start.seconds)
+        self.assertGreater(call_end.seconds, 0)
+        self.assertIsNone(call_end.error)
+        self.assertEqual(call_end.argv, ("a", "2"))
+        self.assertGreaterEqual(call_end.started, parse_start.started)
+
+    def test_function_call(self):
+        parse_this(parse_me_no_docstring, ["1", "2", "3"])
+        self.assertEqual(
+            self._get_names(),
+            [(event, "parse_me_no_docstring") for event in _EVENTS[:-1]],
+        )
+
+    def test_class_call(self):
+        self.assertEqual(Parseable.parser.call(["2", "parseable", "3"]), 6)
+        self.assertEqual(
+            self._get_names(),
+            [
+                (ON_PARSE_START, "Parseable"),
+                (ON_PARSE_END, "Parseable.parseable"),
+                (ON_CALL_START, "Parseable.parseable"),
+                (ON_CALL_END, "Parseable.parseable"),
+            ],
+        )
+
+    def test_call_error(self):
+        with self.assertRaises(AttributeError):
+            concatenate_string.parser.call(args=["a", "2"], instance=object())
+        self.assertEqual(
+            [event for event, _ in self.events],
+            [ON_PARSE_START, ON_PARSE_END, ON_CALL_START, ON_ERROR],
+        )
+        error = self.events[-1][1]
+        self.assertIsInstance(error.error, AttributeError)
+        self.assertGreater(error.seconds, 0)
+
+    def test_parse_error(self):
+        with captured_output():
+            with self.assertRaises(SystemExit):
+                concatenate_string.parser.call(args=["a", "two"])
+        self.assertEqual(
+            [event for event, _ in self.events], [ON_PARSE_START, ON_ERROR]
+        )
+        self.assertEqual(self.events[-1][1].error.code, 2)
+
+    def test_help_is_not_an_error(self):
+        with captured_output():
+            with self.assertRaises(SystemExit):
+                concatenate_string.parser.call(args=["--help"])
+        self.assertEqual([event for event, _ in self.events], [ON_PARSE_START])
+
+    def test_failing_hook_is_ignored(self):
+        def fail(hook_event):
+            raise RuntimeError("hook")
+
+        add_hook(ON_CALL_END, fail)
+        try:
+            self.assertEqual(concatenate_string.parser.call(args=["a", "2"]), "aa")
+        finally:
+            remove_hook(ON_CALL_END, fail)
+        self.assertEqual(len(self.events), 4)
+
+    def test_unknown_event(self):
+        with self.assertRaises(ParseThisException):
+            add_hook("on_anything", print)
+        remove_hook("on_anything", print)
+
+
+class TestMetricsExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "metrics")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _run_commands(self, exporter):
+        exporter.install()
+        try:
+            concatenate_string.parser.call(args=["a", "2"])
+            Parseable.parser.call(["2", "parseable", "3"])
+            with self.assertRaises(AttributeError):
+                concatenate_string.parser.call(args=["a", "2"], instance=object())
+        finally:
+            exporter.uninstall()
+        # Not exported anymore
+        concatenate_string.parser.call(args=["a", "2"])
+
+    def test_jsonl(self):
+        self._run_commands(MetricsExporter(self.path))
+        with open(self.path) as metrics:
+            records = [json.loads(line) for line in metrics]
+        self.assertEqual(
+            [(record["command"], record["status"]) for record in records],
+            [
+                ("concatenate_string", "ok"),
+                ("Parseable.parseable", "ok"),
+                ("concatenate_string", "error"),
+            ],
+        )
+        self.assertIsNone(records[0]["error"])
+        self.assertIn("AttributeError", records[2]["error"])
+
+    def test_prometheus(self):
+        exporter = MetricsExporter(self.path, format="prometheus")
+        self._run_commands(exporter)
+        # The counters accumulate over the exporters, e.g. over processes
+        self._run_commands(exporter)
+        with open(self.path) as metrics:
+            lines = metrics.read().splitlines()
+        self.assertIn("# TYPE parse_this_commands_total counter", lines)
+        self.assertIn(
+            'parse_this_commands_total{command="concatenate_string"} 4.0', lines
+        )
+        self.assertIn(
+            'parse_this_command_errors_total{command="concatenate_string"} 2.0', lines
+        )
+        self.assertIn(
+            'parse_this_command_errors_total{command="Parseable.parseable"} 0.0', lines
+        )
+        self.assertTrue(
+            any(line.startswith("parse_this_command_seconds_total{") for line in lines)
+        )
+
+    def test_batch(self):
+        batch_path = os.path.join(self.tmp_dir, "commands.txt")
+        exporter = MetricsExporter(self.path).install()
+        try:
+            for commands, code in (("add 1\nadd 2\n", 0), ("add x\n", 1)):
+                with open(batch_path, "w") as batch_file:
+                    batch_file.write(commands)
+                with captured_output():
+                    with self.assertRaises(SystemExit) as context:
+                        Batchable.parser.call(["2", "--batch", batch_path])
+                self.assertEqual(context.exception.code, code)
+        finally:
+            exporter.uninstall()
+        with open(self.path) as metrics:
+            records = [json.loads(line) for line in metrics]
+        self.assertEqual(
+            [(record["command"], record["status"]) for record in records],
+            [("Batchable", "ok"), ("Batchable", "error")],
+        )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ParseThisException):
+            MetricsExporter(self.path, format="csv")
+
+    def test_label_escaping(self):
+        label = 'a "b"\\c\nd'
+        self.assertEqual(_escape_label(label), 'a \\"b\\"\\\\c\\nd')
+        self.assertEqual(_unescape_label(_escape_label(label)), label)
+
+
+class TestInvocationRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "invocations.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_records(self):
+        with open(self.path) as invocations:
+            return [json.loads(line) for line in invocations]
+
+    def test_record(self):
+        recorder = InvocationRecorder(self.path).install()
+        try:
+            Parseable.parser.call(["2", "parseable", "3"])
+            with captured_output():
+                with self.assertRaises(SystemExit):
+                    Parseable.parser.call(["2", "parseable", "three"])
+        finally:
+            recorder.uninstall()
+        concatenate_string.parser.call(args=["a", "2"])
+        records = self._read_records()
+        self.assertEqual(
+            [
+                (record["argv"], record["command"], record["status"])
+                for record in records
+            ],
+            [
+                (["2", "parseable", "3"], "Parseable.parseable", "ok"),
+                (["2", "parseable", "three"], "Parseable", "error"),
+            ],
+        )
+        self.assertGreater(records[0]["seconds"], 0)
+        self.assertIsNone(records[0]["error"])
+        self.assertEqual(records[1]["error"], "SystemExit(2)")
+
+    def test_record_batch(self):
+        batch_path = os.path.join(self.tmp_dir, "commands.txt")
+        with open(batch_path, "w") as batch_file:
+            batch_file.write("add 1\nadd 2\n")
+        recorder = InvocationRecorder(self.path).install()
+        try:
+            with captured_output() as (out, _):
+                with self.assertRaises(SystemExit) as context:
+                    Batchable.parser.call(["2", "--batch", batch_path])
+        finally:
+            recorder.uninstall()
+        self.assertEqual(context.exception.code, 0)
+        self.assertEqual(out.getvalue(), "2\n6\n")
+        (record,) = self._read_records()
+        self.assertEqual(
+            (record["argv"], record["command"], record["status"]),
+            (["2", "--batch", batch_path], "Batchable", "ok"),
+        )
+
+    def test_env_recorder(self):
+        with mock.patch.dict(os.environ, {_RECORD_ENV: self.path}):
+            recorder = _install_env_recorder()
+        try:
+            concatenate_string.parser.call(args=["a", "2"])
+        finally:
+            recorder.uninstall()
+        self.assertEqual(self._read_records()[0]["argv"], ["a", "2"])
+        with mock.patch.dict(os.environ, {_RECORD_ENV: ""}):
+            self.assertIsNone(_install_env_recorder())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import contextmanager
+
+from parse_this import parse_this
+from parse_this.compile import _generate_source
+from parse_this.exception import ParseThisException
+from parse_this.instrument import (
+    _add_instrumentation_argument,
+    _is_requested,
+    _run_instrumented,
+)
+from test.helpers import (
+    Measured,
+    Profiled,
+    Repeater,
+    allocate,
+    parse_me_no_docstring,
+    profiled,
+    repeat,
+)
+from test.utils import captured_output
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_is_requested(self):
+        parser = argparse.ArgumentParser()
+        profile = parser.add_argument("--profile", nargs="?")
+        parser.add_argument("--print")
+        self.assertTrue(_is_requested(parser, ["1", "--profile"], profile))
+        self.assertTrue(_is_requested(parser, ["--profile=out"], profile))
+        self.assertFalse(_is_requested(parser, ["--profiles"], profile))
+        self.assertFalse(_is_requested(parser, ["--", "--profile"], profile))
+        self.assertFalse(_is_requested(parser, [], profile))
+
+    def test_is_requested_abbreviated(self):
+        parser = argparse.ArgumentParser()
+        profile = parser.add_argument("--profile", nargs="?")
+        parser.add_argument("--print")
+        self.assertTrue(_is_requested(parser, ["--prof"], profile))
+        self.assertTrue(_is_requested(parser, ["1", "--pro=out"], profile))
+        # Ambiguous, argparse rejects it
+        self.assertFalse(_is_requested(parser, ["--pr"], profile))
+        self.assertFalse(_is_requested(parser, ["--", "--prof"], profile))
+        self.assertFalse(_is_requested(parser, ["-", "-p"], profile))
+        parser.allow_abbrev = False
+        self.assertFalse(_is_requested(parser, ["--prof"], profile))
+
+    def test_run_instrumented(self):
+        values = []
+
+        @contextmanager
+        def record(value):
+            values.append(("enter", value))
+            yield
+            values.append(("exit", value))
+
+        parser = argparse.ArgumentParser()
+        _add_instrumentation_argument(parser, "--record", record, type=int)
+        run = lambda: values.append("run")  # noqa: E731
+        self.assertIsNone(_run_instrumented(parser, ["--record", "3"], run))
+        self.assertEqual(values, [("enter", 3), "run", ("exit", 3)])
+        values.clear()
+        # An invalid value is left to the parser
+        _run_instrumented(parser, ["--record", "three"], run)
+        _run_instrumented(parser, [], run)
+        self.assertEqual(values, ["run", "run"])
+
+    def test_always_instrumented_flag(self):
+        values = []
+
+        @contextmanager
+        def record(value):
+            values.append(value)
+            yield
+
+        parser = argparse.ArgumentParser()
+        _add_instrumentation_argument(
+            parser, "--record", record, always=True, nargs=0, const=True, default=False
+        )
+        _run_instrumented(parser, [], lambda: None)
+        _run_instrumented(parser, ["--record"], lambda: None)
+        # A flag does not take a value
+        _run_instrumented(parser, ["--record=yes"], lambda: None)
+        self.assertEqual(values, [False, True])
+        self.assertTrue(parser.parse_args(["--record"]).record)
+
+    def test_not_instrumented(self):
+        parser = argparse.ArgumentParser()
+        self.assertEqual(_run_instrumented(parser, ["--profile"], lambda: 1), 1)
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "out.pstats")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _assert_profiled(self, name):
+        stats = pstats.Stats(self.path)
+        self.assertIn(name, [function for (_, _, function) in stats.stats])
+
+    def test_not_profiled(self):
+        with captured_output() as (_, err):
+            self.assertEqual(profiled.parser.call(args=["3"]), 6)
+        self.assertEqual(err.getvalue(), "")
+
+    def test_profile_printed(self):
+        with captured_output() as (_, err):
+            self.assertEqual(profiled.parser.call(args=["3", "--profile"]), 6)
+        self.assertIn("cumulative", err.getvalue())
+        self.assertIn("parse_args", err.getvalue())
+
+    def test_profile_abbreviated(self):
+        with captured_output() as (_, err):
+            self.assertEqual(profiled.parser.call(args=["3", "--prof"]), 6)
+        self.assertIn("cumulative", err.getvalue())
+        self.assertEqual(
+            Profiled.parser.call(["--prof", self.path, "2", "add", "3"]), 5
+        )
+        self._assert_profiled("add")
+
+    def test_profile_acall(self):
+        result = asyncio.run(profiled.parser.acall(args=["3", "--profile", self.path]))
+        self.assertEqual(result, 6)
+        self._assert_profiled("profiled")
+
+    def test_profile_to_file(self):
+        self.assertEqual(profiled.parser.call(args=["3", "--profile", self.path]), 6)
+        self._assert_profiled("profiled")
+        # Parsing is profiled too
+        self._assert_profiled("parse_args")
+
+    def test_profile_is_not_an_argument(self):
+        self.assertEqual(profiled.parser.call_plan.arg_names, ("a", "b"))
+
+    def test_profile_function(self):
+        parse_this(
+            parse_me_no_docstring,
+            ["1", "2", "3", "--profile=%s" % self.path],
+            profile=True,
+        )
+        self._assert_profiled("parse_me_no_docstring")
+
+    def test_profile_class(self):
+        self.assertEqual(
+            Profiled.parser.call(["--profile=%s" % self.path, "2", "add", "3"]), 5
+        )
+        self._assert_profiled("__init__")
+        self._assert_profiled("add")
+
+    def test_profile_not_supported_by_compile(self):
+        with self.assertRaises(ParseThisException):
+            _generate_source(Profiled, "test.helpers:Profiled")
+
+
+class TestRusage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "usage.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_usages(self):
+        with open(self.path) as usages:
+            return [json.loads(line) for line in usages]
+
+    def test_not_reported(self):
+        with captured_output() as (_, err):
+            self.assertEqual(allocate.parser.call(args=["10"]), 10)
+        self.assertEqual(err.getvalue(), "")
+
+    def test_rusage_printed(self):
+        with captured_output() as (_, err):
+            self.assertEqual(allocate.parser.call(args=["10", "--rusage"]), 10)
+        for label in ("wall time", "CPU time", "max RSS", "page faults", "context"):
+            self.assertIn(label, err.getvalue())
+
+    def test_rusage_abbreviated(self):
+        with captured_output() as (_, err):
+            self.assertEqual(allocate.parser.call(args=["10", "--rus"]), 10)
+        self.assertIn("max RSS", err.getvalue())
+
+    def test_rusage_to_file(self):
+        size = 2**24
+        allocate.parser.call(args=[str(size), "--rusage", self.path])
+        allocate.parser.call(args=["1", "--rusage=%s" % self.path])
+        first, second = self._read_usages()
+        self.assertGreaterEqual(first["max_rss_bytes"], size)
+        self.assertGreaterEqual(first["wall_seconds"], 0)
+        self.assertGreaterEqual(first["minor_page_faults"], 0)
+        self.assertIn("time", second)
+
+    def test_rusage_failing_call(self):
+        with captured_output():
+            with self.assertRaises(ValueError):
+                allocate.parser.call(args=["-1", "--rusage=%s" % self.path])
+        self.assertEqual(len(self._read_usages()), 1)
+
+    def test_rusage_is_not_an_argument(self):
+        allocate.parser.call(args=["1"])
+        self.assertEqual(allocate.parser.call_plan.arg_names, ("size",))
+
+    def test_rusage_function(self):
+        parse_this(
+            parse_me_no_docstring,
+            ["1", "2", "3", "--rusage=%s" % self.path],
+            rusage=True,
+        )
+        self.assertEqual(len(self._read_usages()), 1)
+
+    def test_rusage_class(self):
+        self.assertEqual(
+            Measured.parser.call(["--rusage=%s" % self.path, "10", "allocate"]), 10
+        )
+        self.assertEqual(len(self._read_usages()), 1)
+
+
+class TestTraceMemory(unittest.TestCase):
+    def _get_sections(self, output):
+        """Return the label and the number of allocation sites of each phase."""
+        sections = []
+        for line in output.splitlines():
+            if line.startswith("    "):
+                sections[-1][1] += 1
+            else:
+                sections.append([line.split(":")[0], 0])
+        return sections
+
+    def test_not_traced(self):
+        with captured_output() as (_, err):
+            self.assertEqual(repeat.parser.call(args=["1", "2"]), [1, 2])
+        self.assertEqual(err.getvalue(), "")
+
+    def test_trace_memory(self):
+        with captured_output() as (_, err):
+            values = repeat.parser.call(
+                args=["1", "--times", "100000", "--trace-memory"]
+            )
+        self.assertEqual(len(values), 100000)
+        self.assertFalse(tracemalloc.is_tracing())
+        sections = self._get_sections(err.getvalue())
+        self.assertEqual([label for label, _ in sections], ["parse_args", "call"])
+        self.assertLessEqual(sections[0][1], 10)
+        # The list returned by the call is its top allocation
+        call_sites = err.getvalue().split("\ncall: ")[1].splitlines()
+        self.assertIn("test/helpers.py", call_sites[1])
+
+    def test_trace_memory_top(self):
+        with captured_output() as (_, err):
+            repeat.parser.call(args=["1", "2", "--trace-memory=2"])
+        self.assertEqual(
+            self._get_sections(err.getvalue()), [["parse_args", 2], ["call", 2]]
+        )
+
+    def test_trace_memory_abbreviated(self):
+        with captured_output() as (_, err):
+            repeat.parser.call(args=["1", "2", "--trace-mem", "2"])
+        self.assertEqual(
+            self._get_sections(err.getvalue()), [["parse_args", 2], ["call", 2]]
+        )
+
+    def test_trace_memory_invalid_top(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                repeat.parser.call(args=["1", "--trace-memory=0"])
+        self.assertIn("'0' is not a positive integer", err.getvalue())
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                repeat.parser.call(args=["1", "--trace-memory=all"])
+        self.assertIn("'all' is not a positive integer", err.getvalue())
+
+    def test_already_tracing(self):
+        tracemalloc.start()
+        try:
+            with captured_output():
+                repeat.parser.call(args=["1", "--trace-memory"])
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_trace_memory_function(self):
+        with captured_output() as (_, err):
+            parse_this(
+                parse_me_no_docstring,
+                ["1", "2", "3", "--trace-memory=1"],
+                trace_memory=True,
+            )
+        self.assertEqual(
+            self._get_sections(err.getvalue()), [["parse_args", 1], ["call", 1]]
+        )
+
+    def test_trace_memory_class(self):
+        with captured_output() as (_, err):
+            self.assertEqual(
+                Repeater.parser.call(["--trace-memory=1", "3", "repeat", "ab"]), 6
+            )
+        self.assertEqual(
+            [label for label, _ in self._get_sections(err.getvalue())],
+            ["parse_args", "instance creation", "call"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import copy
+import unittest
+from argparse import ArgumentParser
+
+from parse_this.lazy import LazyArgumentParser, LazyChoices, _resolve_parser
+
+
+class TestLazyArgumentParser(unittest.TestCase):
+    def setUp(self):
+        self.build_count = 0
+
+    def _build(self):
+        self.build_count += 1
+        parser = ArgumentParser(description="built")
+        parser.add_argument("a", type=int)
+        return parser
+
+    def test_not_built_on_creation(self):
+        parser = LazyArgumentParser(self._build)
+        self.assertFalse(parser.is_built)
+        self.assertEqual(self.build_count, 0)
+
+    def test_own_attributes_do_not_build(self):
+        parser = LazyArgumentParser(self._build)
+        parser.get_name = lambda: "name"
+        self.assertEqual(parser.get_name(), "name")
+        self.assertFalse(parser.is_built)
+
+    def test_built_on_first_use(self):
+        parser = LazyArgumentParser(self._build)
+        self.assertEqual(parser.description, "built")
+        self.assertEqual(parser.parse_args(["1"]).a, 1)
+        self.assertTrue(parser.is_built)
+        self.assertEqual(self.build_count, 1)
+
+    def test_get_parser_returns_real_parser(self):
+        parser = LazyArgumentParser(self._build)
+        self.assertIsInstance(parser.get_parser(), ArgumentParser)
+        self.assertIs(parser.get_parser(), parser.get_parser())
+
+    def test_usable_as_parent(self):
+        child = ArgumentParser(
+            parents=[_resolve_parser(LazyArgumentParser(self._build))],
+            add_help=False,
+        )
+        self.assertEqual(child.parse_args(["2"]).a, 2)
+
+    def test_resolve_real_parser(self):
+        parser = ArgumentParser()
+        self.assertIs(_resolve_parser(parser), parser)
+
+    def test_copy(self):
+        parser = copy.copy(LazyArgumentParser(self._build))
+        self.assertEqual(parser.parse_args(["3"]).a, 3)
+
+    def test_missing_attribute(self):
+        parser = LazyArgumentParser(self._build)
+        with self.assertRaises(AttributeError):
+            parser.not_an_attribute
+
+
+class TestLazyChoices(unittest.TestCase):
+    def setUp(self):
+        self.choices = LazyChoices()
+        self.choices.add_factory("one", lambda: ArgumentParser(prog="one"))
+        self.choices.add_factory("two", lambda: ArgumentParser(prog="two"))
+
+    def test_names_do_not_build(self):
+        self.assertIn("one", self.choices)
+        self.assertEqual(list(self.choices), ["one", "two"])
+        self.assertFalse(self.choices.is_built("one"))
+
+    def test_getitem_builds_once(self):
+        parser = self.choices["one"]
+        self.assertEqual(parser.prog, "one")
+        self.assertIs(self.choices["one"], parser)
+        self.assertTrue(self.choices.is_built("one"))
+        self.assertFalse(self.choices.is_built("two"))
+
+    def test_get(self):
+        self.assertEqual(self.choices.get("two").prog, "two")
+        self.assertIsNone(self.choices.get("three"))
+
+    def test_values_and_items(self):
+        self.assertEqual([p.prog for p in self.choices.values()], ["one", "two"])
+        self.assertEqual([n for n, _ in self.choices.items()], ["one", "two"])
+        self.assertTrue(self.choices.is_built("two"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from parse_this import CallError, create_parser, parse_class
+from parse_this.exception import ParseThisException
+from parse_this.parallel import _WORKER_STATE, call_parallel
+from test.helpers import (
+    NeedInitDecorator,
+    NeedParsing,
+    ParseableWithLogLevel,
+    concatenate_string,
+    function_with_log_level,
+)
+
+
+class TestCallParallel(unittest.TestCase):
+    def tearDown(self):
+        _WORKER_STATE.__dict__.clear()
+
+    def test_function(self):
+        args_list = [[str(i), "2"] for i in range(20)]
+        results = call_parallel(concatenate_string, args_list, max_workers=4)
+        self.assertEqual(list(results), [str(i) * 2 for i in range(20)])
+
+    def test_class(self):
+        args_list = [["3", "multiply-self-arg", str(i)] for i in range(10)]
+        results = call_parallel(NeedParsing, args_list, max_workers=2)
+        self.assertEqual(list(results), [3 * i for i in range(10)])
+
+    def test_process_backend(self):
+        args_list = [["3", "multiply-self-arg", str(i)] for i in range(5)]
+        results = call_parallel(NeedParsing, args_list, "process", max_workers=2)
+        self.assertEqual(list(results), [3 * i for i in range(5)])
+        results = call_parallel(concatenate_string, [["a", "2"]], "process")
+        self.assertEqual(list(results), ["aa"])
+
+    def test_errors(self):
+        args_list = [["a", "2"], ["a", "x"], ["b", "-1"]]
+        results = list(call_parallel(concatenate_string, args_list, max_workers=2))
+        self.assertEqual(results[0], "aa")
+        self.assertIsInstance(results[1], CallError)
+        self.assertIn("invalid int value", results[1].message)
+        self.assertEqual(results[2], "")
+
+    def test_call_error(self):
+        @create_parser()
+        def divide(a: int, b: int):
+            return a // b
+
+        results = list(call_parallel(divide, [["1", "0"], ["4", "2"]]))
+        self.assertIsInstance(results[0].error, ZeroDivisionError)
+        self.assertEqual(results[0].args, ["1", "0"])
+        self.assertEqual(results[1], 2)
+
+    def test_unordered(self):
+        @create_parser()
+        def sleep(delay: float):
+            time.sleep(delay)
+            return delay
+
+        args_list = [["0.2"], ["x"], ["0.01"], ["0"]]
+        results = list(call_parallel(sleep, args_list, max_workers=3, ordered=False))
+        self.assertIsInstance(results[0], CallError)
+        self.assertEqual(sorted(results[1:3]), [0.0, 0.01])
+        self.assertEqual(results[3], 0.2)
+
+    def test_unordered_max_in_flight(self):
+        results = call_parallel(
+            concatenate_string,
+            [[str(i), "1"] for i in range(10)],
+            ordered=False,
+            max_in_flight=2,
+        )
+        self.assertEqual(sorted(results, key=int), [str(i) for i in range(10)])
+
+    def test_max_in_flight(self):
+        consumed = []
+
+        def args_list():
+            for i in range(10):
+                consumed.append(i)
+                yield [str(i), "1"]
+
+        results = call_parallel(concatenate_string, args_list(), max_in_flight=3)
+        self.assertEqual(next(results), "0")
+        self.assertEqual(len(consumed), 3)
+        self.assertEqual(list(results), [str(i) for i in range(1, 10)])
+
+    def test_reuse_instance(self):
+        instances = []
+
+        @parse_class()
+        class Counter(object):
+            @create_parser()
+            def __init__(self, a: int):
+                instances.append(threading.current_thread())
+                self._a = a
+
+            @create_parser()
+            def add(self, b: int):
+                return self._a + b
+
+        args_list = [[str(i % 2), "add", "1"] for i in range(6)]
+        results = call_parallel(Counter, args_list, max_workers=1, reuse_instance=True)
+        self.assertEqual(list(results), [1, 2] * 3)
+        self.assertEqual(len(instances), 6)
+        args_list = [["1", "add", str(i)] for i in range(6)]
+        results = call_parallel(Counter, args_list, max_workers=1, reuse_instance=True)
+        self.assertEqual(list(results), list(range(1, 7)))
+        self.assertEqual(len(instances), 7)
+        results = call_parallel(Counter, args_list, max_workers=1)
+        self.assertEqual(list(results), list(range(1, 7)))
+        self.assertEqual(len(instances), 13)
+
+    @patch("parse_this.parallel.logging.basicConfig")
+    def test_log_level(self, mock_basic_config):
+        results = call_parallel(
+            function_with_log_level, [["a", "1", "--log-level", "INFO"]]
+        )
+        self.assertEqual(list(results), ["a"])
+        mock_basic_config.assert_called_once_with(level="INFO")
+        results = call_parallel(ParseableWithLogLevel, [["2", "parseable", "3"]])
+        self.assertEqual(list(results), [6])
+        mock_basic_config.assert_called_with(level=None)
+
+    def test_not_decorated(self):
+        with self.assertRaises(ParseThisException):
+            call_parallel(len, [])
+
+    def test_init_not_decorated(self):
+        with self.assertRaises(ParseThisException):
+            call_parallel(NeedInitDecorator, [])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ParseThisException):
+            call_parallel(concatenate_string, [], "fibers")
+
+
+if __name__ == "__main__":
+    unittest.main()
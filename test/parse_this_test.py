@@ -1,3 +1,5 @@
+import subprocess
+import sys
 import unittest
 
 from parse_this import parse_this
@@ -6,11 +8,35 @@ from test.helpers import (
 )
 
 
+def _get_imported_modules():
+    """Return the modules imported by 'import parse_this' in a new interpreter."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", "import sys, parse_this; print(*sys.modules)"],
+        text=True,
+    )
+    return set(output.split())
+
+
 class TestParseThis(unittest.TestCase):
     def test_parse_this_return_value(self):
         self.assertEqual(parse_this(parse_me, "yes 2".split()), ("yesyes", 144))
         self.assertEqual(parse_this(parse_me, "no 3 --three 2".split()), ("nonono", 4))
 
+    def test_import_is_lazy(self):
+        imported = _get_imported_modules()
+        for module in (
+            "asyncio",
+            "socket",
+            "socketserver",
+            "cProfile",
+            "pstats",
+            "tempfile",
+            "resource",
+            "json",
+            "tracemalloc",
+        ):
+            self.assertNotIn(module, imported)
+
 
 if __name__ == "__main__":
     unittest.main()
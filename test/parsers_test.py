@@ -1,10 +1,18 @@
 import unittest
 from unittest.mock import patch
 
+import io
+import os
+import tempfile
+
+from parse_this import CallError, create_parser, parse_class
 from parse_this.exception import ParseThisException
 from parse_this.parsers import FunctionParser
 from test.helpers import (
+    Batchable,
     Dummy,
+    LazyCommands,
+    LazyMethods,
     NeedInitDecorator,
     NeedParseClassDecorator,
     NeedParsing,
@@ -14,6 +22,7 @@ from test.helpers import (
     different_delimiter_chars,
     function_with_log_level,
     i_am_parseable,
+    lazy_concatenate_string,
     parse_me_full_docstring,
     ParseMyInitOnly,
 )
@@ -54,6 +63,49 @@ class TestFunctionParser(unittest.TestCase):
             "I am a sneaky function.", different_delimiter_chars.parser.description
         )
 
+    def test_function_parser_is_cached(self):
+        parser = FunctionParser()
+        parser(parse_me_full_docstring, "first 2".split())
+        first_parser = parse_me_full_docstring.parser
+        self.assertEqual(
+            parser(parse_me_full_docstring, "first 2 --three 3".split()),
+            parse_me_full_docstring("first", 2, 3),
+        )
+        self.assertIs(parse_me_full_docstring.parser, first_parser)
+        self.assertEqual(parser.cache_info().hits, 1)
+        self.assertEqual(parser.cache_info().misses, 1)
+
+    def test_function_parser_cache_key_options(self):
+        parser = FunctionParser()
+        parser(parse_me_full_docstring, "first 2".split())
+        parser(parse_me_full_docstring, "first 2".split(), log_level=True)
+        self.assertEqual(parser.cache_info().misses, 2)
+        self.assertEqual(parser.cache_info().currsize, 2)
+
+    def test_function_parser_cache_invalidated_on_new_defaults(self):
+        def func(a: int, b: int = 1):
+            return a * b
+
+        parser = FunctionParser()
+        self.assertEqual(parser(func, ["2"]), 2)
+        func.__defaults__ = (3,)
+        self.assertEqual(parser(func, ["2"]), 6)
+        self.assertEqual(parser.cache_info().misses, 2)
+
+    def test_function_parser_cache_clear(self):
+        parser = FunctionParser()
+        parser(parse_me_full_docstring, "first 2".split())
+        parser.cache_clear()
+        self.assertEqual(parser.cache_info().currsize, 0)
+        self.assertEqual(parser.cache_info().misses, 0)
+
+    def test_function_parser_cache_disabled(self):
+        parser = FunctionParser(cache_size=0)
+        parser(parse_me_full_docstring, "first 2".split())
+        parser(parse_me_full_docstring, "first 2".split())
+        self.assertEqual(parser.cache_info().hits, 0)
+        self.assertEqual(parser.cache_info().misses, 2)
+
 
 class TestMethodParser(unittest.TestCase):
     def test_create_parser_on_function(self):
@@ -85,6 +137,33 @@ class TestMethodParser(unittest.TestCase):
         parser = need_parsing.rename_me_please.parser
         self.assertEqual(parser.get_name(), "new-name")
 
+    def test_create_parser_lazy(self):
+        @create_parser(lazy=True)
+        def lazy_function(a: int):
+            return a
+
+        self.assertFalse(lazy_function.parser.is_built)
+        self.assertEqual(lazy_function.parser.get_name(), "lazy_function")
+        self.assertFalse(lazy_function.parser.is_built)
+        self.assertEqual(lazy_function.parser.call(args=["2"]), 2)
+        self.assertTrue(lazy_function.parser.is_built)
+
+    def test_create_parser_lazy_call(self):
+        parser = lazy_concatenate_string.parser
+        self.assertEqual(parser.description, "Concatenate a string with itself.")
+        self.assertEqual(parser.call(args="yes --nb_concat 3".split()), "yesyesyes")
+
+    def test_create_parser_lazy_defers_errors(self):
+        @create_parser(lazy=True)
+        def missing_type(a: int, b=None):
+            return a, b
+
+        with self.assertRaises(ParseThisException):
+            missing_type.parser.call(args=["1"])
+
+    def test_create_parser_lazy_in_parse_class(self):
+        self.assertEqual(LazyMethods.parser.call("3 times 4".split()), 12)
+
 
 class TestClassParser(unittest.TestCase):
     def test_parse_class_description(self):
@@ -171,6 +250,221 @@ class TestClassParser(unittest.TestCase):
         self.assertNotIn("{sub-cmd}", error_output)
 
 
+class TestCallMany(unittest.TestCase):
+    def test_function_parser_call_many(self):
+        parser = FunctionParser()
+        results = parser.call_many(
+            parse_me_full_docstring, [["a", "2"], ["b", "1", "--three", "2"]]
+        )
+        self.assertEqual(list(results), [("aa", 144), ("b", 4)])
+        self.assertEqual(parser.cache_info().misses, 1)
+
+    def test_function_parser_call_many_error(self):
+        parser = FunctionParser()
+        results = list(parser.call_many(parse_me_full_docstring, [[], ["a", "1"]]))
+        self.assertIsInstance(results[0], CallError)
+        self.assertIn("required", results[0].message)
+        self.assertEqual(results[1], ("a", 144))
+
+    def test_parse_class_call_many(self):
+        results = NeedParsing.parser.call_many(
+            [
+                "12 multiply-self-arg 2".split(),
+                "12 multiply-self-arg".split(),
+                "3 multiply-self-arg 1".split(),
+            ]
+        )
+        self.assertEqual(next(results), 24)
+        self.assertIsInstance(next(results), CallError)
+        self.assertEqual(next(results), 3)
+
+    def test_parse_class_call_many_with_instance(self):
+        instance = NeedInitDecorator(2)
+        results = NeedInitDecorator.parser.call_many(
+            ["do-stuff 12".split(), "do-stuff 12 --div 3".split()], instance
+        )
+        self.assertEqual(list(results), [12, 8])
+
+    def test_parse_class_call_many_init_need_decoration(self):
+        with self.assertRaises(ParseThisException):
+            NeedInitDecorator.parser.call_many([])
+
+    def test_parse_class_call_many_reuse_instance(self):
+        instances = []
+
+        @parse_class()
+        class Counter(object):
+            @create_parser()
+            def __init__(self, a: int):
+                instances.append(self)
+                self._a = a
+
+            @create_parser()
+            def add(self, b: int):
+                return self._a + b
+
+        args_list = ["1 add 1", "1 add 2", "2 add 2", "1 add 2"]
+        results = Counter.parser.call_many(
+            [args.split() for args in args_list], reuse_instance=True
+        )
+        self.assertEqual(list(results), [2, 3, 4, 3])
+        self.assertEqual(len(instances), 3)
+        results = Counter.parser.call_many([args.split() for args in args_list])
+        self.assertEqual(list(results), [2, 3, 4, 3])
+        self.assertEqual(len(instances), 7)
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _run(self, commands, args="2 --batch {path}", instance=None):
+        with open(self.path, "w") as batch_file:
+            batch_file.write(commands)
+        with captured_output() as (out, err):
+            with self.assertRaises(SystemExit) as context:
+                Batchable.parser.call(args.format(path=self.path).split(), instance)
+        return context.exception.code, out.getvalue(), err.getvalue()
+
+    def test_batch(self):
+        code, out, err = self._run(
+            "add 1\n\n# comment\nadd 2\ndivide 2 --label 'total is'\n"
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "2\n6\ntotal is 3\n")
+        self.assertEqual(err, "")
+
+    def test_batch_none_results_are_not_printed(self):
+        code, out, _ = self._run("add 1\nreset\nadd 2\n")
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "2\n4\n")
+
+    def test_batch_with_instance(self):
+        code, out, _ = self._run("add 1\n", "0 --batch {path}", Batchable(5))
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "5\n")
+
+    def test_batch_errors(self):
+        commands = "add 1\nunknown 2\nadd x\ndivide 0\nadd 'unclosed\nadd 1\n"
+        code, out, err = self._run(commands)
+        self.assertEqual(code, 1)
+        self.assertEqual(out, "2\n4\n")
+        lines = err.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn(":2: ", lines[0])
+        self.assertIn("invalid choice: 'unknown'", lines[0])
+        self.assertIn(":3: ", lines[1])
+        self.assertIn("invalid int value: 'x'", lines[1])
+        self.assertIn(":4: ZeroDivisionError", lines[2])
+        self.assertIn(":5: ValueError", lines[3])
+        self.assertEqual(lines[4], "4 command(s) failed")
+
+    def test_batch_from_stdin(self):
+        with patch("sys.stdin", io.StringIO("add 1\nadd 1\n")):
+            code, out, _ = self._run("", "3 --batch -")
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "3\n6\n")
+
+    def test_batch_with_sub_command(self):
+        code, _, err = self._run("", "2 --batch {path} add 1")
+        self.assertEqual(code, 2)
+        self.assertIn("not allowed with a sub-command", err)
+
+    @patch("parse_this.call.logging.basicConfig")
+    def test_batch_with_log_level(self, mock_basic_config):
+        code, out, _ = self._run("add 1\n", "2 --log-level INFO --batch {path}")
+        self.assertEqual(code, 0)
+        mock_basic_config.assert_called_with(level="INFO")
+
+    def test_no_batch(self):
+        self.assertEqual(Batchable.parser.call("2 add 3".split()), 6)
+
+    def test_lazy_batch(self):
+        @parse_class(lazy=True, batch=True)
+        class LazyBatch(object):
+            @create_parser()
+            def __init__(self, a: int):
+                self._a = a
+
+            @create_parser()
+            def first(self, b: int):
+                return self._a + b
+
+            @create_parser()
+            def second(self, b: int):
+                return self._a * b
+
+        with open(self.path, "w") as batch_file:
+            batch_file.write("first 1\nfirst 2\n")
+        with captured_output() as (out, _):
+            with self.assertRaises(SystemExit):
+                LazyBatch.parser.call(["2", "--batch", self.path])
+        self.assertEqual(out.getvalue(), "3\n4\n")
+        choices = LazyBatch.parser._subparsers_action.choices
+        self.assertFalse(choices.is_built("second"))
+
+
+class TestLazyClassParser(unittest.TestCase):
+    def setUp(self):
+        self.choices = LazyCommands.parser._subparsers_action.choices
+
+    def test_sub_commands_are_registered(self):
+        self.assertEqual(sorted(self.choices), ["add-to", "multiply-by"])
+
+    def test_only_selected_sub_command_is_built(self):
+        @parse_class(lazy=True)
+        class Commands(object):
+            @create_parser(lazy=True)
+            def first(self, a: int):
+                return a
+
+            @create_parser(lazy=True)
+            def second(self, a: int):
+                return -a
+
+        choices = Commands.parser._subparsers_action.choices
+        self.assertFalse(choices.is_built("first"))
+        self.assertFalse(Commands.first.parser.is_built)
+        self.assertEqual(Commands.parser.call("second 2".split(), Commands()), -2)
+        self.assertTrue(choices.is_built("second"))
+        self.assertFalse(choices.is_built("first"))
+        self.assertFalse(Commands.first.parser.is_built)
+
+    def test_call(self):
+        self.assertEqual(LazyCommands.parser.call("2 add-to 3".split()), 5)
+        self.assertEqual(LazyCommands.parser.call("2 multiply-by 3".split()), 6)
+
+    def test_sub_command_description(self):
+        self.assertEqual(self.choices["add-to"].description, "Add to a.")
+        self.assertEqual(self.choices["add-to"].prog.split()[-1], "add-to")
+
+    def test_full_help_builds_every_sub_command(self):
+        with captured_output() as (out, _):
+            with self.assertRaises(SystemExit):
+                LazyCommands.parser.parse_args(["-h"])
+            help_message = out.getvalue()
+        self.assertIn("added to a", help_message)
+        self.assertIn("multiplied by a", help_message)
+        self.assertTrue(self.choices.is_built("add-to"))
+        self.assertTrue(self.choices.is_built("multiply-by"))
+
+    def test_unknown_sub_command(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                LazyCommands.parser.call("2 divide 3".split())
+        self.assertIn("invalid choice", err.getvalue())
+
+    def test_sub_command_parse_error_shows_sub_command_usage(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                LazyCommands.parser.call("2 add-to 3 --unknown-flag".split())
+        self.assertNotIn("{add-to,multiply-by}", err.getvalue())
+
+
 class TestLogLevel(unittest.TestCase):
     @patch("parse_this.call.logging.basicConfig")
     def test_function_parser_log_level(self, mock_basic_config):
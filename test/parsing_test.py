@@ -4,15 +4,22 @@ from argparse import ArgumentParser
 from parse_this import create_parser
 from parse_this.args import _NO_DEFAULT
 from parse_this.exception import ParseThisException
-from parse_this.helpers import _add_log_level_argument, _get_args_name_from_parser
+from parse_this.helpers import (
+    _add_log_level_argument,
+    _get_args_name_from_parser,
+    _get_enum_choices,
+    _make_enum_converter,
+)
 from parse_this.parsing import _get_arg_parser, _get_parseable_methods
 from test.helpers import (
     Color,
+    Region,
     Parseable,
     has_bool_arguments,
     has_enum_argument,
     has_enum_default,
     has_flags,
+    has_large_enum_argument,
     has_list_argument,
     has_none_default_value,
     has_optional_list_argument,
@@ -198,6 +205,52 @@ class TestParsing(unittest.TestCase):
         self.assertEqual(color_action.choices, list(Color))
 
 
+class TestLargeEnum(unittest.TestCase):
+    def test_call(self):
+        self.assertEqual(
+            has_large_enum_argument.parser.call(args=["R9999", "--other", "R0"]),
+            (Region["R9999"], Region["R0"]),
+        )
+
+    def test_choices_membership(self):
+        choices = _get_enum_choices(Region)
+        self.assertIn(Region["R5000"], choices)
+        self.assertNotIn("R5000", choices)
+        self.assertNotIn([], choices)
+        self.assertEqual(len(choices), 10000)
+
+    def test_converter_and_choices_are_shared(self):
+        self.assertIs(_make_enum_converter(Region), _make_enum_converter(Region))
+        actions = [
+            action
+            for action in has_large_enum_argument.parser._actions
+            if action.dest in ("region", "other")
+        ]
+        self.assertIs(actions[0].choices, actions[1].choices)
+        self.assertIs(actions[0].type, actions[1].type)
+
+    def test_metavar_is_truncated(self):
+        usage = has_large_enum_argument.parser.format_usage()
+        self.assertIn("{R0,R1,R2,R3,R4,R5,R6,R7,R8,R9,... (10000 choices)}", usage)
+        self.assertNotIn("R10,", usage)
+
+    def test_invalid_choice_message_is_truncated(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_large_enum_argument.parser.call(args=["PURPLE"])
+        self.assertIn(
+            "invalid choice: 'PURPLE' (choose from R0, R1, R2, R3, R4, R5, R6, R7, "
+            "R8, R9, ... (10000 choices))",
+            err.getvalue(),
+        )
+
+    def test_small_enum_is_fully_listed(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_enum_argument.parser.call(args=["PURPLE"])
+        self.assertIn("(choose from RED, GREEN, BLUE)", err.getvalue())
+
+
 class TestSequenceType(unittest.TestCase):
     def test_list_positional_argument(self):
         self.assertEqual(has_list_argument.parser.call(args=["1", "2", "3"]), 6)
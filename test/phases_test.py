@@ -0,0 +1,42 @@
+import unittest
+from contextlib import contextmanager
+
+from parse_this.phases import CALL, PARSE, _observing, _run_phase
+
+
+class TestPhases(unittest.TestCase):
+    def test_not_observed(self):
+        self.assertEqual(_run_phase(CALL, max, 1, 2), 2)
+
+    def test_observed(self):
+        events = []
+
+        def observer(name):
+            @contextmanager
+            def observe(phase):
+                events.append((name, "enter", phase))
+                yield
+                events.append((name, "exit", phase))
+
+            return observe
+
+        with _observing(observer("outer")):
+            with _observing(observer("inner")):
+                self.assertEqual(_run_phase(PARSE, max, 1, 2), 2)
+            _run_phase(CALL, max, 1, 2)
+        _run_phase(CALL, max, 1, 2)
+        self.assertEqual(
+            events,
+            [
+                ("outer", "enter", PARSE),
+                ("inner", "enter", PARSE),
+                ("inner", "exit", PARSE),
+                ("outer", "exit", PARSE),
+                ("outer", "enter", CALL),
+                ("outer", "exit", CALL),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parse_this import hooks, parse_this
+from parse_this.exception import ParseThisException
+from parse_this.hooks import InvocationRecorder
+from parse_this.replay import (
+    CommandReport,
+    _format_reports,
+    _percentile,
+    _run,
+    main,
+    replay,
+)
+from test.helpers import Parseable, concatenate_string, parse_me_no_docstring
+from test.utils import captured_output
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "invocations.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _record(self):
+        recorder = InvocationRecorder(self.path).install()
+        try:
+            Parseable.parser.call(["2", "parseable", "3"])
+            Parseable.parser.call(["3", "parseable", "4"])
+            with captured_output():
+                with self.assertRaises(SystemExit):
+                    Parseable.parser.call(["2", "parseable", "three"])
+            concatenate_string.parser.call(args=["a", "2"])
+        finally:
+            recorder.uninstall()
+
+    def _write_records(self, *records):
+        with open(self.path, "w") as invocations:
+            for record in records:
+                invocations.write(json.dumps(record) + "\n")
+
+    def test_replay(self):
+        self._record()
+        reports = replay(self.path, "test.helpers:Parseable", repeat=2)
+        self.assertEqual(
+            [(report.command, len(report.recorded)) for report in reports],
+            [("Parseable", 1), ("Parseable.parseable", 2)],
+        )
+        self.assertEqual([len(report.replayed) for report in reports], [2, 4])
+        self.assertEqual([report.changed for report in reports], [0, 0])
+
+    def test_replay_function(self):
+        self._record()
+        (report,) = replay(self.path, "test.helpers:concatenate_string")
+        self.assertEqual(report.command, "concatenate_string")
+        self.assertEqual(report.changed, 0)
+
+    def test_replay_parse_this(self):
+        recorder = InvocationRecorder(self.path).install()
+        try:
+            parse_this(parse_me_no_docstring, ["1", "2", "3"])
+            with captured_output():
+                with self.assertRaises(SystemExit):
+                    parse_this(parse_me_no_docstring, ["1", "2", "three"])
+        finally:
+            recorder.uninstall()
+        (report,) = replay(self.path, "test.helpers:parse_me_no_docstring")
+        self.assertEqual(report.command, "parse_me_no_docstring")
+        self.assertEqual(len(report.replayed), 2)
+        self.assertEqual(report.changed, 0)
+
+    def test_changed_status(self):
+        self._write_records(
+            {"argv": ["2", "parseable", "3"], "command": "Parseable.parseable"},
+            {
+                "argv": ["2", "parseable", "3"],
+                "command": "Parseable.parseable",
+                "status": "error",
+            },
+        )
+        (report,) = replay(self.path, "test.helpers:Parseable")
+        self.assertEqual(report.changed, 1)
+        self.assertEqual(report.recorded, [0.0, 0.0])
+        self.assertEqual(report.get_change(), 0.0)
+
+    def test_invalid_log(self):
+        self._write_records({"command": "Parseable"})
+        with self.assertRaises(ParseThisException):
+            replay(self.path, "test.helpers:Parseable")
+        with open(self.path, "w") as invocations:
+            invocations.write("\n[]\n")
+        with self.assertRaises(ParseThisException):
+            replay(self.path, "test.helpers:Parseable")
+
+    def test_not_decorated(self):
+        self._record()
+        with self.assertRaises(ParseThisException):
+            replay(self.path, "test.helpers:Color")
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 99), 99.0)
+        self.assertEqual(_percentile(values, 0), 1.0)
+        self.assertEqual(_percentile([], 50), 0.0)
+
+    def test_format_reports(self):
+        reports = [
+            CommandReport("Parseable.parseable", [0.001], [0.002, 0.004], 0),
+            CommandReport("Parseable.cls_method", [0.002], [0.001], 1),
+        ]
+        self.assertEqual(
+            _format_reports(reports, 50.0).splitlines(),
+            [
+                "command               runs  p50 ms  p90 ms  p99 ms  recorded p50 ms"
+                "     change  status changed",
+                "Parseable.parseable      2   2.000   4.000   4.000            1.000"
+                "  +100.0% !               0",
+                "Parseable.cls_method     1   1.000   1.000   1.000            2.000"
+                "     -50.0%               1",
+            ],
+        )
+
+    def test_run(self):
+        call = mock.Mock()
+        self.assertTrue(_run(call, ["a"]))
+        call.assert_called_once_with(["a"])
+        call.side_effect = ValueError("a")
+        self.assertFalse(_run(call, ["a"]))
+        call.side_effect = SystemExit(0)
+        self.assertTrue(_run(call, ["--help"]))
+
+    def test_main(self):
+        self._record()
+        with open(self.path) as invocations:
+            recorded = invocations.read()
+        # The replayed commands are not recorded again
+        recorder = InvocationRecorder(self.path).install()
+        with mock.patch.object(hooks, "_ENV_RECORDER", recorder):
+            with captured_output() as (out, _):
+                self.assertEqual(main([self.path, "test.helpers:Parseable"]), 0)
+        self.assertIn("Parseable.parseable", out.getvalue())
+        with open(self.path) as invocations:
+            self.assertEqual(invocations.read(), recorded)
+        with captured_output() as (_, err):
+            self.assertEqual(main([self.path, "test.helpers:has_flags"]), 0)
+        self.assertIn("No command of test.helpers:has_flags", err.getvalue())
+
+    def test_main_threshold(self):
+        self._write_records(
+            {
+                "argv": ["2", "parseable", "3"],
+                "command": "Parseable.parseable",
+                "seconds": 1e-9,
+            }
+        )
+        with captured_output() as (out, _):
+            self.assertEqual(
+                main([self.path, "test.helpers:Parseable", "--threshold", "10"]), 1
+            )
+        self.assertIn("% !", out.getvalue())
+
+    def test_main_error(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                main([os.path.join(self.tmp_dir, "missing"), "test.helpers:Parseable"])
+        self.assertIn("No such file", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+from parse_this import parse_this
+from parse_this.compile import _generate_source
+from parse_this.exception import ParseThisException
+from parse_this.sampling import _SAMPLE_RATE_ENV, _get_sample_rate
+from test.helpers import Spinner, parse_me_no_docstring, spin
+
+
+class TestSampleProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "out.folded")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_stacks(self):
+        """Return the frames and the count of each collapsed stack."""
+        stacks = []
+        with open(self.path) as folded:
+            for line in folded:
+                frames, count = line.rstrip("\n").rsplit(" ", 1)
+                stacks.append((frames.split(";"), int(count)))
+        return stacks
+
+    def test_not_sampled(self):
+        self.assertTrue(spin.parser.call(args=["0.001"]))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_sample_profile(self):
+        with mock.patch.dict(os.environ, {_SAMPLE_RATE_ENV: "1000"}):
+            self.assertTrue(
+                spin.parser.call(args=["0.1", "--sample-profile", self.path])
+            )
+        stacks = self._read_stacks()
+        self.assertGreater(sum(count for _, count in stacks), 10)
+        # Most common stack first
+        counts = [count for _, count in stacks]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        frames = stacks[0][0]
+        self.assertEqual(frames[-2:], ["test.helpers.spin", "test.helpers._spin"])
+        self.assertIn("[parse_this] parse_this.phases._run_phase", frames)
+        # Only the call is sampled
+        self.assertFalse(
+            any("parse_args" in frame for frames, _ in stacks for frame in frames)
+        )
+
+    def test_empty_profile(self):
+        spin.parser.call(args=["0", "--sample-profile", self.path])
+        self.assertEqual(self._read_stacks(), [])
+
+    def test_invalid_rate(self):
+        for rate in ("0", "-1", "fast"):
+            with mock.patch.dict(os.environ, {_SAMPLE_RATE_ENV: rate}):
+                with self.assertRaises(ParseThisException):
+                    _get_sample_rate()
+        with mock.patch.dict(os.environ, {_SAMPLE_RATE_ENV: ""}):
+            self.assertEqual(_get_sample_rate(), 100.0)
+
+    def test_sample_profile_abbreviated(self):
+        with mock.patch.dict(os.environ, {_SAMPLE_RATE_ENV: "1000"}):
+            self.assertTrue(spin.parser.call(args=["0.05", "--sample-prof", self.path]))
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_sample_profile_function(self):
+        parse_this(
+            parse_me_no_docstring,
+            ["1", "2", "3", "--sample-profile", self.path],
+            sample_profile=True,
+        )
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_sample_profile_class(self):
+        with mock.patch.dict(os.environ, {_SAMPLE_RATE_ENV: "1000"}):
+            self.assertTrue(
+                Spinner.parser.call(["--sample-profile", self.path, "0.1", "spin"])
+            )
+        frames = self._read_stacks()[0][0]
+        # The frames of the test runner come before the dispatch of parse_this
+        dispatch = max(
+            index
+            for index, frame in enumerate(frames)
+            if frame.startswith("[parse_this]")
+        )
+        # co_qualname is only available from Python 3.11
+        spin_label = (
+            "test.helpers.Spinner.spin"
+            if sys.version_info >= (3, 11)
+            else "test.helpers.spin"
+        )
+        # Neither the parsing nor the creation of the instance is sampled
+        self.assertEqual(frames[dispatch + 1 :], [spin_label, "test.helpers._spin"])
+
+    def test_not_combined_with_trace_memory(self):
+        with self.assertRaises(ParseThisException):
+            parse_this(
+                parse_me_no_docstring,
+                ["1", "2", "3", "--sample-profile", self.path, "--trace-memory"],
+                sample_profile=True,
+                trace_memory=True,
+            )
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_sample_profile_is_not_compiled(self):
+        with self.assertRaises(ParseThisException):
+            _generate_source(Spinner, "test.helpers:Spinner")
+
+
+if __name__ == "__main__":
+    unittest.main()
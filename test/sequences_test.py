@@ -0,0 +1,203 @@
+import array
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from argparse import ArgumentError, ArgumentTypeError
+from collections.abc import Iterable, Iterator
+from typing import Annotated
+from unittest.mock import patch
+
+from parse_this import create_parser
+from parse_this.exception import ParseThisException
+from parse_this.helpers import _is_array_type, _is_iterable_type
+from parse_this.sequences import LazyValues, SequenceAction, _get_source
+from test.helpers import (
+    has_array_argument,
+    has_iterable_argument,
+    has_iterator_argument,
+    has_list_argument,
+    has_optional_list_argument,
+    has_typed_list_arguments,
+)
+from test.utils import captured_output
+
+
+def _positive(value):
+    if int(value) < 0:
+        raise ArgumentTypeError("%s is negative" % value)
+    return int(value)
+
+
+class TestSequenceHelpers(unittest.TestCase):
+    def test_is_iterable_type(self):
+        self.assertTrue(_is_iterable_type(Iterator))
+        self.assertTrue(_is_iterable_type(Iterator[int]))
+        self.assertFalse(_is_iterable_type(list[int]))
+        self.assertFalse(_is_iterable_type(int))
+
+    def test_is_array_type(self):
+        self.assertTrue(_is_array_type(array.array))
+        self.assertTrue(_is_array_type(Annotated[array.array, "i"]))
+        self.assertFalse(_is_array_type(Annotated[list, "i"]))
+        self.assertFalse(_is_array_type(list[int]))
+
+    def test_get_source(self):
+        self.assertEqual(_get_source(["-"]), "-")
+        self.assertEqual(_get_source(["@ids.txt"]), "ids.txt")
+        self.assertIsNone(_get_source(["@"]))
+        self.assertIsNone(_get_source(["1"]))
+        self.assertIsNone(_get_source(["@a", "@b"]))
+
+    def test_lazy_values_repr(self):
+        self.assertEqual(
+            repr(LazyValues("ids", int, "ids.txt", ["@ids.txt"])),
+            "LazyValues('ids.txt')",
+        )
+        self.assertEqual(repr(LazyValues("ids", int, None, ["1"])), "LazyValues(['1'])")
+
+
+class TestSequenceArguments(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "values.txt")
+        with open(self.path, "w") as values:
+            values.write("1\n 2 \n\n3\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_list_from_file(self):
+        self.assertEqual(has_list_argument.parser.call(args=["@%s" % self.path]), 6)
+
+    def test_list_from_stdin(self):
+        with patch("sys.stdin", io.StringIO("4\n5\n")):
+            self.assertEqual(has_list_argument.parser.call(args=["-"]), 9)
+
+    def test_optional_list_from_file(self):
+        self.assertEqual(
+            has_optional_list_argument.parser.call(
+                args=["name", "--tags", "@%s" % self.path]
+            ),
+            ("name", ["1", "2", "3"]),
+        )
+
+    def test_list_invalid_value_in_file(self):
+        with open(self.path, "a") as values:
+            values.write("four\n")
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_list_argument.parser.call(args=["@%s" % self.path])
+        self.assertIn("invalid int value: 'four'", err.getvalue())
+
+    def test_missing_file(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_list_argument.parser.call(args=["@does-not-exist"])
+        self.assertIn("can't open 'does-not-exist'", err.getvalue())
+
+    def test_values_are_taken_as_is_by_default(self):
+        @create_parser()
+        def tags(names: list[str], sizes: Iterable[int] = ()):
+            return names, list(sizes)
+
+        value = "@%s" % self.path
+        self.assertEqual(tags.parser.call(args=[value]), ([value], []))
+        with patch("sys.stdin", io.StringIO("4\n5\n")):
+            self.assertEqual(tags.parser.call(args=["-", "--sizes", "1"]), (["-"], [1]))
+
+    def test_iterable_is_lazy(self):
+        values, scale = has_iterable_argument.parser.call(
+            args=["@%s" % self.path, "--scale", "2"]
+        )
+        self.assertIsInstance(values, LazyValues)
+        self.assertEqual(scale, 2)
+        self.assertEqual(list(values), [1, 2, 3])
+        # The file is read again on each iteration
+        self.assertEqual(sum(values), 6)
+
+    def test_iterable_from_command_line(self):
+        values, _ = has_iterable_argument.parser.call(args=["1", "2"])
+        self.assertEqual(list(values), [1, 2])
+
+    def test_iterable_from_stdin(self):
+        with patch("sys.stdin", io.StringIO("7\n8\n")):
+            values, _ = has_iterable_argument.parser.call(args=["-"])
+            self.assertEqual(list(values), [7, 8])
+
+    def test_iterable_invalid_value(self):
+        values, _ = has_iterable_argument.parser.call(args=["1", "two"])
+        with self.assertRaises(ParseThisException) as context:
+            list(values)
+        self.assertIn(
+            "'two' for 'values' (command line, value 2)", str(context.exception)
+        )
+
+    def test_iterator_is_consumed_on_demand(self):
+        with open(self.path, "a") as values:
+            values.write("not an int but never read\n")
+        self.assertEqual(
+            has_iterator_argument.parser.call(args=["2", "--names", "@%s" % self.path]),
+            [1, 2],
+        )
+
+    def test_iterator_default(self):
+        self.assertEqual(has_iterator_argument.parser.call(args=["2"]), [])
+
+    def test_argument_type_error(self):
+        action = SequenceAction(["--values"], "values", element_type=_positive)
+        with self.assertRaises(ArgumentError) as context:
+            action._convert("-1")
+        self.assertIn("-1 is negative", str(context.exception))
+
+
+class TestTypedArrays(unittest.TestCase):
+    def test_array_argument(self):
+        values, small = has_array_argument.parser.call(
+            args=["1", "2.5", "--small", "-3", "4"]
+        )
+        self.assertEqual(values, array.array("d", [1.0, 2.5]))
+        self.assertEqual(small, array.array("b", [-3, 4]))
+
+    def test_array_argument_default(self):
+        self.assertEqual(
+            has_array_argument.parser.call(args=["1"]), (array.array("d", [1.0]), None)
+        )
+
+    def test_array_argument_from_stdin(self):
+        with patch("sys.stdin", io.StringIO("1\n2\n")):
+            values, _ = has_array_argument.parser.call(args=["-"])
+        self.assertEqual(values, array.array("d", [1.0, 2.0]))
+
+    def test_array_argument_out_of_range(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_array_argument.parser.call(args=["1", "--small", "300"])
+        self.assertIn("value out of range for typecode 'b'", err.getvalue())
+
+    def test_array_argument_invalid_value(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                has_array_argument.parser.call(args=["1", "--small", "1.5"])
+        self.assertIn("invalid int value: '1.5'", err.getvalue())
+
+    def test_invalid_typecode(self):
+        for typecode in ("u", "z"):
+            with self.assertRaises(ParseThisException):
+
+                @create_parser()
+                def invalid(values: Annotated[array.array, typecode]):
+                    return values
+
+    def test_typed_arrays(self):
+        ints, floats, names = has_typed_list_arguments.parser.call(
+            args=["1", "2", "--floats", "0.5", "--names", "a"]
+        )
+        self.assertEqual(ints, array.array("q", [1, 2]))
+        self.assertEqual(floats, array.array("d", [0.5]))
+        self.assertEqual(names, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
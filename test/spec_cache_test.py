@@ -0,0 +1,269 @@
+import functools
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from parse_this.parsing import _create_arg_parser
+from parse_this.spec_cache import _SPEC_CACHES, SpecCache, get_spec_cache
+
+_MODULE_SOURCE = '''
+import functools
+
+
+def documented(one: int, two: str = "a"):
+    """A documented function.
+
+    Args:
+        one: the first argument
+        two: the second argument
+    """
+    return one, two
+
+
+def other(three: int):
+    return three
+
+
+def defaulted(four=4):
+    return four
+
+
+def _decorate(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+wrapped = _decorate(defaulted)
+
+
+class Commands:
+    def method(self, five: int):
+        return five
+'''
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.source = os.path.join(self.tmp_dir, "cached_module.py")
+        self.module = self._load_module(_MODULE_SOURCE)
+
+    def tearDown(self):
+        # Do not write the specs left by _create_arg_parser when exiting
+        cache = _SPEC_CACHES.pop(self.cache_dir, None)
+        if cache is not None:
+            cache.flush()
+        shutil.rmtree(self.tmp_dir)
+
+    def _load_module(self, source):
+        with open(self.source, "w") as source_file:
+            source_file.write(source)
+        spec = importlib.util.spec_from_file_location("cached_module", self.source)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def _put(self, func, delimiter_chars, spec):
+        """Store spec as another process would."""
+        cache = SpecCache(self.cache_dir)
+        cache.put(func, delimiter_chars, spec)
+        cache.flush()
+
+    def test_get_missing_spec(self):
+        self.assertIsNone(SpecCache(self.cache_dir).get(self.module.documented, ":"))
+
+    def test_put_then_get_from_another_process(self):
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        self.assertEqual(
+            SpecCache(self.cache_dir).get(self.module.documented, ":"),
+            {"args": ["one"]},
+        )
+
+    def test_delimiter_is_part_of_the_key(self):
+        cache = SpecCache(self.cache_dir)
+        cache.put(self.module.documented, ":", {"args": ["one"]})
+        self.assertIsNone(cache.get(self.module.documented, "--"))
+        cache.flush()
+
+    def test_specs_of_a_module_are_merged(self):
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        self._put(self.module.other, ":", {"args": ["three"]})
+        cache = SpecCache(self.cache_dir)
+        self.assertEqual(cache.get(self.module.documented, ":"), {"args": ["one"]})
+        self.assertEqual(cache.get(self.module.other, ":"), {"args": ["three"]})
+
+    def test_stale_when_source_changes(self):
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        module = self._load_module(_MODULE_SOURCE + "\n# changed\n")
+        self.assertIsNone(SpecCache(self.cache_dir).get(module.documented, ":"))
+
+    def test_stale_when_source_changes_in_process(self):
+        cache = SpecCache(self.cache_dir)
+        cache.put(self.module.documented, ":", {"args": ["one"]})
+        cache.flush()
+        module = self._load_module(_MODULE_SOURCE + "\n# changed\n")
+        self.assertIsNone(cache.get(module.documented, ":"))
+        cache.put(module.other, ":", {"args": ["three"]})
+        cache.flush()
+        self.assertIsNone(SpecCache(self.cache_dir).get(module.documented, ":"))
+
+    def test_stale_on_version_change(self):
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        with patch("parse_this.spec_cache._SPEC_VERSION", 0):
+            self.assertIsNone(
+                SpecCache(self.cache_dir).get(self.module.documented, ":")
+            )
+
+    def test_corrupted_cache_file_is_ignored(self):
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        (cache_file,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, cache_file), "w") as corrupted:
+            corrupted.write("{not json")
+        self.assertIsNone(SpecCache(self.cache_dir).get(self.module.documented, ":"))
+
+    def test_unwritable_cache_directory_is_ignored(self):
+        open(self.cache_dir, "w").close()
+        self._put(self.module.documented, ":", {"args": ["one"]})
+        self.assertIsNone(SpecCache(self.cache_dir).get(self.module.documented, ":"))
+
+    def test_invalid_spec_is_not_written(self):
+        self._put(self.module.documented, ":", {"args": object()})
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_put_is_written_on_flush(self):
+        cache = SpecCache(self.cache_dir)
+        with patch("parse_this.spec_cache.atexit") as atexit:
+            cache.put(self.module.documented, ":", {"args": ["one"]})
+            cache.put(self.module.other, ":", {"args": ["three"]})
+            atexit.register.assert_called_once_with(cache.flush)
+            self.assertFalse(os.path.exists(self.cache_dir))
+            with patch.object(cache, "_write", wraps=cache._write) as write:
+                cache.flush()
+                cache.flush()
+            write.assert_called_once()
+            atexit.unregister.assert_called_once_with(cache.flush)
+        other_cache = SpecCache(self.cache_dir)
+        self.assertEqual(
+            other_cache.get(self.module.documented, ":"), {"args": ["one"]}
+        )
+        self.assertEqual(other_cache.get(self.module.other, ":"), {"args": ["three"]})
+
+    def test_wrapped_callables_are_not_cached(self):
+        @functools.wraps(self.module.other)
+        def wrapper(*args, **kwargs):
+            return self.module.other(*args, **kwargs)
+
+        cache = SpecCache(self.cache_dir)
+        cache.put(wrapper, ":", {"args": []})
+        self.assertIsNone(cache.get(wrapper, ":"))
+        self.assertIsNone(cache.get(self.module.other, ":"))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_uncacheable_callables(self):
+        def nested(a: int):
+            return a
+
+        cache = SpecCache(self.cache_dir)
+        exec_namespace = {}
+        exec("def from_string(a: int):\n    return a", exec_namespace)
+        for func in (nested, len, exec_namespace["from_string"]):
+            cache.put(func, ":", {"args": ["a"]})
+            self.assertIsNone(cache.get(func, ":"))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_create_arg_parser_uses_cached_spec(self):
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+            parser = _create_arg_parser(self.module.documented, ":")
+            self.assertEqual(parser.description, "A documented function.")
+            with patch("parse_this.parsing.prepare_doc") as prepare_doc:
+                with patch("parse_this.parsing.getfullargspec") as argspec:
+                    cached_parser = _create_arg_parser(self.module.documented, ":")
+            prepare_doc.assert_not_called()
+            argspec.assert_not_called()
+        self.assertEqual(cached_parser.description, "A documented function.")
+        self.assertEqual(cached_parser.format_help(), parser.format_help())
+        namespace = cached_parser.parse_args("1 --two b".split())
+        self.assertEqual((namespace.one, namespace.two), (1, "b"))
+
+    def test_create_arg_parser_ignores_invalid_cached_spec(self):
+        for spec in ({"args": ["one", "two"]}, [], {"args": ["one"], "help": {}}):
+            with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+                with patch("parse_this.parsing.get_spec_cache") as get_cache:
+                    get_cache.return_value.get.return_value = spec
+                    parser = _create_arg_parser(self.module.documented, ":")
+            self.assertEqual(parser.description, "A documented function.")
+            namespace = parser.parse_args("1 --two b".split())
+            self.assertEqual((namespace.one, namespace.two), (1, "b"))
+
+    def test_create_arg_parser_ignores_spec_of_other_arguments(self):
+        self._put(
+            self.module.documented,
+            ":",
+            {"args": [], "description": "A documented function.", "help": {}},
+        )
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+            parser = _create_arg_parser(self.module.documented, ":")
+        namespace = parser.parse_args("1 --two b".split())
+        self.assertEqual((namespace.one, namespace.two), (1, "b"))
+
+    def test_create_arg_parser_after_wrapper(self):
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+            _create_arg_parser(self.module.wrapped, ":")
+            get_spec_cache().flush()
+            _SPEC_CACHES.clear()
+            parser = _create_arg_parser(self.module.defaulted, ":")
+        self.assertEqual(parser.parse_args("--four 5".split()).four, 5)
+
+    def test_create_arg_parser_uses_cached_method_spec(self):
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+            _create_arg_parser(self.module.Commands.method, ":")
+            with patch("parse_this.parsing.getfullargspec") as argspec:
+                parser = _create_arg_parser(self.module.Commands.method, ":")
+            argspec.assert_not_called()
+        self.assertEqual(parser.parse_args(["5"]).five, 5)
+
+    def test_cache_content(self):
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": self.cache_dir}):
+            _create_arg_parser(self.module.documented, ":")
+            get_spec_cache().flush()
+        (cache_file,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, cache_file)) as cached:
+            content = json.load(cached)
+        self.assertEqual(content["source"], self.source)
+        (spec,) = content["specs"].values()
+        self.assertEqual(spec["args"], ["one", "two"])
+        self.assertEqual(spec["help"]["one"], "the first argument")
+
+
+class TestGetSpecCache(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, clear=True):
+            self.assertIsNone(get_spec_cache())
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": "0"}):
+            self.assertIsNone(get_spec_cache())
+
+    def test_default_directory(self):
+        with patch.dict(
+            os.environ, {"PARSE_THIS_CACHE": "1", "XDG_CACHE_HOME": "/xdg"}
+        ):
+            self.assertEqual(
+                get_spec_cache()._directory, os.path.join("/xdg", "parse_this")
+            )
+
+    def test_custom_directory(self):
+        with patch.dict(os.environ, {"PARSE_THIS_CACHE": "/somewhere"}):
+            cache = get_spec_cache()
+            self.assertEqual(cache._directory, "/somewhere")
+            self.assertIs(get_spec_cache(), cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import unittest
+
+from parse_this import create_parser, parse_class, parse_this
+from parse_this.call import _compile_call_plan
+from parse_this.compile import _generate_source
+from parse_this.exception import ParseThisException
+from parse_this.timings import Timings
+from test.helpers import Timed, parse_me_no_docstring, timed
+from test.utils import captured_output
+
+
+class TestTimings(unittest.TestCase):
+    def test_format(self):
+        timings = Timings(0.002)
+        timings.phases = {"parse": 0.001, "call": 0.0005}
+        timings.conversions = {"a": 0.00025}
+        timings.total = 0.0016
+        self.assertEqual(
+            timings.format().splitlines(),
+            [
+                "phase                       milliseconds",
+                "parser construction (once)         2.000",
+                "parse_args                         1.000",
+                "  conversion of 'a'                0.250",
+                "call                               0.500",
+                "total                              1.600",
+            ],
+        )
+
+    def test_repr(self):
+        self.assertEqual(repr(Timings()), "Timings(total=0.000000, phases={})")
+
+
+class TestTimedCalls(unittest.TestCase):
+    def test_last_timings(self):
+        with captured_output() as (_, err):
+            self.assertEqual(timed.parser.call(args=["1", "--values", "2", "3"]), 6)
+        self.assertEqual(err.getvalue(), "")
+        timings = timed.parser.last_timings
+        self.assertEqual(list(timings.phases), ["parse", "call"])
+        self.assertEqual(list(timings.conversions), ["a", "values"])
+        self.assertGreater(timings.construction, 0)
+        self.assertGreaterEqual(timings.total, sum(timings.phases.values()))
+        self.assertLessEqual(sum(timings.conversions.values()), timings.phases["parse"])
+
+    def test_timings_abbreviated(self):
+        with captured_output() as (_, err):
+            self.assertEqual(timed.parser.call(args=["1", "--tim"]), 1)
+        self.assertIn("conversion of 'a'", err.getvalue())
+
+    def test_timings_printed(self):
+        with captured_output() as (_, err):
+            self.assertEqual(timed.parser.call(args=["1", "--timings"]), 1)
+        self.assertIn("parser construction (once)", err.getvalue())
+        self.assertIn("conversion of 'a'", err.getvalue())
+        self.assertIn("total", err.getvalue())
+
+    def test_timings_is_not_an_argument(self):
+        self.assertEqual(timed.parser.call_plan.arg_names, ("a", "values"))
+
+    def test_failing_call(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(ValueError):
+                timed.parser.call(args=["-1", "--timings"])
+        self.assertEqual(err.getvalue(), "")
+        self.assertEqual(list(timed.parser.last_timings.phases), ["parse", "call"])
+
+    def test_invalid_value(self):
+        with captured_output() as (_, err):
+            with self.assertRaises(SystemExit):
+                timed.parser.call(args=["one"])
+        self.assertIn("invalid int value: 'one'", err.getvalue())
+
+    def test_not_timed(self):
+        timings = timed.parser.last_timings
+        self.assertEqual(list(timed.parser.call_many([["1"], ["2"]])), [1, 2])
+        self.assertIs(timed.parser.last_timings, timings)
+
+    def test_timings_class(self):
+        with captured_output() as (_, err):
+            self.assertEqual(Timed.parser.call(["--timings", "2", "add", "3"]), 5)
+        self.assertIn("instance creation", err.getvalue())
+        timings = Timed.parser.last_timings
+        self.assertEqual(list(timings.phases), ["parse", "init", "call"])
+        self.assertEqual(list(timings.conversions), ["base", "value"])
+
+    def test_timings_lazy_method_parsers(self):
+        @parse_class(lazy=True, timings=True)
+        class LazyTimed(object):
+            @create_parser()
+            def __init__(self, base: int):
+                self._base = base
+
+            @create_parser(lazy=True)
+            def add(self, value: int):
+                return self._base + value
+
+        self.assertEqual(LazyTimed.parser.call(["2", "add", "3"]), 5)
+        timings = LazyTimed.parser.last_timings
+        self.assertEqual(list(timings.conversions), ["base", "value"])
+
+    def test_acall_timed(self):
+        with captured_output() as (_, err):
+            result = asyncio.run(timed.parser.acall(args=["1", "--timings"]))
+        self.assertEqual(result, 1)
+        self.assertIn("conversion of 'a'", err.getvalue())
+        timings = timed.parser.last_timings
+        self.assertEqual(list(timings.phases), ["parse", "call"])
+        self.assertEqual(
+            asyncio.run(Timed.parser.acall(["--timings", "2", "add", "3"])), 5
+        )
+        timings = Timed.parser.last_timings
+        self.assertEqual(list(timings.phases), ["parse", "init", "call"])
+        self.assertEqual(list(timings.conversions), ["base", "value"])
+
+    def test_acall_times_the_awaited_call(self):
+        @create_parser(timings=True)
+        async def wait(seconds: float):
+            await asyncio.sleep(seconds)
+            return seconds
+
+        self.assertEqual(asyncio.run(wait.parser.acall(args=["0.01"])), 0.01)
+        self.assertGreaterEqual(wait.parser.last_timings.phases["call"], 0.01)
+
+    def test_acall_many_not_timed(self):
+        async def collect():
+            return [
+                result async for result in Timed.parser.acall_many([["1", "add", "2"]])
+            ]
+
+        timings = Timed.parser.last_timings
+        self.assertEqual(asyncio.run(collect()), [3])
+        self.assertIs(Timed.parser.last_timings, timings)
+
+    def test_timings_function(self):
+        self.assertEqual(
+            parse_this(parse_me_no_docstring, ["1", "2", "3"], timings=True), (2, 9)
+        )
+        timings = parse_me_no_docstring.parser.last_timings
+        self.assertEqual(list(timings.conversions), ["one", "two", "three"])
+
+    def test_mapped_argument(self):
+        @create_parser(timings=True)
+        def mapped(data: memoryview):
+            return len(data)
+
+        plan = _compile_call_plan(mapped.parser, mapped)
+        self.assertEqual(plan.mapped_args, ("data",))
+
+    def test_timings_not_supported_by_compile(self):
+        with self.assertRaises(ParseThisException):
+            _generate_source(Timed, "test.helpers:Timed")
+
+
+if __name__ == "__main__":
+    unittest.main()
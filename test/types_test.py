@@ -1,7 +1,23 @@
+import argparse
+import mmap
+import os
+import shutil
+import tempfile
 import unittest
 
+from parse_this.call import _call_from_plan, _CallPlan
 from parse_this.exception import ParseThisException
+from parse_this.parallel import call_parallel
 from parse_this.type_check import _check_types
+from parse_this.types import (
+    MMap,
+    _is_file_type,
+    _open_memoryview,
+    _open_mmap,
+    _release_mappings,
+)
+from test.helpers import MappedFile, has_async_file_argument, has_file_arguments
+from test.utils import captured_output
 
 
 class TestTypes(unittest.TestCase):
@@ -72,5 +88,120 @@ class TestTypes(unittest.TestCase):
         self.assertEqual(_check_types("function", {"return": int}, [], ()), [])
 
 
+class TestFileTypes(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = self._write("data.bin", b"parse_this")
+        self.empty = self._write("empty.bin", b"")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as written:
+            written.write(content)
+        return path
+
+    def test_is_file_type(self):
+        self.assertTrue(_is_file_type(MMap))
+        self.assertTrue(_is_file_type(memoryview))
+        self.assertTrue(_is_file_type(bytes))
+        self.assertFalse(_is_file_type(str))
+        self.assertFalse(_is_file_type({}))
+
+    def test_call_releases_mappings(self):
+        mapped, view, head, content = has_file_arguments.parser.call(
+            args=[self.path, self.path, "--content", self.path]
+        )
+        self.assertEqual(head, b"par")
+        self.assertEqual(content, b"parse_this")
+        self.assertTrue(mapped.closed)
+        with self.assertRaises(ValueError):
+            len(view)
+
+    def test_mappings_are_read_only(self):
+        mapped = _open_mmap(self.path)
+        view = _open_memoryview(self.path)
+        self.assertTrue(view.readonly)
+        self.assertEqual(mapped[:5], b"parse")
+        with self.assertRaises(TypeError):
+            mapped[0] = 1
+        _release_mappings([mapped, view])
+        self.assertTrue(mapped.closed)
+
+    def test_mapping_still_in_use(self):
+        view = _open_memoryview(self.path)
+        mapping = view.obj
+        kept = view[:5]
+        _release_mappings([view])
+        self.assertFalse(mapping.closed)
+        self.assertEqual(bytes(kept), b"parse")
+        kept.release()
+        _release_mappings([mapping])
+        self.assertTrue(mapping.closed)
+
+    def test_empty_file(self):
+        self.assertEqual(bytes(_open_memoryview(self.empty)), b"")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            _open_mmap(self.empty)
+
+    def test_missing_file(self):
+        missing = os.path.join(self.tmp_dir, "missing")
+        for args in (
+            [missing, self.path],
+            [self.path, missing],
+            [self.path, self.path, "--content", missing],
+        ):
+            with captured_output() as (_, err):
+                with self.assertRaises(SystemExit):
+                    has_file_arguments.parser.call(args=args)
+            self.assertIn("'%s'" % missing, err.getvalue())
+
+    def test_mappings_released_on_error(self):
+        namespace = has_file_arguments.parser.parse_args([self.path, self.path])
+
+        def fail(mapped, view, content):
+            raise RuntimeError("failed")
+
+        plan = _CallPlan(fail, ("mapped", "view", "content"), False, ("mapped", "view"))
+        with self.assertRaises(RuntimeError):
+            _call_from_plan(plan, namespace)
+        self.assertTrue(namespace.mapped.closed)
+
+    def test_mappings_released_after_coroutine(self):
+        mapped, closed = has_async_file_argument.parser.call(args=[self.path])
+        self.assertFalse(closed)
+        self.assertTrue(mapped.closed)
+
+    def test_init_mappings_are_kept(self):
+        self.assertEqual(
+            MappedFile.parser.call(args=[self.path, "head", "5"]), b"parse"
+        )
+        results = MappedFile.parser.call_many(
+            [[self.path, "head", "1"], [self.path, "head", "2"]], reuse_instance=True
+        )
+        self.assertEqual(list(results), [b"p", b"pa"])
+
+    def test_parallel_job_mappings_are_released(self):
+        ((mapped, view, head, _),) = call_parallel(
+            has_file_arguments, [[self.path, self.path]], max_workers=1
+        )
+        self.assertEqual(head, b"par")
+        self.assertTrue(mapped.closed)
+        with self.assertRaises(ValueError):
+            len(view)
+        (head,) = call_parallel(MappedFile, [[self.path, "head", "2"]])
+        self.assertEqual(head, b"pa")
+
+    def test_plain_mmap_is_released(self):
+        with open(self.path, "rb") as mapped_file:
+            mapped = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+        namespace = argparse.Namespace(mapped=mapped)
+        plan = _CallPlan(lambda mapped: mapped[:1], ("mapped",), False, ("mapped",))
+        self.assertEqual(_call_from_plan(plan, namespace), b"p")
+        self.assertTrue(mapped.closed)
+
+
 if __name__ == "__main__":
     unittest.main()